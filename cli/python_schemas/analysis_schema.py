@@ -1,4 +1,4 @@
-from marshmallow import fields, post_load
+from marshmallow import fields, post_load, validate
 
 from cli.python_schemas.base_schema import BaseSchema
 from cli.python_schemas.input_config_schema import InputConfigSchema
@@ -13,6 +13,12 @@ class AnalysisConfigSchema(BaseSchema):
         required=True,
         description="Parameters of input file: its format and path.",
     )
+    prefetch = fields.Int(
+        load_default=2,
+        validate=validate.Range(min=0),
+        description="Number of snapshots that are read and decoded in the background thread "
+        "while the current one is analysed. If it is 0, snapshots are read synchronously.",
+    )
     visualizer = fields.Nested(
         VisualizerConfigSchema,
         load_default=None,
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from marshmallow import fields, post_load
+from marshmallow import fields, post_load, validate
 
 from cli.python_schemas.base_schema import BaseSchema
 from cli.python_schemas.models_schema import ModelSchema
@@ -11,6 +11,18 @@ class CreationConfigSchema(BaseSchema):
     output_file = fields.Str(
         required=True, description="Path to file where output model would be saved."
     )
+    output_format = fields.Str(
+        load_default=None,
+        validate=validate.OneOf(["fits", "hdf5"]),
+        description="Format of the output file: 'fits' or 'hdf5'. By default it is guessed from "
+        "the extension of the file ('.h5' and '.hdf5' are HDF5, anything else is FITS).",
+    )
+    compression = fields.Str(
+        load_default=None,
+        validate=validate.OneOf(["gzip", "lzf"]),
+        description="Lossless compression of the output file: 'gzip' or 'lzf'. Only HDF5 "
+        "format supports it.",
+    )
     overwrite = fields.Bool(
         load_default=False,
         description="Flag that shows whether to overwrite model if it "
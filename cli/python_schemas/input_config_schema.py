@@ -5,13 +5,25 @@ from omtool.core.configs import InputConfig
 
 class InputConfigSchema(Schema):
     format = fields.Str(
-        required=True, description="Format of the input file. Can be 'csv' or 'fits'."
+        required=True, description="Format of the input file. Can be 'csv', 'fits' or 'hdf5'."
     )
     filenames = fields.List(
         fields.Str(),
         required=True,
         description="List of filenames. In case of csv file they will be stacked together, in case "
-        "of fits only the first one will be taken and the rest will be ignored.",
+        "of fits (filenames might be glob patterns) they will be read as one series ordered by "
+        "time; in case of hdf5 only one file is supported.",
+    )
+    memmap = fields.Bool(
+        load_default=False,
+        description="Memory-map FITS files instead of reading them into memory. Columns are "
+        "read from the disk only when some task needs them.",
+    )
+    start_time = fields.Raw(
+        load_default=None,
+        type="array",
+        description="Time of the first snapshot to read. Snapshots before it are skipped without "
+        "reading them using the index of the FITS file.",
     )
 
     @post_load
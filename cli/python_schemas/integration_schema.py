@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from marshmallow import fields, post_load
+from marshmallow import fields, post_load, validate
 
 from cli.python_schemas.base_schema import BaseSchema
 from cli.python_schemas.input_config_schema import InputConfigSchema
@@ -19,6 +19,18 @@ class IntegrationConfigSchema(BaseSchema):
     output_file = fields.Str(
         load_default="", description="Path to file where output model would be saved."
     )
+    output_format = fields.Str(
+        load_default=None,
+        validate=validate.OneOf(["fits", "hdf5"]),
+        description="Format of the output file: 'fits' or 'hdf5'. By default it is guessed from "
+        "the extension of the file ('.h5' and '.hdf5' are HDF5, anything else is FITS).",
+    )
+    compression = fields.Str(
+        load_default=None,
+        validate=validate.OneOf(["gzip", "lzf"]),
+        description="Lossless compression of the output file: 'gzip' or 'lzf'. Only HDF5 "
+        "format supports it.",
+    )
     overwrite = fields.Bool(
         load_default=False,
         description="Flag that shows whether to overwrite model if it already exists "
@@ -39,6 +51,35 @@ class IntegrationConfigSchema(BaseSchema):
         load_default=1,
         description="Interval between to consecutive snapshots to write to output file.",
     )
+    analysis_interval = fields.Int(
+        load_default=1,
+        validate=validate.Range(min=1),
+        description="Interval between two consecutive runs of the tasks and saves of the "
+        "visualizer's pictures. Each task might override it with its own 'interval'.",
+    )
+    flush_interval = fields.Int(
+        load_default=1,
+        validate=validate.Range(min=1),
+        description="Number of snapshots written to output file between flushes of its buffer "
+        "to the disk.",
+    )
+    output_queue_size = fields.Int(
+        load_default=2,
+        validate=validate.Range(min=0),
+        description="Maximal number of snapshots waiting to be saved by the background thread "
+        "while integration goes on. If it is 0, saving is done synchronously.",
+    )
+    checkpoint_file = fields.Str(
+        load_default="",
+        description="Path to the file where the state of the integration is periodically saved. "
+        "Integration can be continued from it with '--resume' flag.",
+    )
+    checkpoint_interval = fields.Int(
+        load_default=0,
+        validate=validate.Range(min=0),
+        description="Number of integration steps between two consecutive checkpoints. If it is "
+        "0, checkpoints are not saved.",
+    )
     visualizer = fields.Nested(
         VisualizerConfigSchema,
         load_default=None,
@@ -54,7 +95,9 @@ class IntegrationConfigSchema(BaseSchema):
 
     @post_load
     def make(self, data: dict, **kwargs):
-        if not data["overwrite"] and Path(data["output_file"]).is_file():
+        resume = self.context.get("resume", False)
+
+        if not data["overwrite"] and not resume and Path(data["output_file"]).is_file():
             raise FileExistsError(
                 f'Output file ({data["output_file"]}) exists and "overwrite" '
                 "option in integration config file is false (default)"
@@ -46,6 +46,11 @@ class ModelSchema(Schema):
     rotation = fields.Nested(
         RotationSchema, load_default=None, description="Rotation parameters of the model."
     )
+    component = fields.Str(
+        load_default=None,
+        description="Label of the model that is written into the `component` field of each of "
+        "its particles. Name of the model by default.",
+    )
 
     @post_load
     def make(self, data: dict, **kwargs):
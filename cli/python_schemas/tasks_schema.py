@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, post_load
+from marshmallow import Schema, fields, post_load, validate
 
 from omtool.core.tasks import TasksConfig
 
@@ -27,6 +27,13 @@ class TaskConfigSchema(Schema):
     args = fields.Dict(
         fields.Str(), load_default={}, description="Arguments to the constructor of the task."
     )
+    interval = fields.Int(
+        load_default=None,
+        validate=validate.Range(min=1),
+        description="Number of integration steps between two consecutive runs of the task. "
+        "By default 'analysis_interval' of the integration config is used. Ignored in the "
+        "analysis mode.",
+    )
 
     @post_load
     def make(self, data: dict, **kwargs):
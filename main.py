@@ -64,13 +64,17 @@ def generate_schema(creation_path, integration_path, analysis_path):
 
 @cli.command(short_help="Exports snapshot into CSV")
 @click.option(
-    "-i", "--input-file", type=str, required=True, help="Path to input FITS file with snapshots."
+    "-i",
+    "--input-file",
+    type=str,
+    required=True,
+    help="Path to input FITS or HDF5 (*.h5, *.hdf5) file with snapshots.",
 )
 @click.option("-o", "--output-file", type=str, required=True, help="Path to output FITS file.")
 @click.option("-n", "--index", type=int, required=True, help="Index of snapshot inside input file.")
 def csv_export(input_file, output_file, index):
     """
-    Export particular snapshot from FITS into CSV file.
+    Export particular snapshot from FITS or HDF5 file into CSV file.
     """
     omtool.export_csv(input_file, output_file, index)
 
@@ -91,7 +95,12 @@ def create(config):
 
 @cli.command(short_help="Evolve snapshot in time")
 @click.argument("config")
-def integrate(config):
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue integration from the checkpoint file and append to the output file.",
+)
+def integrate(config, resume):
     """
     A way to evolve system over given period of time.
 
@@ -100,7 +109,8 @@ def integrate(config):
     with open(config, "r", encoding="utf-8") as stream:
         data = yaml.load(stream, Loader=yaml_loader())
 
-    omtool.integrate(IntegrationConfigSchema().load(data), close_funcs)
+    schema = IntegrationConfigSchema(context={"resume": resume})
+    omtool.integrate(schema.load(data), close_funcs, resume)
 
 
 @cli.command(short_help="Analize series of snapshots")
@@ -1,8 +1,20 @@
 from typing import Callable
 
 from omtool.actions_before.barion_filter_action import barion_filter_action
+from omtool.actions_before.component_filter_action import component_filter_action
 from omtool.actions_before.slice_action import slice_action
 
 
 def initialize_actions_before() -> dict[str, Callable]:
-    return {"slice": slice_action, "barion_filter": barion_filter_action}
+    return {
+        "slice": slice_action,
+        "barion_filter": barion_filter_action,
+        "component_filter": component_filter_action,
+    }
+
+
+def get_actions_before_columns() -> dict[str, set[str]]:
+    """
+    Returns columns of the snapshot that each of the actions reads.
+    """
+    return {"slice": set(), "barion_filter": {"is_barion"}, "component_filter": {"component"}}
@@ -0,0 +1,10 @@
+import numpy as np
+
+from omtool.core.datamodel import Snapshot
+
+
+def component_filter_action(snapshot: Snapshot, component: str | list[str]) -> Snapshot:
+    components = [component] if isinstance(component, str) else component
+    component_filter = np.isin(snapshot.store["component"], components)
+
+    return Snapshot(timestamp=snapshot.timestamp, store=snapshot.store.select(component_filter))
@@ -6,10 +6,10 @@ from zlog import logger
 
 from omtool import visualizer
 from omtool.actions_after import initialize_actions_after
-from omtool.actions_before import initialize_actions_before
+from omtool.actions_before import get_actions_before_columns, initialize_actions_before
 from omtool.core.configs import AnalysisConfig
-from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import DataType, initialize_tasks
+from omtool.core.datamodel import Snapshot, prefetched, profiler
+from omtool.core.tasks import DataType, get_required_columns, initialize_tasks
 from omtool.core.utils import initialize_logger
 from omtool.misc import initialize_input_snapshot
 
@@ -29,7 +29,13 @@ def analize(config: AnalysisConfig, close_funcs: list[Callable[[], None]]):
 
     actions_after: dict[str, Callable] = initialize_actions_after(visualizer_service)
     actions_before = initialize_actions_before()
-    tasks = initialize_tasks(config.imports.tasks, config.tasks, actions_before, actions_after)
+    tasks = initialize_tasks(
+        config.imports.tasks,
+        config.tasks,
+        actions_before,
+        actions_after,
+        get_actions_before_columns(),
+    )
 
     @profiler("Analysis stage")
     def loop_analysis_stage(snapshot: Snapshot):
@@ -45,10 +51,16 @@ def analize(config: AnalysisConfig, close_funcs: list[Callable[[], None]]):
 
     logger.info().msg("Analysis started")
 
-    snapshots = initialize_input_snapshot(config.input_file)
+    columns = get_required_columns(tasks)
+    logger.debug().string(
+        "columns", ", ".join(sorted(columns)) if columns is not None else "all"
+    ).msg("required columns")
+    snapshots = prefetched(initialize_input_snapshot(config.input_file, columns), config.prefetch)
+    end = time.time()
 
     for (i, snapshot) in enumerate(snapshots):
         start_comp = time.time()
+        reading_time = start_comp - end
         loop_analysis_stage(snapshot)
         start_save = time.time()
         loop_saving_stage(i, snapshot.timestamp)
@@ -59,6 +71,7 @@ def analize(config: AnalysisConfig, close_funcs: list[Callable[[], None]]):
             .string("id", "time_data")
             .int("i", i)
             .measured_float("timestamp", snapshot.timestamp.value_in(units.Myr), "Myr", decimals=3)
+            .measured_float("reading_time", reading_time, "s", decimals=2)
             .measured_float("computation_time", start_save - start_comp, "s", decimals=2)
             .measured_float("saving_time", end - start_save, "s", decimals=2)
             .send()
@@ -10,5 +10,6 @@ from omtool.core.configs.input_config import InputConfig
 @dataclass
 class AnalysisConfig(BaseConfig):
     input_file: InputConfig
+    prefetch: int
     visualizer: Optional[visualizer.VisualizerConfig]
     tasks: list[tasks.TasksConfig]
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from omtool.core.configs.base_config import BaseConfig
 from omtool.core.models import ModelConfig
@@ -7,5 +8,7 @@ from omtool.core.models import ModelConfig
 @dataclass
 class CreationConfig(BaseConfig):
     output_file: str
+    output_format: Optional[str]
+    compression: Optional[str]
     overwrite: bool
     objects: list[ModelConfig]
@@ -1,7 +1,12 @@
 from dataclasses import dataclass
+from typing import Optional
+
+from amuse.lab import ScalarQuantity
 
 
 @dataclass
 class InputConfig:
     format: str
     filenames: list[str]
+    memmap: bool
+    start_time: Optional[ScalarQuantity]
@@ -20,9 +20,16 @@ class LogParams:
 class IntegrationConfig(BaseConfig):
     input_file: InputConfig
     output_file: str
+    output_format: Optional[str]
+    compression: Optional[str]
     overwrite: bool
     model_time: ScalarQuantity
     integrator: IntegratorConfig
     snapshot_interval: int
+    analysis_interval: int
+    flush_interval: int
+    output_queue_size: int
+    checkpoint_file: str
+    checkpoint_interval: int
     visualizer: Optional[visualizer.VisualizerConfig]
     tasks: list[tasks.TasksConfig]
@@ -1,6 +1,21 @@
 """
 Miscellaneous object and function declarations used across the OMTool
 """
-from omtool.core.datamodel.reader import from_fits, from_logged_csvs
+from omtool.core.datamodel.checkpoint import (
+    Checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from omtool.core.datamodel.formats import (
+    SnapshotWriter,
+    from_file,
+    get_format,
+    open_writer,
+)
+from omtool.core.datamodel.hdf5 import HDF5Writer, from_hdf5
+from omtool.core.datamodel.particle_store import ParticleStore, canonical_units
+from omtool.core.datamodel.prefetch import prefetched
+from omtool.core.datamodel.reader import from_fits, from_fits_series, from_logged_csvs
 from omtool.core.datamodel.snapshot import Snapshot
 from omtool.core.datamodel.task_profiler import profiler
+from omtool.core.datamodel.writer import FITSWriter
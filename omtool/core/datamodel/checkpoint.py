@@ -0,0 +1,65 @@
+"""
+Checkpoints of the integration: everything that is needed to continue it from the point where
+it was saved as if it was not interrupted.
+"""
+import os
+import pickle
+import random
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from omtool.core.datamodel.snapshot import Snapshot
+
+
+@dataclass
+class Checkpoint:
+    """
+    State of the integration. `iteration` is the number of the next iteration, `output_length`
+    is the number of snapshots in the output file at the moment of the checkpoint. Snapshot is
+    stored with full precision of the integrator.
+    """
+
+    iteration: int
+    snapshot: Snapshot
+    output_length: int = 0
+    integrator_state: dict[str, Any] = field(default_factory=dict)
+    tasks_state: dict[str, dict[str, Any]] = field(default_factory=dict)
+    outputs: dict[str, Any] = field(default_factory=dict)
+    random_state: tuple = field(default_factory=lambda: (random.getstate(), np.random.get_state()))
+
+    def restore_random_state(self):
+        python_state, numpy_state = self.random_state
+        random.setstate(python_state)
+        np.random.set_state(numpy_state)
+
+
+def save_checkpoint(filename: str, checkpoint: Checkpoint):
+    """
+    Writes checkpoint to the file. The file is replaced atomically, so the previous checkpoint
+    stays intact if the process dies while writing.
+    """
+    # lazy columns and views of the integrator's arrays are materialised by the copy.
+    snapshot = checkpoint.snapshot
+    checkpoint = replace(
+        checkpoint, snapshot=Snapshot(timestamp=snapshot.timestamp, store=snapshot.store.copy())
+    )
+    temporary = f"{filename}.tmp"
+
+    with open(temporary, "wb") as file:
+        pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary, filename)
+
+
+def load_checkpoint(filename: str) -> Checkpoint:
+    with open(filename, "rb") as file:
+        checkpoint = pickle.load(file)
+
+    if not isinstance(checkpoint, Checkpoint):
+        raise ValueError(f"{filename} is not a checkpoint of the integration.")
+
+    return checkpoint
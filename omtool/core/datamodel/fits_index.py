@@ -0,0 +1,295 @@
+"""
+Sidecar index of the FITS snapshot series. It stores byte offsets, timestamps and particle
+counts of every binary table so any snapshot can be read without walking and decoding the
+preceding HDUs.
+"""
+import bisect
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+from astropy.io import fits
+from zlog import logger
+
+BLOCK_SIZE = 2880
+_INDEX_HEADER = "# header_offset data_offset data_size time number_of_particles"
+
+_tform_dtypes = {
+    "L": "i1",
+    "B": "u1",
+    "I": ">i2",
+    "J": ">i4",
+    "K": ">i8",
+    "E": ">f4",
+    "D": ">f8",
+}
+
+
+@dataclass
+class IndexEntry:
+    header_offset: int
+    data_offset: int
+    data_size: int
+    timestamp: float
+    number_of_particles: int
+
+    @property
+    def end(self) -> int:
+        """
+        Offset of the next HDU in the file.
+        """
+        return self.data_offset + padded_size(self.data_size)
+
+
+def padded_size(size: int) -> int:
+    return -(-size // BLOCK_SIZE) * BLOCK_SIZE
+
+
+def index_filename(filename: str) -> str:
+    return f"{filename}.idx"
+
+
+def table_dtype(header: fits.Header) -> np.dtype:
+    """
+    Returns on-disk record dtype of the binary table described by the header.
+    """
+    names, formats = [], []
+
+    for i in range(1, header["TFIELDS"] + 1):
+        tform = header[f"TFORM{i}"].strip()
+        match = re.fullmatch(r"(\d*)([A-Z])", tform)
+
+        if match is None or (match.group(2) != "A" and match.group(2) not in _tform_dtypes):
+            raise ValueError(f"Unsupported format of the FITS column: {tform}")
+
+        repeat, code = int(match.group(1) or 1), match.group(2)
+        names.append(header[f"TTYPE{i}"])
+
+        if code == "A":
+            formats.append(f"S{repeat}")
+        elif repeat == 1:
+            formats.append(_tform_dtypes[code])
+        else:
+            formats.append(f"({repeat},){_tform_dtypes[code]}")
+
+    return np.dtype({"names": names, "formats": formats})
+
+
+def decode_field(raw: np.ndarray, header: fits.Header, key: str) -> np.ndarray:
+    """
+    Returns column of the raw table in the form astropy would return it.
+    """
+    for i in range(1, header["TFIELDS"] + 1):
+        if header[f"TTYPE{i}"] == key and header[f"TFORM{i}"].strip().endswith("L"):
+            return raw[key] == ord("T")
+
+    return raw[key]
+
+
+class FITSIndex:
+    """
+    Index of the FITS snapshot series. It is stored next to the FITS file
+    (`<filename>.idx`) and is brought up to date on each load: only the part of the file that
+    was appended after the last update is scanned.
+    """
+
+    def __init__(self, filename: str, entries: list[IndexEntry] | None = None):
+        self.filename = filename
+        self.entries = entries or []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, i: int) -> IndexEntry:
+        return self.entries[i]
+
+    @property
+    def end(self) -> int:
+        return self.entries[-1].end if self.entries else 0
+
+    @staticmethod
+    def load(filename: str) -> "FITSIndex":
+        """
+        Loads index of the file from the sidecar and updates it if the file was appended to.
+        Index is rebuilt from scratch if it does not describe the file anymore.
+        """
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(f"No such file: {filename}")
+
+        index = FITSIndex(filename, _read_entries(index_filename(filename)))
+
+        if not index._is_valid():
+            index.entries = []
+
+        scanned = len(index)
+        index.entries.extend(_scan(filename, index.end))
+
+        if len(index) != scanned or not os.path.isfile(index_filename(filename)):
+            index.save()
+
+        return index
+
+    def save(self):
+        try:
+            with open(index_filename(self.filename), "w") as f:
+                f.write(_INDEX_HEADER + "\n")
+                f.writelines(_format_entry(entry) for entry in self.entries)
+        except OSError as e:
+            logger.warn().string("filename", self.filename).exception("error", e).msg(
+                "unable to save FITS index"
+            )
+
+    def append(self, entry: IndexEntry):
+        """
+        Adds entry of the HDU that was just written to the end of the file.
+        """
+        self.entries.append(entry)
+
+        try:
+            with open(index_filename(self.filename), "a") as f:
+                if f.tell() == 0:
+                    f.write(_INDEX_HEADER + "\n")
+
+                f.write(_format_entry(entry))
+        except OSError as e:
+            logger.warn().string("filename", self.filename).exception("error", e).msg(
+                "unable to update FITS index"
+            )
+
+    def find(self, timestamp: float) -> int:
+        """
+        Returns number of the first snapshot with time (in Myr) not less than `timestamp`.
+        """
+        return bisect.bisect_left([entry.timestamp for entry in self.entries], timestamp)
+
+    def read_table(
+        self, i: int, memmap: bool = False, mapping: np.memmap | None = None
+    ) -> tuple[fits.Header, np.ndarray]:
+        """
+        Reads header and raw (big-endian) record array of the i-th snapshot. If `memmap` is
+        True, array is a view into the memory-mapped file. One can pass `mapping` of the whole
+        file to avoid mapping it on each call.
+        """
+        entry = self.entries[i]
+
+        with open(self.filename, "rb") as f:
+            f.seek(entry.header_offset)
+            header = fits.Header.fromfile(f)
+            dtype = table_dtype(header)
+
+            if not memmap:
+                f.seek(entry.data_offset)
+                return header, np.fromfile(f, dtype=dtype, count=entry.number_of_particles)
+
+        if mapping is None:
+            mapping = np.memmap(self.filename, dtype=np.uint8, mode="r")
+
+        raw = mapping[entry.data_offset : entry.data_offset + entry.data_size]
+
+        return header, raw.view(dtype)
+
+    def _is_valid(self) -> bool:
+        if not self.entries:
+            return True
+
+        if not os.path.isfile(self.filename) or os.path.getsize(self.filename) < self.end:
+            return False
+
+        for entry in (self.entries[0], self.entries[-1]):
+            try:
+                with open(self.filename, "rb") as f:
+                    f.seek(entry.header_offset)
+                    header = fits.Header.fromfile(f)
+            except Exception:
+                return False
+
+            if (
+                header.get("XTENSION") != "BINTABLE"
+                or header.get("TIME") != entry.timestamp
+                or header.get("NAXIS2") != entry.number_of_particles
+            ):
+                return False
+
+        return True
+
+
+def _format_entry(entry: IndexEntry) -> str:
+    return (
+        f"{entry.header_offset} {entry.data_offset} {entry.data_size} "
+        f"{entry.timestamp!r} {entry.number_of_particles}\n"
+    )
+
+
+def _read_entries(filename: str) -> list[IndexEntry]:
+    entries: list[IndexEntry] = []
+
+    if not os.path.isfile(filename):
+        return entries
+
+    with open(filename, "r") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+
+            header_offset, data_offset, data_size, timestamp, n = line.split()
+            entries.append(
+                IndexEntry(
+                    int(header_offset), int(data_offset), int(data_size), float(timestamp), int(n)
+                )
+            )
+
+    return entries
+
+
+def _scan(filename: str, offset: int) -> list[IndexEntry]:
+    """
+    Reads headers of the HDUs starting from `offset` and skips their data.
+    Stops on the first incomplete HDU.
+    """
+    entries: list[IndexEntry] = []
+
+    if not os.path.isfile(filename):
+        return entries
+
+    file_size = os.path.getsize(filename)
+
+    with open(filename, "rb") as f:
+        while offset < file_size:
+            f.seek(offset)
+
+            try:
+                header = fits.Header.fromfile(f)
+            except Exception:
+                break
+
+            data_offset = f.tell()
+            data_size = _data_size(header)
+
+            if data_offset + data_size > file_size:
+                break
+
+            if header.get("XTENSION") == "BINTABLE":
+                entries.append(
+                    IndexEntry(
+                        offset, data_offset, data_size, header.get("TIME", 0.0), header["NAXIS2"]
+                    )
+                )
+
+            offset = data_offset + padded_size(data_size)
+
+    return entries
+
+
+def _data_size(header: fits.Header) -> int:
+    naxis = header.get("NAXIS", 0)
+
+    if naxis == 0:
+        return 0
+
+    size = abs(header["BITPIX"]) // 8
+
+    for i in range(1, naxis + 1):
+        size *= header[f"NAXIS{i}"]
+
+    return header.get("GCOUNT", 1) * (size + header.get("PCOUNT", 0))
@@ -0,0 +1,75 @@
+"""
+Dispatching of the snapshot series readers and writers by the format of the file.
+"""
+from pathlib import Path
+from typing import Iterator
+
+from zlog import logger
+
+from omtool.core.datamodel.hdf5 import HDF5Writer, from_hdf5
+from omtool.core.datamodel.reader import from_fits
+from omtool.core.datamodel.snapshot import Snapshot
+from omtool.core.datamodel.writer import FITSWriter
+
+SnapshotWriter = FITSWriter | HDF5Writer
+
+_hdf5_suffixes = {".h5", ".hdf5", ".he5"}
+
+
+def get_format(filename: str, format: str | None = None) -> str:
+    """
+    Returns format of the file: `format` if it is specified, otherwise it is guessed from
+    the extension of the file (`fits` if it is not known).
+    """
+    if format is not None:
+        return format
+
+    return "hdf5" if Path(filename).suffix.lower() in _hdf5_suffixes else "fits"
+
+
+def open_writer(
+    filename: str,
+    format: str | None = None,
+    append: bool = False,
+    flush_interval: int = 1,
+    compression: str | None = None,
+    keep: int | None = None,
+) -> SnapshotWriter:
+    """
+    Opens writer of the snapshot series. Compression is supported only by the HDF5 format.
+    In append mode only first `keep` snapshots of the file are kept if it is specified.
+    """
+    format = get_format(filename, format)
+
+    if format == "hdf5":
+        return HDF5Writer(filename, append, flush_interval, compression, keep=keep)
+
+    if format == "fits":
+        if compression is not None:
+            logger.warn().string("compression", compression).msg(
+                "compression is not supported by FITS format, ignoring"
+            )
+
+        return FITSWriter(filename, append, flush_interval, keep=keep)
+
+    raise RuntimeError(f'Unknown format of the file: "{format}"')
+
+
+def from_file(
+    filename: str,
+    format: str | None = None,
+    snapshot_index: int | None = None,
+    limit: int | None = None,
+) -> Iterator[Snapshot]:
+    """
+    Loads snapshots from the FITS or HDF5 file.
+    """
+    format = get_format(filename, format)
+
+    if format == "hdf5":
+        return from_hdf5(filename, snapshot_index=snapshot_index, limit=limit)
+
+    if format == "fits":
+        return from_fits(filename, snapshot_index=snapshot_index, limit=limit)
+
+    raise RuntimeError(f'Unknown format of the file: "{format}"')
@@ -0,0 +1,191 @@
+"""
+Reading and writing of the snapshot series in HDF5 format.
+
+Each snapshot is stored as a group `/snapshots/<number>` with the `time` attribute (in Myr)
+and the `timestep` one (in Myr) if the integration timestep of the snapshot is known.
+Each column of the snapshot is a separate chunked (and optionally compressed) dataset with
+the `unit` attribute, so any subset of columns of any snapshot can be read without touching
+the rest of the file.
+"""
+import bisect
+from typing import Iterator
+
+import h5py
+import numpy as np
+from amuse.lab import ScalarQuantity, units
+
+from omtool.core.datamodel.particle_store import ParticleStore
+from omtool.core.datamodel.snapshot import (
+    Snapshot,
+    decode_column,
+    encode_column,
+    fields,
+)
+
+SNAPSHOTS_GROUP = "snapshots"
+TIME_UNIT = units.Myr
+_GROUP_NAME_LENGTH = 8
+
+
+def _group_name(number: int) -> str:
+    return str(number).zfill(_GROUP_NAME_LENGTH)
+
+
+def _read_group(group: h5py.Group, columns: set[str] | None) -> Snapshot:
+    store = ParticleStore(length=int(group.attrs["number_of_particles"]))
+
+    for (key, val) in fields.items():
+        if key not in group or (columns is not None and key not in columns):
+            continue
+
+        if val is not None:
+            store.set(key, group[key][()], val)
+        else:
+            store.set(key, decode_column(key, group[key][()]))
+
+    timestep = group.attrs.get("timestep")
+
+    return Snapshot(
+        timestamp=group.attrs["time"] | TIME_UNIT,
+        store=store,
+        timestep=timestep | TIME_UNIT if timestep is not None else None,
+    )
+
+
+def from_hdf5(
+    filename: str,
+    snapshot_index: int | None = None,
+    limit: int | None = None,
+    start_time: ScalarQuantity | None = None,
+    columns: set[str] | None = None,
+) -> Iterator[Snapshot]:
+    """
+    Loads snapshots from the HDF5 file.
+
+    Numbering of the snapshots is the same as in `from_fits`: first snapshot has index 1.
+    One can also start reading from the first snapshot with time not less than `start_time`.
+    If `columns` is specified, only these datasets are read.
+    """
+    if snapshot_index is not None and snapshot_index < 1:
+        raise ValueError(f"Snapshot index should be at least 1, got {snapshot_index}.")
+
+    with h5py.File(filename, "r") as file:
+        snapshots = file[SNAPSHOTS_GROUP]
+        names = sorted(snapshots.keys())
+        start = 0
+
+        if snapshot_index is not None:
+            start = snapshot_index - 1
+            limit = 1
+        elif start_time is not None:
+            times = [snapshots[name].attrs["time"] for name in names]
+            start = bisect.bisect_left(times, start_time.value_in(TIME_UNIT))
+
+        stop = start + limit if limit is not None else None
+
+        for name in names[start:stop]:
+            yield _read_group(snapshots[name], columns)
+
+
+class HDF5Writer:
+    """
+    Writer that keeps the HDF5 file open and appends snapshots to it. File is flushed to the
+    disk every `flush_interval` snapshots and on `close()`.
+
+    `compression` is the name of the lossless HDF5 filter (`gzip` or `lzf`) or `None`;
+    `chunk_size` is the number of particles in one chunk of the datasets. If `append` is True,
+    snapshots are added to the end of the existing file, after first `keep` ones if it is
+    specified.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        append: bool = False,
+        flush_interval: int = 1,
+        compression: str | None = None,
+        chunk_size: int = 1 << 16,
+        keep: int | None = None,
+    ):
+        if flush_interval < 1:
+            raise ValueError(f"Flush interval should be positive, got {flush_interval}.")
+
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self._unflushed = 0
+
+        self.file = h5py.File(filename, "a" if append else "w")
+        self.snapshots = self.file.require_group(SNAPSHOTS_GROUP)
+
+        if append and keep is not None:
+            for name in sorted(self.snapshots.keys())[keep:]:
+                del self.snapshots[name]
+
+    def __enter__(self) -> "HDF5Writer":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Number of the snapshots in the file.
+        """
+        return len(self.snapshots)
+
+    @property
+    def closed(self) -> bool:
+        return not self.file.id.valid
+
+    def write(self, snapshot: Snapshot):
+        """
+        Appends snapshot to the end of the file.
+        """
+        store = snapshot.store
+        group = self.snapshots.create_group(_group_name(len(self.snapshots)))
+        group.attrs["time"] = float(snapshot.timestamp.value_in(TIME_UNIT))
+        group.attrs["time_unit"] = str(TIME_UNIT)
+        group.attrs["number_of_particles"] = len(store)
+
+        if snapshot.timestep is not None:
+            group.attrs["timestep"] = float(snapshot.timestep.value_in(TIME_UNIT))
+
+        for (key, val) in fields.items():
+            if key not in store:
+                continue
+
+            if val is not None:
+                array = store.get(key, val).astype(np.float32)
+            elif key == "is_barion":
+                array = np.asarray(store[key], dtype=bool)
+            else:
+                array = encode_column(key, store[key])
+
+            dataset = group.create_dataset(
+                key,
+                data=array,
+                chunks=(max(1, min(len(array), self.chunk_size)),),
+                compression=self.compression,
+                shuffle=self.compression is not None,
+            )
+            dataset.attrs["unit"] = str(val)
+
+        self._unflushed += 1
+
+        if self._unflushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.closed:
+            return
+
+        self.file.flush()
+        self._unflushed = 0
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.file.close()
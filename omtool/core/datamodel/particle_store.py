@@ -0,0 +1,253 @@
+"""
+Columnar (struct-of-arrays) storage of the particle set.
+"""
+from functools import partial
+from typing import Callable, Iterable
+
+import numpy as np
+from amuse.datamodel.particles import Particles
+from amuse.lab import ScalarQuantity, units
+from amuse.units.quantities import is_quantity
+
+# Internal unit system of the OMTool. Columns with `None` unit are stored without units.
+canonical_units: dict[str, ScalarQuantity | None] = {
+    "x": units.kpc,
+    "y": units.kpc,
+    "z": units.kpc,
+    "vx": units.kms,
+    "vy": units.kms,
+    "vz": units.kms,
+    "mass": 232500 * units.MSun,
+    "is_barion": None,
+    "id": None,
+    "component": None,
+}
+
+_vector_attributes = {
+    "position": ("x", "y", "z"),
+    "velocity": ("vx", "vy", "vz"),
+}
+
+
+class ParticleStore:
+    """
+    Struct-of-arrays storage of the particle set. Each column is a contiguous NumPy array
+    with a unit tag attached to it; columns with `None` unit (e.g. `is_barion`) are
+    dimensionless. Units of the columns are not forced to be canonical: conversion
+    happens only when the column is requested in some other unit.
+
+    Columns might also be lazy: they are described by a loader function that is called
+    only when the column is accessed for the first time.
+    """
+
+    def __init__(
+        self,
+        columns: dict[str, np.ndarray] | None = None,
+        units: dict[str, ScalarQuantity | None] | None = None,
+        length: int | None = None,
+    ):
+        columns = columns or {}
+        units = units or {}
+
+        self._columns: dict[str, np.ndarray] = {}
+        self._loaders: dict[str, Callable[[], np.ndarray]] = {}
+        self._units: dict[str, ScalarQuantity | None] = {}
+        self._length = length
+        self._version = 0
+
+        for key, array in columns.items():
+            self.set(key, array, units.get(key, canonical_units.get(key)))
+
+    def __len__(self) -> int:
+        return self._length or 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._units
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """
+        Returns raw column in its own unit.
+        """
+        if key in self._loaders:
+            self._columns[key] = self._loaders.pop(key)()
+
+        return self._columns[key]
+
+    def keys(self) -> list[str]:
+        return list(self._units.keys())
+
+    @property
+    def version(self) -> int:
+        """
+        Number of the columns set so far; changes whenever the store is written with `set`.
+        """
+        return self._version
+
+    def unit(self, key: str) -> ScalarQuantity | None:
+        return self._units[key]
+
+    def get(self, key: str, unit: ScalarQuantity | None = None) -> np.ndarray:
+        """
+        Returns column converted to the given unit. If unit is not specified, canonical unit
+        of the column is used. Does not copy the data if column is already in the needed unit.
+        """
+        array = self[key]
+        own_unit = self._units[key]
+        if unit is None:
+            unit = canonical_units.get(key, own_unit)
+
+        if own_unit is None or unit is None or own_unit == unit:
+            return array
+
+        factor = own_unit.value_in(unit)
+
+        return array * factor if factor != 1 else array
+
+    def set(self, key: str, array, unit: ScalarQuantity | None = None):
+        """
+        Sets column. If `array` is a quantity, it is converted to the `unit` (its own unit
+        if not specified).
+        """
+        if is_quantity(array):
+            if unit is None:
+                unit = array.unit
+
+            array = array.value_in(unit)
+
+        array = np.asarray(array)
+
+        if self._length is not None and len(array) != self._length:
+            raise ValueError(
+                f"Column {key} has length {len(array)} while store has length {self._length}."
+            )
+
+        self._length = len(array)
+        self._columns[key] = array
+        self._loaders.pop(key, None)
+        self._units[key] = unit
+        self._version += 1
+
+    def set_lazy(self, key: str, loader: Callable[[], np.ndarray], unit: ScalarQuantity | None):
+        """
+        Sets lazy column. `loader` should return an array of the store's length; it is called
+        only once, when the column is accessed for the first time.
+        """
+        if self._length is None:
+            raise ValueError("Length of the store must be known to add lazy columns.")
+
+        self._columns.pop(key, None)
+        self._loaders[key] = loader
+        self._units[key] = unit
+        self._version += 1
+
+    def vector(self, name: str, unit: ScalarQuantity | None = None) -> np.ndarray:
+        """
+        Returns (N, 3) array of the vector attribute (`position` or `velocity`).
+        """
+        return np.column_stack([self.get(key, unit) for key in _vector_attributes[name]])
+
+    def set_vector(self, name: str, array: np.ndarray, unit: ScalarQuantity | None = None):
+        """
+        Sets vector attribute (`position` or `velocity`) from (N, 3) array.
+        """
+        for i, key in enumerate(_vector_attributes[name]):
+            self.set(
+                key,
+                np.ascontiguousarray(array[:, i]),
+                unit if unit is not None else canonical_units[key],
+            )
+
+    def select(self, index) -> "ParticleStore":
+        """
+        Returns new store with the rows selected by slice, mask or index array.
+        """
+        if isinstance(index, (int, np.integer)):
+            index = [index]
+
+        length = None if self._units else len(np.arange(len(self))[index])
+
+        return ParticleStore({key: self[key][index] for key in self.keys()}, self._units, length)
+
+    def project(self, keys: Iterable[str]) -> "ParticleStore":
+        """
+        Returns new store that shares the given columns with this one. Lazy columns stay lazy.
+        """
+        result = ParticleStore(length=len(self))
+
+        for key in keys:
+            if key in self._loaders:
+                result.set_lazy(key, partial(self.__getitem__, key), self._units[key])
+            elif key in self._columns:
+                result.set(key, self._columns[key], self._units[key])
+
+        return result
+
+    def copy(self) -> "ParticleStore":
+        return ParticleStore(
+            {key: np.array(self[key]) for key in self.keys()}, self._units, len(self)
+        )
+
+    @staticmethod
+    def concatenate(stores: list["ParticleStore"]) -> "ParticleStore":
+        """
+        Concatenates stores in one pass. Result has every column of any non-empty store, as
+        AMUSE particle sets do; stores without the column get zeros (empty strings, `False`)
+        of its type. Unit of the column is taken from the first store that has it.
+        """
+        stores = [store for store in stores if len(store) > 0]
+
+        if len(stores) == 0:
+            return ParticleStore()
+
+        keys = list(dict.fromkeys(key for store in stores for key in store.keys()))
+        result = ParticleStore(length=sum(len(store) for store in stores))
+
+        for key in keys:
+            first = next(store for store in stores if key in store)
+            unit, dtype = first.unit(key), first[key].dtype
+            result.set(
+                key,
+                np.concatenate(
+                    [
+                        store.get(key, unit) if key in store else np.zeros(len(store), dtype)
+                        for store in stores
+                    ]
+                ),
+                unit,
+            )
+
+        return result
+
+    @staticmethod
+    def from_particles(particles: Particles) -> "ParticleStore":
+        """
+        Converts AMUSE particle set into the store. Columns are kept in the units of the
+        particle set, so for the in-memory set they are views of its attributes, not copies.
+        """
+        store = ParticleStore(length=len(particles))
+
+        for key in particles.get_attribute_names_defined_in_store():
+            values = getattr(particles, key)
+
+            if is_quantity(values):
+                store.set(key, values.number, values.unit)
+            else:
+                store.set(key, values)
+
+        return store
+
+    def to_particles(self) -> Particles:
+        """
+        Converts the store into AMUSE particle set.
+        """
+        particles = Particles(len(self))
+
+        for key in self.keys():
+            array = self[key]
+
+            if (unit := self._units[key]) is not None:
+                setattr(particles, key, array | unit)
+            else:
+                setattr(particles, key, array)
+
+        return particles
@@ -0,0 +1,72 @@
+"""
+Read-ahead of the iterators in the background thread.
+"""
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetched(iterable: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Iterates over `iterable` in a background thread that keeps up to `depth` items ahead of
+    the consumer. Exceptions of the iterable are re-raised in the consuming thread. If
+    `depth` is 0, iterable is consumed directly.
+    """
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items: queue.Queue = queue.Queue(depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+
+            put(_END)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            if (close := getattr(iterator, "close", None)) is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="prefetcher", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = items.get()
+
+            if item is _END:
+                return
+
+            if isinstance(item, _Failure):
+                raise item.error
+
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
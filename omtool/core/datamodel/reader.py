@@ -1,93 +1,300 @@
 import gc
-from typing import Iterator
+import itertools
+from functools import partial
+from typing import Callable, Iterator
 
 import numpy as np
 import pandas as pd
-from amuse.datamodel.particles import Particle, Particles
-from amuse.lab import units
+from amuse.lab import ScalarQuantity, units
 from astropy.io import fits
 from astropy.io.fits.hdu.table import BinTableHDU
+from zlog import logger
 
-from omtool.core.datamodel.snapshot import Snapshot, fields
+from omtool.core.datamodel.fits_index import FITSIndex, decode_field
+from omtool.core.datamodel.particle_store import ParticleStore
+from omtool.core.datamodel.prefetch import prefetched
+from omtool.core.datamodel.snapshot import Snapshot, decode_column, fields
+
+
+def _column_view(field: Callable[[str], np.ndarray], key: str) -> Callable[[], np.ndarray]:
+    def load() -> np.ndarray:
+        array = field(key)
+
+        if fields[key] is None:
+            array = decode_column(key, array)
+        elif not array.dtype.isnative:
+            array = array.astype(array.dtype.newbyteorder("="))
+        else:
+            array = array.view()
+
+        array.flags.writeable = False
+
+        return array
+
+    return load
+
+
+def _build_snapshot(
+    header: fits.Header,
+    names: list[str],
+    field: Callable[[str], np.ndarray],
+    memmap: bool,
+    columns: set[str] | None = None,
+) -> Snapshot:
+    timestamp = header["TIME"] | units.Myr
+    timestep = header["TIMESTEP"] | units.Myr if "TIMESTEP" in header else None
+    # TODO: read units from TIME_UNIT if this entry exists, if not, use Myr
+    store = ParticleStore(length=header["NAXIS2"])
+
+    for (key, val) in fields.items():
+        if columns is not None and key not in columns:
+            continue
+
+        if memmap:
+            if key in names:
+                store.set_lazy(key, _column_view(field, key), val)
+        elif val is not None:
+            store.set(key, np.array(field(key)), val)
+        elif key in names:
+            store.set(key, np.array(decode_column(key, field(key))))
+
+    return Snapshot(timestamp=timestamp, store=store, timestep=timestep)
+
+
+def _read_table(table: BinTableHDU, memmap: bool, columns: set[str] | None) -> Snapshot:
+    return _build_snapshot(table.header, table.columns.names, table.data.field, memmap, columns)
+
+
+def _from_index(
+    filename: str, start: int, stop: int | None, memmap: bool, columns: set[str] | None
+) -> Iterator[Snapshot]:
+    index = FITSIndex.load(filename)
+    mapping = np.memmap(filename, dtype=np.uint8, mode="r") if memmap and len(index) else None
+
+    for i in range(start, len(index) if stop is None else min(stop, len(index))):
+        header, raw = index.read_table(i, memmap, mapping)
+        yield _build_snapshot(
+            header, list(raw.dtype.names or []), partial(decode_field, raw, header), memmap, columns
+        )
 
 
 def from_fits(
     filename: str,
     snapshot_index: int | None = None,
     limit: int | None = None,
+    memmap: bool = False,
+    start_time: ScalarQuantity | None = None,
+    columns: set[str] | None = None,
 ) -> Iterator[Snapshot]:
     """
     Loads snapshots from the FITS file where each HDU stores binary table with one timestamp.
 
-    Supports condition on snapshot index and limit.
-    """
-    hdul = fits.open(filename, memmap=False)
+    Supports condition on snapshot index (counted from 1) and limit. One can also start reading
+    from the first snapshot with time not less than `start_time`. In both cases the snapshot is
+    found using the HDU offset index (`<filename>.idx`, see `FITSIndex`) so preceding HDUs are
+    not read.
 
-    i = 0
-    number = 0
+    If `memmap` is True, the file is memory-mapped and columns of the snapshots are read-only
+    views into it. Each column is converted to the native byte order only when it is accessed
+    for the first time so the untouched columns are never read from the disk.
 
-    table: BinTableHDU
-    for table in hdul:
-        # skipping first HDU; it is required by the FITS specification.
-        if i == 0:
-            i += 1
-            continue
+    If `columns` is specified, only these columns are loaded into the snapshots; others are
+    neither decoded nor copied.
+    """
+    if snapshot_index is not None:
+        if snapshot_index < 1:
+            raise ValueError(f"Snapshot index should be at least 1, got {snapshot_index}.")
 
-        number_of_particles = len(table.data[list(fields.keys())[0]])
+        # index of the HDU; first one is the primary HDU.
+        yield from _from_index(filename, snapshot_index - 1, snapshot_index, memmap, columns)
+        return
 
-        timestamp = table.header["TIME"] | units.Myr
-        # TODO: read units from TIME_UNIT if this entry exists, if not, use Myr
-        particles = Particles(number_of_particles)
+    if start_time is not None:
+        index = FITSIndex.load(filename)
+        start = index.find(start_time.value_in(units.Myr))
+        stop = start + limit if limit is not None else None
+        yield from _from_index(filename, start, stop, memmap, columns)
+        return
 
-        for (key, val) in fields.items():
-            if val is not None:
-                setattr(particles, key, table.data[key] | val)
-            else:
-                try:
-                    data = np.array(table.data[key], dtype=np.float64)
-                except KeyError:
-                    continue
-                setattr(particles, key, data)
+    with fits.open(filename, memmap=memmap) as hdul:
+        number = 0
 
-        if (snapshot_index is not None and i == snapshot_index) or snapshot_index is None:
+        # HDUs are read lazily while iterating; slicing `hdul` would read all of the headers.
+        table: BinTableHDU
+        for table in itertools.islice(hdul, 1, None):
             number += 1
-            yield Snapshot(particles=particles, timestamp=timestamp)
-            del particles
-            del table
-            gc.collect()
+            yield _read_table(table, memmap, columns)
+
+            if not memmap:
+                del table
+                gc.collect()
 
             if limit is not None and number >= limit:
                 break
 
-        i += 1
-
-    hdul.close()
 
+def from_fits_series(
+    filenames: list[str],
+    limit: int | None = None,
+    memmap: bool = False,
+    start_time: ScalarQuantity | None = None,
+    columns: set[str] | None = None,
+    prefetch: int = 1,
+) -> Iterator[Snapshot]:
+    """
+    Loads snapshots from several FITS files as one series ordered by time. Order of the files
+    is used only to break ties; if several files have snapshot with the same time, the one
+    from the first of them is taken.
 
-def from_logged_csvs(filenames: list[str], delimiter: str = ",") -> Iterator["Snapshot"]:
+    Snapshots are located using the HDU offset indices of the files. Tables of the next
+    `prefetch` snapshots are read from the disk in the background thread while the current
+    one is being processed (memory-mapped files are not prefetched since they are read lazily).
     """
-    Loads snapshots from csv file in the following form: T,x,y,z,vx,vy,vz
+    indices = [FITSIndex.load(filename) for filename in filenames]
+    entries = sorted(
+        (entry.timestamp, file_number, i)
+        for file_number, index in enumerate(indices)
+        for i, entry in enumerate(index.entries)
+    )
+    series: list[tuple[int, int]] = []
+
+    for (timestamp, file_number, i) in entries:
+        if start_time is not None and timestamp < start_time.value_in(units.Myr):
+            continue
+
+        if series and indices[series[-1][0]][series[-1][1]].timestamp == timestamp:
+            (
+                logger.warn()
+                .string("filename", filenames[file_number])
+                .float("time", timestamp)
+                .msg("snapshot with this time was already read from another file, skipping")
+            )
+            continue
+
+        series.append((file_number, i))
+
+    if limit is not None:
+        series = series[:limit]
+
+    mappings: dict[int, np.memmap] = {}
 
-    Implementation is not lazy, iterators exist only for the convinience.
+    def read_tables() -> Iterator[tuple[fits.Header, np.ndarray]]:
+        for (file_number, i) in series:
+            if memmap and file_number not in mappings:
+                mappings[file_number] = np.memmap(filenames[file_number], dtype=np.uint8, mode="r")
+
+            yield indices[file_number].read_table(i, memmap, mappings.get(file_number))
+
+    for header, raw in prefetched(read_tables(), 0 if memmap else prefetch):
+        yield _build_snapshot(
+            header, list(raw.dtype.names or []), partial(decode_field, raw, header), memmap, columns
+        )
+
+
+# columns of the logged csv files that correspond to the snapshot fields.
+csv_columns = {
+    "x": "x",
+    "y": "y",
+    "z": "z",
+    "vx": "vx",
+    "vy": "vy",
+    "vz": "vz",
+    "mass": "m",
+}
+
+
+def _snapshots_from_table(table: pd.DataFrame) -> Iterator[Snapshot]:
     """
-    tables = [
-        pd.read_csv(filename, delimiter=delimiter, index_col=False).iterrows()
-        for filename in filenames
-    ]
+    Splits table into snapshots by the time column. Order of the rows with the same time
+    is preserved.
+    """
+    if len(table) == 0:
+        return
+
+    times = table["T"].to_numpy()
+    order = np.argsort(times, kind="stable")
+    boundaries = np.flatnonzero(np.diff(times[order])) + 1
+    arrays = {key: table[column].to_numpy() for key, column in csv_columns.items()}
+
+    for rows in np.split(order, boundaries):
+        if len(rows) == 0:
+            continue
+
+        store = ParticleStore(length=len(rows))
+
+        for key, array in arrays.items():
+            store.set(key, array[rows], fields[key])
+
+        store.set("is_barion", np.ones(len(rows)))
+
+        yield Snapshot(timestamp=times[rows[0]] | units.Myr, store=store)
+
+
+def _concat(tables: list[pd.DataFrame]) -> pd.DataFrame:
+    tables = [table for table in tables if len(table) > 0]
 
-    for rows in zip(*tables):
-        rows = [row for (_, row) in rows]
+    if len(tables) == 0:
+        return pd.DataFrame(columns=["T", *csv_columns.values()])
 
-        particles = Particles()
+    return pd.concat(tables, ignore_index=True)
 
-        for row in rows:
-            particle = Particle()
-            # TODO: need to use fields dict
-            particle.position = [row["x"], row["y"], row["z"]] | units.kpc
-            particle.velocity = [row["vx"], row["vy"], row["vz"]] | units.kms
-            particle.mass = row["m"] | units.MSun
-            particle.is_barion = 1
 
-            particles.add_particle(particle)
+def _read_csv(filename: str, delimiter: str, chunksize: int | None = None):
+    return pd.read_csv(
+        filename,
+        delimiter=delimiter,
+        index_col=False,
+        usecols=["T", *csv_columns.values()],
+        chunksize=chunksize,
+    )
+
+
+def _from_logged_csv_chunks(
+    filenames: list[str], delimiter: str, chunksize: int
+) -> Iterator[Snapshot]:
+    readers = [_read_csv(filename, delimiter, chunksize) for filename in filenames]
+    buffers = [_concat([]) for _ in readers]
+    exhausted = [False for _ in readers]
+
+    while True:
+        for i, reader in enumerate(readers):
+            times = buffers[i]["T"] if len(buffers[i]) > 0 else None
+
+            # rows of the last time in the buffer might continue in the next chunk.
+            if not exhausted[i] and (times is None or times.iloc[0] == times.iloc[-1]):
+                chunk = next(reader, None)
+
+                if chunk is None:
+                    exhausted[i] = True
+                else:
+                    buffers[i] = _concat([buffers[i], chunk])
+
+        if all(exhausted):
+            yield from _snapshots_from_table(_concat(buffers))
+            return
+
+        # all rows before the smallest of the last read times are already read from each file.
+        boundary = min(buffers[i]["T"].iloc[-1] for i in range(len(readers)) if not exhausted[i])
+        complete = [table[table["T"] < boundary] for table in buffers]
+        buffers = [table[table["T"] >= boundary] for table in buffers]
+
+        yield from _snapshots_from_table(_concat(complete))
+
+
+def from_logged_csvs(
+    filenames: list[str], delimiter: str = ",", chunksize: int | None = None
+) -> Iterator[Snapshot]:
+    """
+    Loads snapshots from csv files in the following form: T,x,y,z,vx,vy,vz,m. Each file is a log
+    of one or more bodies; rows of all files with the same `T` form one snapshot.
+
+    Files are parsed in bulk. If `chunksize` is specified, they are read by chunks of this
+    number of rows; in this case rows of each file must be ordered by time.
+    """
+    if chunksize is not None:
+        yield from _from_logged_csv_chunks(filenames, delimiter, chunksize)
+        return
+
+    tables = [_read_csv(filename, delimiter) for filename in filenames]
 
-        yield Snapshot(particles=particles, timestamp=rows[0]["T"] | units.Myr)
+    yield from _snapshots_from_table(_concat(tables))
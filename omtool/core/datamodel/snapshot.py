@@ -1,11 +1,13 @@
 """
 Struct that holds together particle set and timestamp that it describes.
 """
+import numpy as np
 import pandas as pd
 from amuse.datamodel.particles import Particles
 from amuse.lab import units
 from amuse.units.quantities import ScalarQuantity
-from astropy.io import fits
+
+from omtool.core.datamodel.particle_store import ParticleStore
 
 fields = {
     "x": units.kpc,
@@ -16,34 +18,121 @@ fields = {
     "vz": units.kms,
     "mass": units.MSun,
     "is_barion": None,
+    "id": None,
+    "component": None,
 }
 
+# formats of the FITS columns of the dimensionless fields; fields with units are stored as `E`.
+field_formats = {"is_barion": "L", "id": "K", "component": "A"}
+
+
+def decode_column(key: str, array: np.ndarray) -> np.ndarray:
+    """
+    Converts dimensionless column read from the file into its in-memory form: `id` is int64,
+    `component` is unicode string and the rest are float64.
+    """
+    if key == "component":
+        if array.dtype.kind == "S":
+            return np.char.decode(np.char.rstrip(array), "ascii")
+
+        return np.char.rstrip(np.asarray(array, dtype=str))
+
+    if key == "id":
+        return np.asarray(array, dtype=np.int64)
+
+    return np.asarray(array, dtype=np.float64)
+
+
+def encode_column(key: str, array: np.ndarray) -> np.ndarray:
+    """
+    Converts dimensionless column into the form it is stored in the files.
+    """
+    if key == "component":
+        return np.char.encode(np.asarray(array, dtype=str), "ascii")
+
+    return array
+
 
 class Snapshot:
     """
     Struct that holds together particle set and timestamp that it describes.
+
+    Columnar `ParticleStore` is the source of truth; readers, writers, actions and integrators
+    use it. AMUSE `Particles` used by the tasks are a view of the store that is built (with a
+    copy) on the first access of `particles` and reused until the store is written. Once the
+    view is built, columns of the store are views of its attributes, so changes of the values
+    made through either of them are seen by the other and getting the store back is free.
+    If particles are added to the view or it gets new attributes, `store` is derived from it
+    again, so one should not keep the store across such changes.
+
+    `timestep` is the integration timestep that the snapshot was obtained with, if it is known.
+    It is saved with the snapshot by the writers.
     """
 
     def __init__(
         self,
-        particles: Particles = Particles(),
+        particles: Particles | None = None,
         timestamp: ScalarQuantity = 0 | units.Myr,
+        store: ParticleStore | None = None,
+        timestep: ScalarQuantity | None = None,
     ):
-        self.particles = particles
+        self._particles: Particles | None = None
+        # version of the store that the particles were built from or derived to.
+        self._particles_version = -1
+
+        if particles is not None:
+            self.particles = particles
+        else:
+            self._store = store if store is not None else ParticleStore()
+
         self.timestamp = timestamp
+        self.timestep = timestep
+
+    def _has_current_particles(self) -> bool:
+        return self._particles is not None and self._particles_version == self._store.version
+
+    @property
+    def particles(self) -> Particles:
+        if not self._has_current_particles():
+            self.particles = self._store.to_particles()
+
+        return self._particles
+
+    @particles.setter
+    def particles(self, particles: Particles):
+        self._particles = particles
+        self._store = ParticleStore.from_particles(particles)
+        self._particles_version = self._store.version
+
+    @property
+    def store(self) -> ParticleStore:
+        if self._has_current_particles():
+            # particles might have been added or got new attributes; deriving the store from
+            # them does not copy the data.
+            self.particles = self._particles
+
+        return self._store
+
+    @store.setter
+    def store(self, store: ParticleStore):
+        self._store = store
+        self._particles = None
+
+    def __len__(self) -> int:
+        return len(self.store)
 
     def __getitem__(self, value) -> "Snapshot":
-        return Snapshot(self.particles[value], self.timestamp)
+        return Snapshot(
+            timestamp=self.timestamp, store=self.store.select(value), timestep=self.timestep
+        )
 
     def __add__(self, other: "Snapshot") -> "Snapshot":
         if self.timestamp != other.timestamp:
             raise RuntimeError("Tried to sum snapshots with different timestamps.")
 
-        particles = Particles()
-        particles.add_particles(self.particles)
-        particles.add_particles(other.particles)
-
-        return Snapshot(particles, self.timestamp)
+        return Snapshot(
+            timestamp=self.timestamp, store=ParticleStore.concatenate([self.store, other.store])
+        )
 
     def add(self, other: "Snapshot", ignore_timestamp: bool = False):
         """
@@ -54,52 +143,26 @@ class Snapshot:
         if not ignore_timestamp and (self.timestamp != other.timestamp):
             raise RuntimeError("Tried to sum snapshots with different timestamps.")
 
-        self.particles.add_particles(other.particles)
+        self.store = ParticleStore.concatenate([self.store, other.store])
 
     def to_fits(self, filename: str, append: bool = False):
         """
-        Writes the snapshot into FITS file.
+        Writes the snapshot into FITS file. To write a series of snapshots, use `FITSWriter`
+        instead: it does not reopen the file for each of them.
         """
-        cols = []
+        from omtool.core.datamodel.writer import FITSWriter
 
-        for (key, val) in fields.items():
-            if not hasattr(self.particles, key):
-                continue
-
-            array = getattr(self.particles, key)
-            fmt = "L"
-
-            if val is not None:
-                array = array.value_in(val)
-                fmt = "E"
-
-            col = fits.Column(name=key, unit=str(val), format=fmt, array=array)
-            cols.append(col)
-
-        cols = fits.ColDefs(cols)
-        hdu = fits.BinTableHDU.from_columns(cols)
-        hdu.header["TIME"] = self.timestamp.value_in(units.Myr)
-
-        if append:
-            try:
-                fits.append(filename, hdu.data, hdu.header)
-            except Exception:
-                hdu.writeto(filename, overwrite=True)
-        else:
-            hdu.writeto(filename, overwrite=True)
+        with FITSWriter(filename, append=append) as writer:
+            writer.write(self)
 
     def to_csv(self, filename: str):
         df = pd.DataFrame(columns=fields.keys())
+        store = self.store
 
         for key, val in fields.items():
-            if not hasattr(self.particles, key):
+            if key not in store:
                 continue
 
-            array = getattr(self.particles, key)
-
-            if val is not None:
-                array = array.value_in(val)
-
-            df[key] = array
+            df[key] = store.get(key, val)
 
         df.to_csv(filename)
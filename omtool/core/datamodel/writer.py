@@ -0,0 +1,187 @@
+"""
+Streaming writer of the FITS snapshot series.
+"""
+import os
+
+import numpy as np
+from amuse.lab import units
+from astropy.io import fits
+
+from omtool.core.datamodel.fits_index import (
+    FITSIndex,
+    IndexEntry,
+    index_filename,
+    padded_size,
+    table_dtype,
+)
+from omtool.core.datamodel.snapshot import (
+    Snapshot,
+    encode_column,
+    field_formats,
+    fields,
+)
+
+
+def table_header(snapshot: Snapshot) -> fits.Header:
+    """
+    Returns header of the binary table HDU that stores the snapshot.
+    """
+    store = snapshot.store
+    keys = [key for key in fields.keys() if key in store]
+    header = fits.Header(
+        [
+            ("XTENSION", "BINTABLE", "binary table extension"),
+            ("BITPIX", 8, "array data type"),
+            ("NAXIS", 2, "number of array dimensions"),
+            ("NAXIS1", 0, "length of dimension 1"),
+            ("NAXIS2", len(store), "length of dimension 2"),
+            ("PCOUNT", 0, "number of group parameters"),
+            ("GCOUNT", 1, "number of groups"),
+            ("TFIELDS", len(keys), "number of table fields"),
+        ]
+    )
+
+    for i, key in enumerate(keys, start=1):
+        header[f"TTYPE{i}"] = key
+        header[f"TFORM{i}"] = "E" if fields[key] is not None else field_formats[key]
+        header[f"TUNIT{i}"] = str(fields[key])
+
+        if header[f"TFORM{i}"] == "A":
+            width = encode_column(key, store[key]).dtype.itemsize
+            header[f"TFORM{i}"] = f"{max(width, 1)}A"
+
+    header["NAXIS1"] = table_dtype(header).itemsize
+    header["TIME"] = snapshot.timestamp.value_in(units.Myr)
+
+    if snapshot.timestep is not None:
+        header["TIMESTEP"] = (snapshot.timestep.value_in(units.Myr), "integration timestep, Myr")
+
+    return header
+
+
+def table_data(snapshot: Snapshot, header: fits.Header) -> np.ndarray:
+    """
+    Returns on-disk (big-endian) record array of the snapshot described by `header`.
+    """
+    store = snapshot.store
+    data = np.empty(len(store), dtype=table_dtype(header))
+
+    for key in data.dtype.names or []:
+        if fields[key] is not None:
+            data[key] = store.get(key, fields[key])
+        elif field_formats[key] == "L":
+            data[key] = np.where(np.asarray(store[key], dtype=bool), ord("T"), ord("F"))
+        else:
+            data[key] = encode_column(key, store[key])
+
+    return data
+
+
+_PRIMARY_HEADER_SIZE = len(fits.PrimaryHDU().header.tostring())
+
+
+class FITSWriter:
+    """
+    Writer that keeps the FITS file open and appends snapshots to it as binary table HDUs.
+    Output goes through the buffered file so the cost of each write does not depend on the
+    size of the file. Buffer is flushed to the disk every `flush_interval` snapshots and on
+    `close()`; HDU offset index (see `FITSIndex`) is updated on each flush.
+
+    If `append` is True and the file exists, snapshots are added after the last complete HDU
+    of it (after first `keep` ones if it is specified); otherwise the file is truncated.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        append: bool = False,
+        flush_interval: int = 1,
+        buffer_size: int = 1 << 20,
+        keep: int | None = None,
+    ):
+        if flush_interval < 1:
+            raise ValueError(f"Flush interval should be positive, got {flush_interval}.")
+
+        self.filename = filename
+        self.flush_interval = flush_interval
+        self._pending: list[IndexEntry] = []
+        self._unflushed = 0
+
+        if append and os.path.isfile(filename) and os.path.getsize(filename) > 0:
+            self.index = FITSIndex.load(filename)
+            self.file = open(filename, "r+b", buffering=buffer_size)
+
+            if keep is not None and keep < len(self.index):
+                self.index.entries = self.index.entries[:keep]
+                self.index.save()
+                self.file.truncate(self.index.end or _PRIMARY_HEADER_SIZE)
+
+            self.file.seek(0, os.SEEK_END)
+
+            if len(self.index) > 0:
+                # drops incomplete HDU that might have been left by the interrupted write.
+                self.file.truncate(self.index.end)
+                self.file.seek(self.index.end)
+        else:
+            if os.path.isfile(index_filename(filename)):
+                os.remove(index_filename(filename))
+
+            self.index = FITSIndex(filename)
+            self.file = open(filename, "wb", buffering=buffer_size)
+            self.file.write(fits.PrimaryHDU().header.tostring().encode("ascii"))
+
+    def __enter__(self) -> "FITSWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Number of the snapshots in the file.
+        """
+        return len(self.index) + len(self._pending)
+
+    @property
+    def closed(self) -> bool:
+        return self.file.closed
+
+    def write(self, snapshot: Snapshot):
+        """
+        Appends snapshot to the end of the file.
+        """
+        header = table_header(snapshot)
+        data = table_data(snapshot, header)
+        header_offset = self.file.tell()
+
+        self.file.write(header.tostring().encode("ascii"))
+        data_offset = self.file.tell()
+        self.file.write(data.tobytes())
+        self.file.write(b"\0" * (padded_size(data.nbytes) - data.nbytes))
+
+        self._pending.append(
+            IndexEntry(header_offset, data_offset, data.nbytes, header["TIME"], len(data))
+        )
+        self._unflushed += 1
+
+        if self._unflushed >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.closed:
+            return
+
+        self.file.flush()
+
+        for entry in self._pending:
+            self.index.append(entry)
+
+        self._pending = []
+        self._unflushed = 0
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.flush()
+        self.file.close()
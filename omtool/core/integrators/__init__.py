@@ -1,3 +1,4 @@
 from omtool.core.integrators.abstract_integrator import AbstractIntegrator
+from omtool.core.integrators.array_integrator import ArrayIntegrator
 from omtool.core.integrators.config import IntegratorConfig, initialize_integrator
 from omtool.core.integrators.plugin import register_integrator
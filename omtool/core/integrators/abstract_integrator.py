@@ -1,4 +1,8 @@
+import sys
 from abc import ABC, abstractmethod
+from typing import Any
+
+from amuse.lab import ScalarQuantity
 
 from omtool.core.datamodel.snapshot import Snapshot
 
@@ -11,3 +15,54 @@ class AbstractIntegrator(ABC):
     @abstractmethod
     def leapfrog(self, snapshot: Snapshot) -> Snapshot:
         raise NotImplementedError
+
+    def get_state(self) -> dict[str, Any]:
+        """
+        Returns state of the integrator that is not contained in the snapshot it produced
+        last, e.g. accelerations. It is saved in the checkpoints.
+        """
+        return {}
+
+    def restore(self, snapshot: Snapshot, state: dict[str, Any]) -> Snapshot:
+        """
+        Restores integrator from the checkpoint. Returns snapshot to continue integration from.
+        """
+        return snapshot
+
+    @property
+    def current_timestep(self) -> ScalarQuantity | None:
+        """
+        Timestep of the last step made, if the integrator knows it.
+        """
+        return None
+
+    def close(self):
+        """
+        Frees resources (e.g. processes) held by the integrator.
+        """
+
+    def advance(
+        self, snapshot: Snapshot, n_steps: int, stop_time: ScalarQuantity | None = None
+    ) -> tuple[Snapshot, int]:
+        """
+        Makes `n_steps` steps of integration or less if timestamp of the snapshot reaches
+        `stop_time`. Returns resulting snapshot and the number of steps made.
+
+        Intermediate snapshots are not needed by the caller, so integrators that keep their
+        own state should override this method to avoid materialising them.
+        """
+        steps = 0
+
+        while steps < n_steps and (stop_time is None or snapshot.timestamp < stop_time):
+            snapshot = self.leapfrog(snapshot)
+            steps += 1
+
+        return snapshot, steps
+
+    def advance_to(self, snapshot: Snapshot, time: ScalarQuantity) -> Snapshot:
+        """
+        Integrates the snapshot until its timestamp reaches `time`.
+        """
+        snapshot, _ = self.advance(snapshot, sys.maxsize, time)
+
+        return snapshot
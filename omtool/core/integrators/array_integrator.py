@@ -0,0 +1,419 @@
+"""
+Base class for the integrators that keep particles as raw arrays between the steps.
+"""
+from abc import abstractmethod
+from typing import Any
+
+import numpy as np
+from amuse.lab import ScalarQuantity, units
+
+from omtool.core.datamodel import ParticleStore, Snapshot
+from omtool.core.integrators.abstract_integrator import AbstractIntegrator
+from omtool.core.utils.external_potentials import create_potential
+from omtool.core.utils.external_potentials import gravity as external_gravity
+
+attr_unit_dict: dict[str, ScalarQuantity | None] = {
+    "position": units.kpc,
+    "velocity": units.kms,
+    "mass": 232500 * units.MSun,
+    "is_barion": None,
+    "id": None,
+    "component": None,
+}
+
+time_unit = units.Gyr
+
+_vector_columns = {
+    "position": ("x", "y", "z"),
+    "velocity": ("vx", "vy", "vz"),
+}
+_state_columns = {*_vector_columns["position"], *_vector_columns["velocity"], "mass"}
+
+# symplectic methods as compositions of the kick-drift-kick steps with given weights.
+_yoshida4 = 1 / (2 - 2 ** (1 / 3))
+_yoshida6 = (-1.17767998417887, 0.235573213359357, 0.784513610477560)
+_compositions = {
+    "leapfrog": (1.0,),
+    "yoshida4": (_yoshida4, 1 - 2 * _yoshida4, _yoshida4),
+    "yoshida6": (*_yoshida6[::-1], 1 - 2 * sum(_yoshida6), *_yoshida6),
+}
+METHODS = (*_compositions.keys(), "hermite")
+
+
+class ArrayIntegrator(AbstractIntegrator):
+    """
+    Integrator of the particles in the internal unit system. Subclasses only compute
+    accelerations in `gravity` (and, optionally, accelerations and their time derivatives in
+    `gravity_and_jerk`).
+
+    `method` is one of:
+    * `leapfrog`: second-order kick-drift-kick; one force evaluation per step.
+    * `yoshida4`: fourth-order symplectic composition of three leapfrog steps (Forest-Ruth,
+    Yoshida); three force evaluations per step.
+    * `yoshida6`: sixth-order symplectic composition of seven leapfrog steps (Yoshida's
+    solution A); seven force evaluations per step.
+    * `hermite`: fourth-order Hermite predictor-corrector; one evaluation of forces and jerks
+    per step. Available only if the subclass implements `gravity_and_jerk`.
+
+    Positions, velocities, masses and accelerations are kept between the steps as contiguous
+    arrays in the internal unit system, so the units are converted only when the integrator
+    gets a snapshot it did not produce itself. Snapshot returned by `leapfrog` shares these
+    arrays with the integrator: it is valid until the next step, and the state is reused
+    without any conversion when it is passed back.
+
+    If `levels` is positive, block timesteps are used: `0.5**kmax` becomes the largest step
+    and each particle is assigned the step `0.5**(kmax + level)` with `0 <= level <= levels`
+    from its acceleration by the criterion `sqrt(2 * eta * eps / |acc|)`. During the largest
+    step all particles are drifted with the smallest occupied step while only particles whose
+    own step starts or ends are kicked. Levels are reassigned at the end of each largest step,
+    when all particles are synchronised. After each substep forces are evaluated only for the
+    particles whose step ends, see `targeted_gravity`.
+
+    If `min_level < max_level`, single global timestep is adaptive: before each step it is set
+    to `0.5**(kmax + level)` with `min_level <= level <= max_level` from the smallest step
+    required by any particle, either by the acceleration criterion above or by the criterion
+    `eps / |vel|` that limits the path per step to the softening length. Step is refined at once
+    but coarsened only when the current time is a multiple of the coarser step, so the times of
+    the steps stay on the power-of-two grid. Negative `min_level` allows steps larger than
+    `0.5**kmax`.
+
+    `external_potentials` is the list of configs of analytic potentials whose accelerations are
+    added to the forces between the particles, e.g. `{"type": "nfw", "mass": ..., "radius": ...}`
+    (see `external_potentials.create_potential`). Moving potentials are evaluated at the time of
+    the current positions, including the substeps.
+
+    Particles of the `passive_components` and particles lighter than `passive_mass` are passive
+    (restricted N-body problem): they feel forces of the active particles but do not create
+    any. `active` is the mask of the active particles; subclasses compute forces from
+    `source_mass`, which is zero for the passive particles, or use the mask to skip them.
+
+    Args:
+    * `eps` (`ScalarQuantity`): softening length.
+    * `kmax` (`float`): exponent of the (largest) timestep.
+    * `levels` (`int`): number of the finer timestep levels; 0 means single global timestep.
+    * `eta` (`float`): accuracy parameter of the timestep criterion.
+    * `method` (`str`): integration method; block timesteps are supported only by `leapfrog`.
+    * `min_level` (`int`): level of the largest adaptive global timestep.
+    * `max_level` (`int`): level of the smallest adaptive global timestep.
+    * `external_potentials` (`list[dict]`): external potentials; not supported by `hermite`.
+    * `passive_components` (`list[str]`): components of the passive particles.
+    * `passive_mass` (`ScalarQuantity`): particles lighter than this are passive.
+    """
+
+    def __init__(
+        self,
+        eps: ScalarQuantity,
+        kmax: float,
+        levels: int = 0,
+        eta: float = 0.025,
+        method: str = "leapfrog",
+        min_level: int = 0,
+        max_level: int = 0,
+        external_potentials: list[dict[str, Any]] | None = None,
+        passive_components: list[str] | None = None,
+        passive_mass: ScalarQuantity | None = None,
+    ):
+        if levels < 0:
+            raise ValueError(f"Number of timestep levels should be non-negative, got {levels}.")
+
+        if method not in METHODS:
+            raise ValueError(f"Unknown integration method {method}, expected one of {METHODS}.")
+
+        if levels > 0 and method != "leapfrog":
+            raise ValueError(f"Block timesteps are not supported by {method} method.")
+
+        if min_level > max_level:
+            raise ValueError(
+                f"Minimal timestep level {min_level} is greater than maximal one {max_level}."
+            )
+
+        if levels > 0 and min_level < max_level:
+            raise ValueError("Adaptive global timestep can not be used with block timesteps.")
+
+        if method == "hermite" and external_potentials:
+            raise ValueError(f"External potentials are not supported by {method} method.")
+
+        if method == "hermite" and not self.provides_jerk():
+            raise ValueError(f"{type(self).__name__} does not compute jerks needed by {method}.")
+
+        self.eps = eps.value_in(attr_unit_dict["position"])
+        self.base_time = 0.5**kmax
+        self.levels = levels
+        self.min_level = min_level
+        self.max_level = max_level
+        self.step_level = max_level
+        self.delta_time = self.base_time * 0.5**self.step_level
+        # time since the snapshot was loaded, in the smallest adaptive steps.
+        self.ticks = 0
+        self.eta = eta
+        self.method = method
+
+        self.position = np.empty((0, 3))
+        self.velocity = np.empty((0, 3))
+        self.mass = np.empty(0, dtype=np.float32)
+        self.acc: np.ndarray | None = None
+        self.jerk: np.ndarray | None = None
+        self.step_levels = np.empty(0, dtype=np.int64)
+        self.time = 0.0
+        # time of the current positions, differs from `time` inside of the step.
+        self.position_time = 0.0
+        self.potentials = [create_potential(config) for config in external_potentials or []]
+        self.passive_components = passive_components or []
+        self.passive_mass = (
+            passive_mass.value_in(attr_unit_dict["mass"]) if passive_mass is not None else None
+        )
+        self.active = np.empty(0, dtype=bool)
+        self.source_mass = self.mass
+        self.extra_columns = ParticleStore()
+        self._snapshot: Snapshot | None = None
+
+    def load(self, snapshot: Snapshot):
+        """
+        Replaces the state of the integrator with the snapshot.
+        """
+        store = snapshot.store
+        self.position = store.vector("position", attr_unit_dict["position"]).astype(np.float64)
+        self.velocity = store.vector("velocity", attr_unit_dict["velocity"]).astype(np.float64)
+        # force solvers work in single precision; masses do not change so they are converted once.
+        self.mass = np.ascontiguousarray(store.get("mass", attr_unit_dict["mass"]), np.float32)
+        self.acc = None
+        self.jerk = None
+        self.time = snapshot.timestamp.value_in(time_unit)
+        self.position_time = self.time
+        self.ticks = 0
+        self.extra_columns = store.project(key for key in store.keys() if key not in _state_columns)
+        self.active = self._active_particles()
+        self.source_mass = (
+            self.mass if self.active.all() else np.where(self.active, self.mass, np.float32(0))
+        )
+        self._snapshot = None
+
+    def _active_particles(self) -> np.ndarray:
+        active = np.ones(len(self.mass), dtype=bool)
+
+        if self.passive_components:
+            if "component" not in self.extra_columns:
+                raise ValueError("Snapshot has no component column to select passive particles.")
+
+            active &= ~np.isin(self.extra_columns["component"], self.passive_components)
+
+        if self.passive_mass is not None:
+            active &= self.mass >= self.passive_mass
+
+        return active
+
+    def get_snapshot(self) -> Snapshot:
+        """
+        Returns snapshot that describes current state. Its columns are views of the state
+        arrays, so no data is copied.
+        """
+        if self._snapshot is None:
+            store = self.extra_columns.project(self.extra_columns.keys())
+
+            for name, keys in _vector_columns.items():
+                array = getattr(self, name)
+
+                for i, key in enumerate(keys):
+                    store.set(key, array[:, i], attr_unit_dict[name])
+
+            store.set("mass", self.mass, attr_unit_dict["mass"])
+            self._snapshot = Snapshot(timestamp=self.time | time_unit, store=store)
+
+        return self._snapshot
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "acc": None if self.acc is None else self.acc.copy(),
+            "jerk": None if self.jerk is None else self.jerk.copy(),
+            "step_levels": self.step_levels.copy(),
+            "step_level": self.step_level,
+            "ticks": self.ticks,
+        }
+
+    def restore(self, snapshot: Snapshot, state: dict[str, Any]) -> Snapshot:
+        self.load(snapshot)
+        self.acc = state["acc"]
+        self.jerk = state.get("jerk")
+        self.step_levels = state["step_levels"]
+        self.step_level = state.get("step_level", self.step_level)
+        self.ticks = state.get("ticks", 0)
+        self.delta_time = self.base_time * 0.5**self.step_level
+
+        return self.get_snapshot()
+
+    @abstractmethod
+    def gravity(self) -> np.ndarray:
+        """
+        Returns (N, 3) array of accelerations of the particles at their current positions.
+        """
+        raise NotImplementedError
+
+    def targeted_gravity(self, targets: np.ndarray) -> np.ndarray:
+        """
+        Returns accelerations of the particles selected by the boolean mask `targets` from all of
+        the particles. Subclasses override it if forces on the subset of the particles are cheaper
+        than on all of them; otherwise (e.g. with the tree code of `pyfalcon`) forces of all of the
+        particles are evaluated and the targets are selected.
+        """
+        return self.gravity()[targets]
+
+    def accelerations(self, targets: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns accelerations of the particles from each other and from the external potentials.
+        If the boolean mask `targets` is given, returns accelerations of these particles only.
+        """
+        if targets is None or targets.all():
+            acc = self.gravity()
+            position = self.position
+        else:
+            acc = self.targeted_gravity(targets)
+            position = self.position[targets]
+
+        if self.potentials:
+            external_acc, _ = external_gravity(self.potentials, position, self.position_time)
+            acc = acc + external_acc
+
+        return acc
+
+    def gravity_and_jerk(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (N, 3) arrays of accelerations of the particles and their time derivatives
+        at current positions and velocities.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def provides_jerk(cls) -> bool:
+        return cls.gravity_and_jerk is not ArrayIntegrator.gravity_and_jerk
+
+    def _step_levels(self, acc: np.ndarray) -> np.ndarray:
+        """
+        Returns timestep levels of the particles with given accelerations.
+        """
+        with np.errstate(divide="ignore"):
+            required_step = np.sqrt(2 * self.eta * self.eps / np.linalg.norm(acc, axis=1))
+            levels = np.ceil(np.log2(self.delta_time / required_step))
+
+        return np.clip(levels, 0, self.levels).astype(np.int64)
+
+    def _adapt_step(self, acc: np.ndarray):
+        """
+        Chooses level of the adaptive global timestep for the next step.
+        """
+        with np.errstate(divide="ignore"):
+            required_step = min(
+                np.sqrt(2 * self.eta * self.eps / np.linalg.norm(acc, axis=1)).min(initial=np.inf),
+                (self.eps / np.linalg.norm(self.velocity, axis=1)).min(initial=np.inf),
+            )
+            level = np.ceil(np.log2(self.base_time / required_step))
+
+        level = int(np.clip(level, self.min_level, self.max_level))
+
+        # coarsest level whose steps start at the current time.
+        aligned_level = self.max_level
+        while aligned_level > level and self.ticks % 2 ** (self.max_level - aligned_level + 1) == 0:
+            aligned_level -= 1
+
+        self.step_level = aligned_level
+        self.delta_time = self.base_time * 0.5**self.step_level
+
+    def _block_step(self, acc: np.ndarray):
+        """
+        Makes one largest step with block timesteps. Step of the particle on the level `l` spans
+        `2**(m - l)` substeps where `m` is the finest occupied level.
+        """
+        finest_level = int(self.step_levels.max(initial=0))
+        substep = self.delta_time / 2**finest_level
+        substeps_per_step = 2 ** (finest_level - self.step_levels)
+        half_steps = (self.delta_time / 2 ** (self.step_levels + 1))[:, np.newaxis]
+
+        for i in range(2**finest_level):
+            starting = i % substeps_per_step == 0
+            self.velocity[starting] += acc[starting] * half_steps[starting]
+
+            self.position += self.velocity * substep
+            self.position_time += substep
+
+            ending = (i + 1) % substeps_per_step == 0
+            acc[ending] = self.accelerations(ending)
+            self.velocity[ending] += acc[ending] * half_steps[ending]
+
+        self.step_levels = self._step_levels(acc)
+
+    def _kick_drift_kick(self, dt: float, acc: np.ndarray):
+        self.velocity += acc * (dt / 2)
+        self.position += self.velocity * dt
+        self.position_time += dt
+        self.acc = self.accelerations()
+        self.velocity += self.acc * (dt / 2)
+
+    def _hermite_step(self, acc: np.ndarray, jerk: np.ndarray):
+        """
+        Makes one step of the fourth-order Hermite predictor-corrector scheme.
+        """
+        dt = self.delta_time
+        position, velocity = self.position, self.velocity
+
+        self.position = position + velocity * dt + acc * (dt**2 / 2) + jerk * (dt**3 / 6)
+        self.velocity = velocity + acc * dt + jerk * (dt**2 / 2)
+        self.acc, self.jerk = self.gravity_and_jerk()
+
+        self.velocity = velocity + (acc + self.acc) * (dt / 2) + (jerk - self.jerk) * (dt**2 / 12)
+        self.position = (
+            position + (velocity + self.velocity) * (dt / 2) + (acc - self.acc) * (dt**2 / 12)
+        )
+
+    def step(self):
+        """
+        Makes one step of the current state.
+        """
+        if self.method == "hermite":
+            if self.acc is None or self.jerk is None:
+                self.acc, self.jerk = self.gravity_and_jerk()
+
+            if self.min_level < self.max_level:
+                self._adapt_step(self.acc)
+
+            self._hermite_step(self.acc, self.jerk)
+        else:
+            if self.acc is None:
+                self.acc = self.accelerations()
+                self.step_levels = self._step_levels(self.acc)
+
+            if self.min_level < self.max_level:
+                self._adapt_step(self.acc)
+
+            if self.levels > 0:
+                self._block_step(self.acc)
+            else:
+                for weight in _compositions[self.method]:
+                    self._kick_drift_kick(weight * self.delta_time, self.acc)
+
+        self.time += self.delta_time
+        self.position_time = self.time
+        self.ticks += 2 ** (self.max_level - self.step_level)
+        self._snapshot = None
+
+    @property
+    def current_timestep(self) -> ScalarQuantity:
+        return self.delta_time | time_unit
+
+    def leapfrog(self, snapshot: Snapshot) -> Snapshot:
+        snapshot, _ = self.advance(snapshot, 1)
+
+        return snapshot
+
+    def advance(
+        self, snapshot: Snapshot, n_steps: int, stop_time: ScalarQuantity | None = None
+    ) -> tuple[Snapshot, int]:
+        if snapshot is not self._snapshot:
+            self.load(snapshot)
+
+        stop = stop_time.value_in(time_unit) if stop_time is not None else np.inf
+        steps = 0
+
+        while steps < n_steps and self.time < stop:
+            self.step()
+            steps += 1
+
+        return self.get_snapshot(), steps
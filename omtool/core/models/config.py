@@ -25,6 +25,7 @@ class ModelConfig:
     velocity: VectorQuantity
     downsample_to: Optional[int]
     rotation: Optional[RotationConfig]
+    component: Optional[str]
 
 
 def get_model(model_name: str, args: dict) -> AbstractModel | None:
@@ -106,6 +107,9 @@ def initialize_models(imports: list[str], configs: list[ModelConfig]) -> list[Sn
                 .msg("rotated")
             )
 
+        label = config.component if config.component is not None else config.name
+        snapshot.store.set("component", np.full(len(snapshot), label))
+
         models.append(snapshot)
         (
             logger.info()
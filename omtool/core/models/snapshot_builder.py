@@ -1,20 +1,64 @@
 """
 Builder for the snapshot from smaller snapshots.
 """
+import numpy as np
 from amuse.datamodel.particles import Particles
 from amuse.lab import units
 from amuse.units.quantities import VectorQuantity
 
-from omtool.core.datamodel import Snapshot
+from omtool.core.datamodel import ParticleStore, Snapshot
+
+_vector_columns = {
+    "position": ("x", "y", "z"),
+    "velocity": ("vx", "vy", "vz"),
+}
+
+
+def _shift(store: ParticleStore, name: str, offset: VectorQuantity):
+    for key, value in zip(_vector_columns[name], offset):
+        if key not in store:
+            continue
+
+        unit = store.unit(key)
+
+        if (shift := value.value_in(unit)) != 0:
+            store.set(key, store[key] + shift, unit)
+
+
+def _move_to_center(store: ParticleStore):
+    """
+    Moves the store into its center of mass frame.
+    """
+    if len(store) == 0 or "mass" not in store:
+        return
+
+    mass = store["mass"]
+    total_mass = mass.sum()
+
+    for keys in _vector_columns.values():
+        for key in keys:
+            if key in store:
+                store.set(key, store[key] - np.dot(mass, store[key]) / total_mass, store.unit(key))
 
 
 class SnapshotBuilder:
     """
-    Builder for the snapshot from smaller snapshots.
+    Builder for the snapshot from smaller snapshots. Components are kept separately and are
+    concatenated only once, when the result is requested, so building takes time linear in
+    the total number of particles.
     """
 
     def __init__(self):
-        self.snapshot = Snapshot(Particles(), 0 | units.Myr)
+        self.components: list[ParticleStore] = []
+        self.timestamp = 0 | units.Myr
+        self._result: Snapshot | None = None
+
+    @property
+    def component_offsets(self) -> list[int]:
+        """
+        Index of the first particle of each component in the resulting snapshot.
+        """
+        return np.cumsum([0, *[len(store) for store in self.components]])[:-1].tolist()
 
     def add_snapshot(
         self,
@@ -25,28 +69,39 @@ class SnapshotBuilder:
         """
         Appends snapshot of any number of particles to the result.
         """
-        snapshot.particles.position += offset
-        snapshot.particles.velocity += velocity
+        store = snapshot.store
+        _shift(store, "position", offset)
+        _shift(store, "velocity", velocity)
 
-        self.snapshot = self.snapshot + snapshot
+        self.components.append(store)
+        self._result = None
 
     def add_particles(self, particles: Particles):
         """
-        Appends particles to the result and takes timestamp from it.
+        Appends particles to the result.
         """
-        self.snapshot.particles.add_particles(particles)
+        self.components.append(ParticleStore.from_particles(particles))
+        self._result = None
 
     def get_result(self) -> Snapshot:
         """
-        Returns resulting snapshot.
+        Returns resulting snapshot moved into its center of mass frame. Particles get `id`
+        equal to their index in it. Columns missing in some components are filled with zeros
+        there, e.g. components without label get an empty one (see `ParticleStore.concatenate`).
         """
-        self.snapshot.particles.move_to_center()
+        if self._result is None:
+            store = ParticleStore.concatenate(self.components)
+            _move_to_center(store)
+
+            if len(store) > 0:
+                store.set("id", np.arange(len(store), dtype=np.int64))
+
+            self._result = Snapshot(timestamp=self.timestamp, store=store)
 
-        return self.snapshot
+        return self._result
 
     def to_fits(self, filename: str):
         """
         Writes reult to FITS file.
         """
-        self.snapshot.particles.move_to_center()
-        self.snapshot.to_fits(filename)
+        self.get_result().to_fits(filename)
@@ -1,9 +1,13 @@
 from omtool.core.tasks.abstract_task import (
+    KINEMATIC_COLUMNS,
+    POSITION_COLUMNS,
+    VELOCITY_COLUMNS,
     AbstractTask,
     AbstractTimeTask,
     DataType,
+    get_columns,
     get_parameters,
 )
-from omtool.core.tasks.config import TasksConfig, initialize_tasks
+from omtool.core.tasks.config import TasksConfig, get_required_columns, initialize_tasks
 from omtool.core.tasks.handler_task import HandlerTask
 from omtool.core.tasks.plugin import register_task
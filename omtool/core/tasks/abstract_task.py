@@ -2,7 +2,7 @@
 Abstract tasks' classes. Import this if you want to create your own task.
 """
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple
+from typing import Any, Iterable, List, Tuple
 
 import numpy as np
 from amuse.lab import Particles, ScalarQuantity, units
@@ -11,30 +11,65 @@ from omtool.core.datamodel.snapshot import Snapshot
 
 DataType = dict[str, Any]
 
+# columns of the snapshot that correspond to the parameters from `get_parameters`.
+parameter_columns = {
+    "x": "x",
+    "y": "y",
+    "z": "z",
+    "vx": "vx",
+    "vy": "vy",
+    "vz": "vz",
+    "m": "mass",
+}
+
+POSITION_COLUMNS = {"x", "y", "z"}
+VELOCITY_COLUMNS = {"vx", "vy", "vz"}
+KINEMATIC_COLUMNS = POSITION_COLUMNS | VELOCITY_COLUMNS | {"mass"}
+
 
 def get_parameters(particles: Particles) -> dict:
     """
     Returns parameters of the particle set that can be used in expression evaluation.
+    Parameters whose columns were not loaded are omitted.
     """
     return {
-        "x": particles.x,
-        "y": particles.y,
-        "z": particles.z,
-        "vx": particles.vx,
-        "vy": particles.vy,
-        "vz": particles.vz,
-        "m": particles.mass,
+        param: getattr(particles, column)
+        for param, column in parameter_columns.items()
+        if hasattr(particles, column)
     }
 
 
+def get_columns(variables: Iterable[str]) -> set[str]:
+    """
+    Returns set of the snapshot columns needed to evaluate expression with given variables.
+    """
+    return {parameter_columns[var] for var in variables if var in parameter_columns}
+
+
 class AbstractTask(ABC):
     """
     Base class for the tasks that operate on snapshots.
+
+    `columns` is the set of snapshot columns the task reads. Readers load only the columns
+    required by the configured tasks; `None` means that the task might need all of them.
+
+    `state_attributes` are the attributes that are changed by the runs of the task; they are
+    saved in the checkpoints of the integration.
     """
 
+    columns: set[str] | None = None
+    state_attributes: tuple[str, ...] = ()
+
     def __init__(self):
         super().__init__()
 
+    def get_state(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.state_attributes}
+
+    def set_state(self, state: dict[str, Any]):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     @abstractmethod
     def run(self, snapshot: Snapshot) -> DataType:
         """
@@ -48,6 +83,8 @@ class AbstractTimeTask(AbstractTask):
     Base class for all tasks that show evolution of some value over time.
     """
 
+    state_attributes = ("times", "values")
+
     def __init__(self, value_unit: ScalarQuantity, time_unit: ScalarQuantity = 1 | units.Myr):
         self.time_unit = time_unit
         self.value_unit = value_unit
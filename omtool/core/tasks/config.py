@@ -17,6 +17,7 @@ class TasksConfig:
     inputs: dict[str, str]
     actions_before: list[dict]
     actions_after: list[dict]
+    interval: int | None = None
 
 
 def get_task(task_name: str, args: dict) -> AbstractTask | None:
@@ -28,6 +29,7 @@ def initialize_tasks(
     configs: list[TasksConfig],
     actions_before: dict[str, Callable],
     actions_after: dict[str, Callable],
+    actions_before_columns: dict[str, set[str]] | None = None,
 ) -> dict[str, HandlerTask]:
     import_modules(imports)
     tasks: dict[str, HandlerTask] = {}
@@ -46,6 +48,7 @@ def initialize_tasks(
 
         curr_task = HandlerTask(task)
         curr_task.inputs = config.inputs
+        curr_task.interval = config.interval
 
         for action_params in config.actions_before:
             action_name = action_params.pop("type", None)
@@ -69,6 +72,11 @@ def initialize_tasks(
 
             curr_task.actions_before.append(action)
 
+            if actions_before_columns is None or action_name not in actions_before_columns:
+                curr_task.actions_columns = None
+            elif curr_task.actions_columns is not None:
+                curr_task.actions_columns |= actions_before_columns[action_name]
+
         for handler_params in config.actions_after:
             handler_name = handler_params.pop("type", None)
 
@@ -102,3 +110,18 @@ def initialize_tasks(
         logger.debug().string("name", config.name).msg("initialized task")
 
     return tasks
+
+
+def get_required_columns(tasks: dict[str, HandlerTask]) -> set[str] | None:
+    """
+    Returns union of the columns needed by the tasks or `None` if any of them needs all columns.
+    """
+    columns: set[str] = set()
+
+    for task in tasks.values():
+        if (task_columns := task.columns) is None:
+            return None
+
+        columns |= task_columns
+
+    return columns
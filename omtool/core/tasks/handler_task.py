@@ -24,6 +24,20 @@ class HandlerTask:
         self.inputs = inputs
         self.actions_before = actions_before
         self.actions_after = actions_after
+        self.actions_columns: set[str] | None = set()
+        # number of integration steps between the runs; `None` means the default one.
+        self.interval: int | None = None
+
+    @property
+    def columns(self) -> set[str] | None:
+        """
+        Columns of the snapshot that are needed by the task and its actions.
+        `None` means that all of them might be needed.
+        """
+        if self.task.columns is None or self.actions_columns is None:
+            return None
+
+        return self.task.columns | self.actions_columns
 
     def run(self, snapshot: Snapshot, previous_outputs: dict[str, DataType]) -> DataType:
         """
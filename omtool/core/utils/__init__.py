@@ -1,5 +1,7 @@
+from omtool.core.utils.background_worker import BackgroundWorker
 from omtool.core.utils.base_test_case import BaseTestCase
 from omtool.core.utils.galactic_utils import get_galactic_basis
 from omtool.core.utils.logger_utils import initialize_logger
 from omtool.core.utils.math import get_lengths, sort_with
+from omtool.core.utils.output_schedule import OutputSchedule
 from omtool.core.utils.plugins import import_modules
@@ -0,0 +1,91 @@
+"""
+Thread that executes jobs in the background in the order of their submission.
+"""
+import queue
+import threading
+from typing import Any, Callable
+
+
+class BackgroundWorker:
+    """
+    Executes submitted jobs one by one in a separate thread. Queue of the jobs is bounded:
+    `submit` blocks while there are `max_queue_size` pending jobs, so the producer never runs
+    too far ahead of the consumer. If `max_queue_size` is 0, jobs are executed synchronously
+    in the calling thread.
+
+    Exception raised by a job is re-raised in the calling thread on the next call of `submit`,
+    `join` or `close`. Failure is sticky: the rest of the queued jobs are skipped and further
+    calls of `submit` raise `RuntimeError`.
+    """
+
+    def __init__(self, max_queue_size: int = 2, name: str = "background_worker"):
+        if max_queue_size < 0:
+            raise ValueError(f"Queue size should be non-negative, got {max_queue_size}.")
+
+        self._error: BaseException | None = None
+        self._failed = False
+        self._thread: threading.Thread | None = None
+
+        if max_queue_size > 0:
+            self._queue: queue.Queue = queue.Queue(max_queue_size)
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+
+            try:
+                if job is None:
+                    return
+
+                if not self._failed:
+                    func, args = job
+                    func(*args)
+            except BaseException as e:
+                self._error = e
+                self._failed = True
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, func: Callable[..., Any], *args):
+        """
+        Schedules `func(*args)`. Blocks if the queue is full.
+        """
+        self._raise_error()
+
+        if self._failed:
+            raise RuntimeError("Worker has failed, no more jobs are accepted.")
+
+        if self._thread is None:
+            func(*args)
+            return
+
+        if not self._thread.is_alive():
+            raise RuntimeError("Worker is closed.")
+
+        self._queue.put((func, args))
+
+    def join(self):
+        """
+        Waits until all of the submitted jobs are done.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+        self._raise_error()
+
+    def close(self):
+        """
+        Finishes submitted jobs and stops the thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+        self._raise_error()
@@ -14,6 +14,9 @@ class BaseTestCase(unittest.TestCase):
     def assertNdarraysEqual(self, first: np.ndarray, second: np.ndarray):
         np.testing.assert_array_equal(first, second)
 
+    def assertNdarraysAlmostEqual(self, first: np.ndarray, second: np.ndarray, rtol=1e-7, atol=0):
+        np.testing.assert_allclose(first, second, rtol=rtol, atol=atol)
+
     def assertSnapshotsEqual(self, first: Snapshot, second: Snapshot, test_kinematics: bool = True):
         self.assertEqual(len(first.particles), len(second.particles))
 
@@ -0,0 +1,306 @@
+"""
+Direct summation of the softened gravitational forces in the internal unit system (G = 1).
+"""
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from amuse.lab import Particles, ScalarQuantity, VectorQuantity, units
+
+length_unit = units.kpc
+mass_unit = 232500 * units.MSun
+time_unit = units.Gyr
+
+
+def _tile(
+    sinks: slice,
+    position: np.ndarray,
+    mass: np.ndarray,
+    eps2: float,
+    tile_size: int,
+    acc: np.ndarray,
+    pot: np.ndarray,
+    source_position: np.ndarray | None = None,
+):
+    """
+    Computes accelerations and potentials of the `sinks` from all of the particles, one
+    (sinks, tile_size) block of pairwise distances at a time. If `source_position` is given,
+    forces are created by the particles at these positions with masses `mass` instead; sinks
+    that coincide with a source (e.g. are among the sources) do not feel it if `eps2` is 0.
+    """
+    sink_position = position[sinks]
+    self_interaction = source_position is None
+
+    if source_position is None:
+        source_position = position
+
+    for start in range(0, len(source_position), tile_size):
+        sources = slice(start, start + tile_size)
+        dx = source_position[np.newaxis, sources] - sink_position[:, np.newaxis]
+        r2 = np.einsum("ijk,ijk->ij", dx, dx) + eps2
+
+        with np.errstate(divide="ignore"):
+            inv_r = 1 / np.sqrt(r2)
+
+        if self_interaction and start == sinks.start:
+            # the particle does not interact with itself.
+            np.fill_diagonal(inv_r, 0)
+        elif not self_interaction and eps2 == 0:
+            inv_r[r2 == 0] = 0
+
+        weighted_inv_r = inv_r * mass[sources]
+        weights = weighted_inv_r * inv_r**2
+        # sum of weights[i, j] * (x[j] - x[i]) over j as a matrix product.
+        acc[sinks] += (
+            weights @ source_position[sources] - weights.sum(axis=1)[:, np.newaxis] * sink_position
+        )
+        pot[sinks] -= weighted_inv_r.sum(axis=1)
+
+
+def _jerk_tile(
+    sinks: slice,
+    position: np.ndarray,
+    velocity: np.ndarray,
+    mass: np.ndarray,
+    eps2: float,
+    tile_size: int,
+    acc: np.ndarray,
+    jerk: np.ndarray,
+):
+    """
+    Same as `_tile` but computes accelerations and their time derivatives.
+    """
+    sink_position, sink_velocity = position[sinks], velocity[sinks]
+
+    for start in range(0, len(position), tile_size):
+        sources = slice(start, start + tile_size)
+        dx = position[np.newaxis, sources] - sink_position[:, np.newaxis]
+        dv = velocity[np.newaxis, sources] - sink_velocity[:, np.newaxis]
+        r2 = np.einsum("ijk,ijk->ij", dx, dx) + eps2
+
+        with np.errstate(divide="ignore"):
+            inv_r2 = 1 / r2
+
+        if start == sinks.start:
+            np.fill_diagonal(inv_r2, 0)
+
+        weights = mass[sources] * inv_r2 * np.sqrt(inv_r2)
+        rv = 3 * np.einsum("ijk,ijk->ij", dx, dv) * inv_r2
+
+        acc[sinks] += np.einsum("ij,ijk->ik", weights, dx)
+        jerk[sinks] += np.einsum("ij,ijk->ik", weights, dv) - np.einsum(
+            "ij,ijk->ik", weights * rv, dx
+        )
+
+
+def _run_tiles(n_particles: int, tile_size: int, threads: int | None, func):
+    tiles = [slice(start, start + tile_size) for start in range(0, n_particles, tile_size)]
+    threads = threads or os.cpu_count() or 1
+
+    if threads == 1 or len(tiles) <= 1:
+        for sinks in tiles:
+            func(sinks)
+    else:
+        with ThreadPoolExecutor(min(threads, len(tiles))) as executor:
+            list(executor.map(func, tiles))
+
+
+def gravity(
+    position: np.ndarray,
+    mass: np.ndarray,
+    eps: float,
+    tile_size: int = 512,
+    threads: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns accelerations and potentials of the particles with Plummer softening `eps`.
+
+    Pairs of particles are processed in square tiles of `tile_size` so the temporary arrays
+    fit into the cache; rows of the tiles are distributed over `threads` threads (number of
+    CPUs by default).
+    """
+    position = np.asarray(position, dtype=np.float64)
+    mass = np.asarray(mass, dtype=np.float64)
+    acc = np.zeros_like(position)
+    pot = np.zeros(len(position))
+
+    def run(sinks: slice):
+        _tile(sinks, position, mass, eps**2, tile_size, acc, pot)
+
+    _run_tiles(len(position), tile_size, threads, run)
+
+    return acc, pot
+
+
+def field(
+    position: np.ndarray,
+    source_position: np.ndarray,
+    source_mass: np.ndarray,
+    eps: float,
+    tile_size: int = 512,
+    threads: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns accelerations and potentials at `position` created by the sources with Plummer
+    softening `eps`, e.g. of the test particles. Work is split in the same way as in `gravity`.
+
+    Sinks might be among the sources: force of the source on itself is zero, though potential
+    includes its softened self-energy term if `eps` is positive.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    source_position = np.asarray(source_position, dtype=np.float64)
+    source_mass = np.asarray(source_mass, dtype=np.float64)
+    acc = np.zeros_like(position)
+    pot = np.zeros(len(position))
+
+    def run(sinks: slice):
+        _tile(sinks, position, source_mass, eps**2, tile_size, acc, pot, source_position)
+
+    _run_tiles(len(position), tile_size, threads, run)
+
+    return acc, pot
+
+
+def gravity_and_jerk(
+    position: np.ndarray,
+    velocity: np.ndarray,
+    mass: np.ndarray,
+    eps: float,
+    tile_size: int = 512,
+    threads: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns accelerations of the particles and their time derivatives (jerks) with Plummer
+    softening `eps`. Work is split in the same way as in `gravity`.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    velocity = np.asarray(velocity, dtype=np.float64)
+    mass = np.asarray(mass, dtype=np.float64)
+    acc = np.zeros_like(position)
+    jerk = np.zeros_like(position)
+
+    def run(sinks: slice):
+        _jerk_tile(sinks, position, velocity, mass, eps**2, tile_size, acc, jerk)
+
+    _run_tiles(len(position), tile_size, threads, run)
+
+    return acc, jerk
+
+
+# arrays of the worker process of `SharedMemoryGravity`; set by `_attach`.
+_shared_arrays: dict[str, np.ndarray] = {}
+_shared_memory: list[SharedMemory] = []
+
+
+def _attach(specs: dict[str, tuple[str, tuple[int, ...]]]):
+    for key, (name, shape) in specs.items():
+        memory = SharedMemory(name)
+        _shared_memory.append(memory)
+        _shared_arrays[key] = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+
+def _evaluate(sinks: slice, eps2: float, tile_size: int):
+    acc, pot = _shared_arrays["acc"], _shared_arrays["pot"]
+    acc[sinks] = 0
+    pot[sinks] = 0
+    _tile(sinks, _shared_arrays["position"], _shared_arrays["mass"], eps2, tile_size, acc, pot)
+
+
+def _release(executor: ProcessPoolExecutor, memory: list[SharedMemory]):
+    executor.shutdown()
+
+    for block in memory:
+        block.close()
+        block.unlink()
+
+
+class SharedMemoryGravity:
+    """
+    Direct summation of the forces by the pool of processes. Positions, masses and results are
+    kept in the shared memory, so the workers read the particles and write accelerations and
+    potentials of their tiles in place; only tile boundaries are sent between the processes.
+    Only direct summation is split this way, pyfalcon tree code runs in a single process.
+
+    Number of particles is fixed at creation. Call `close` to stop the processes and free the
+    shared memory (it is also done when the object is garbage collected).
+    """
+
+    def __init__(self, n_particles: int, processes: int | None = None, tile_size: int = 512):
+        self.n_particles = n_particles
+        self.processes = processes or os.cpu_count() or 1
+        self.tile_size = tile_size
+
+        shapes = {
+            "position": (n_particles, 3),
+            "mass": (n_particles,),
+            "acc": (n_particles, 3),
+            "pot": (n_particles,),
+        }
+        memory = []
+        specs = {}
+        self.arrays: dict[str, np.ndarray] = {}
+
+        for key, shape in shapes.items():
+            block = SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+            memory.append(block)
+            specs[key] = (block.name, shape)
+            self.arrays[key] = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+        # workers are spawned, not forked, since the parent might run other threads.
+        self.executor = ProcessPoolExecutor(
+            self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach,
+            initargs=(specs,),
+        )
+        self._finalizer = weakref.finalize(self, _release, self.executor, memory)
+
+    def gravity(
+        self, position: np.ndarray, mass: np.ndarray, eps: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Same as `gravity` function of this module.
+        """
+        if len(position) != self.n_particles:
+            raise ValueError(
+                f"Pool is created for {self.n_particles} particles, got {len(position)}."
+            )
+
+        self.arrays["position"][:] = position
+        self.arrays["mass"][:] = mass
+        tiles = [
+            slice(start, start + self.tile_size)
+            for start in range(0, len(position), self.tile_size)
+        ]
+        chunksize = max(1, len(tiles) // (4 * self.processes))
+
+        list(
+            self.executor.map(
+                _evaluate,
+                tiles,
+                [eps**2] * len(tiles),
+                [self.tile_size] * len(tiles),
+                chunksize=chunksize,
+            )
+        )
+
+        return self.arrays["acc"].copy(), self.arrays["pot"].copy()
+
+    def close(self):
+        self._finalizer()
+
+
+def get_potentials(particles: Particles, eps: ScalarQuantity) -> VectorQuantity:
+    """
+    Same as `pyfalcon_analizer.get_potentials`, computed with direct summation.
+    """
+    _, pot = gravity(
+        particles.position.value_in(length_unit),
+        particles.mass.value_in(mass_unit),
+        eps.value_in(length_unit),
+    )
+
+    return pot | length_unit**2 / time_unit**2
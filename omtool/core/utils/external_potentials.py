@@ -0,0 +1,263 @@
+"""
+Analytic external potentials in the internal unit system (G = 1).
+
+Each potential is centered at `position` that moves with constant `velocity` (both zero by
+default) and returns accelerations and potentials of any number of particles at once.
+Parameters are given as quantities and are converted to the internal units once.
+"""
+from abc import ABC, abstractmethod
+from typing import Any
+
+import numpy as np
+from amuse.lab import ScalarQuantity, VectorQuantity, units
+
+length_unit = units.kpc
+mass_unit = 232500 * units.MSun
+velocity_unit = units.kms
+
+
+class ExternalPotential(ABC):
+    """
+    Potential with the center that moves uniformly: its position at the time `t` is
+    `position + velocity * t`.
+    """
+
+    def __init__(
+        self, position: VectorQuantity | None = None, velocity: VectorQuantity | None = None
+    ):
+        self.position = (
+            position.value_in(length_unit) if position is not None else np.zeros(3)
+        ).astype(np.float64)
+        self.velocity = (
+            velocity.value_in(velocity_unit) if velocity is not None else np.zeros(3)
+        ).astype(np.float64)
+
+    def center(self, time: float) -> np.ndarray:
+        return self.position + self.velocity * time
+
+    def gravity(self, position: np.ndarray, time: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (N, 3) array of accelerations and N potentials of the particles at `position`
+        at the `time`.
+        """
+        return self.field(position - self.center(time))
+
+    @abstractmethod
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns accelerations and potentials at `position` relative to the center.
+        """
+        raise NotImplementedError
+
+
+def _radii(position: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(position, axis=1)
+
+
+def _radial_acceleration(position: np.ndarray, radii: np.ndarray, acc: np.ndarray) -> np.ndarray:
+    """
+    Returns accelerations towards the center with given magnitudes; zero at the center itself.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(radii > 0, acc / radii, 0)
+
+    return -position * scale[:, np.newaxis]
+
+
+class PlummerPotential(ExternalPotential):
+    """
+    Plummer sphere: `phi = -M / sqrt(r^2 + a^2)`.
+
+    Args:
+    * `mass` (`ScalarQuantity`): total mass `M`.
+    * `radius` (`ScalarQuantity`): scale radius `a`.
+    * `position`, `velocity` (`VectorQuantity`): motion of the center.
+    """
+
+    def __init__(
+        self,
+        mass: ScalarQuantity,
+        radius: ScalarQuantity,
+        position: VectorQuantity | None = None,
+        velocity: VectorQuantity | None = None,
+    ):
+        super().__init__(position, velocity)
+        self.mass = mass.value_in(mass_unit)
+        self.radius = radius.value_in(length_unit)
+
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        r2 = (position**2).sum(axis=1) + self.radius**2
+        pot = -self.mass / np.sqrt(r2)
+
+        return position * (pot / r2)[:, np.newaxis], pot
+
+
+class HernquistPotential(ExternalPotential):
+    """
+    Hernquist sphere: `phi = -M / (r + a)`.
+
+    Args:
+    * `mass` (`ScalarQuantity`): total mass `M`.
+    * `radius` (`ScalarQuantity`): scale radius `a`.
+    * `position`, `velocity` (`VectorQuantity`): motion of the center.
+    """
+
+    def __init__(
+        self,
+        mass: ScalarQuantity,
+        radius: ScalarQuantity,
+        position: VectorQuantity | None = None,
+        velocity: VectorQuantity | None = None,
+    ):
+        super().__init__(position, velocity)
+        self.mass = mass.value_in(mass_unit)
+        self.radius = radius.value_in(length_unit)
+
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        radii = _radii(position)
+        acc = self.mass / (radii + self.radius) ** 2
+
+        return _radial_acceleration(position, radii, acc), -self.mass / (radii + self.radius)
+
+
+class NFWPotential(ExternalPotential):
+    """
+    Navarro-Frenk-White halo: `phi = -M * ln(1 + r / a) / r`, mass within the radius `r` is
+    `M * (ln(1 + r / a) - r / (r + a))`.
+
+    Args:
+    * `mass` (`ScalarQuantity`): characteristic mass `M = 4 pi rho_0 a^3`.
+    * `radius` (`ScalarQuantity`): scale radius `a`.
+    * `position`, `velocity` (`VectorQuantity`): motion of the center.
+    """
+
+    def __init__(
+        self,
+        mass: ScalarQuantity,
+        radius: ScalarQuantity,
+        position: VectorQuantity | None = None,
+        velocity: VectorQuantity | None = None,
+    ):
+        super().__init__(position, velocity)
+        self.mass = mass.value_in(mass_unit)
+        self.radius = radius.value_in(length_unit)
+
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        radii = _radii(position)
+        x = radii / self.radius
+        log = np.log1p(x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pot = np.where(radii > 0, -self.mass * log / radii, -self.mass / self.radius)
+            acc = np.where(radii > 0, self.mass * (log - x / (1 + x)) / radii**2, 0)
+
+        return _radial_acceleration(position, radii, acc), pot
+
+
+class MiyamotoNagaiPotential(ExternalPotential):
+    """
+    Miyamoto-Nagai disk in the XY plane: `phi = -M / sqrt(R^2 + (a + sqrt(z^2 + b^2))^2)`.
+
+    Args:
+    * `mass` (`ScalarQuantity`): total mass `M`.
+    * `radius` (`ScalarQuantity`): radial scale length `a`.
+    * `height` (`ScalarQuantity`): vertical scale length `b`.
+    * `position`, `velocity` (`VectorQuantity`): motion of the center.
+    """
+
+    def __init__(
+        self,
+        mass: ScalarQuantity,
+        radius: ScalarQuantity,
+        height: ScalarQuantity,
+        position: VectorQuantity | None = None,
+        velocity: VectorQuantity | None = None,
+    ):
+        super().__init__(position, velocity)
+        self.mass = mass.value_in(mass_unit)
+        self.radius = radius.value_in(length_unit)
+        self.height = height.value_in(length_unit)
+
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        zeta = np.sqrt(position[:, 2] ** 2 + self.height**2)
+        d2 = position[:, 0] ** 2 + position[:, 1] ** 2 + (self.radius + zeta) ** 2
+        pot = -self.mass / np.sqrt(d2)
+
+        acc = position * (pot / d2)[:, np.newaxis]
+        acc[:, 2] *= (self.radius + zeta) / zeta
+
+        return acc, pot
+
+
+class LogarithmicPotential(ExternalPotential):
+    """
+    Logarithmic halo with flat rotation curve: `phi = v^2 / 2 * ln(r_c^2 + R^2 + z^2 / q^2)`.
+
+    Args:
+    * `velocity_scale` (`ScalarQuantity`): asymptotic circular velocity `v`.
+    * `radius` (`ScalarQuantity`): core radius `r_c`.
+    * `flattening` (`float`): axis ratio `q` of the equipotentials.
+    * `position`, `velocity` (`VectorQuantity`): motion of the center.
+    """
+
+    def __init__(
+        self,
+        velocity_scale: ScalarQuantity,
+        radius: ScalarQuantity,
+        flattening: float = 1,
+        position: VectorQuantity | None = None,
+        velocity: VectorQuantity | None = None,
+    ):
+        super().__init__(position, velocity)
+        self.velocity_scale = velocity_scale.value_in(velocity_unit)
+        self.radius = radius.value_in(length_unit)
+        self.flattening = flattening
+
+    def field(self, position: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        scaled = position / np.array([1, 1, self.flattening**2])
+        m2 = self.radius**2 + (position * scaled).sum(axis=1)
+        v2 = self.velocity_scale**2
+
+        return -scaled * (v2 / m2)[:, np.newaxis], v2 / 2 * np.log(m2)
+
+
+POTENTIALS: dict[str, type[ExternalPotential]] = {
+    "plummer": PlummerPotential,
+    "hernquist": HernquistPotential,
+    "nfw": NFWPotential,
+    "miyamoto_nagai": MiyamotoNagaiPotential,
+    "logarithmic": LogarithmicPotential,
+}
+
+
+def create_potential(config: dict[str, Any]) -> ExternalPotential:
+    """
+    Creates potential from the config: its `type` is one of the keys of `POTENTIALS`, other
+    items are the arguments of the potential.
+    """
+    args = dict(config)
+    potential_type = args.pop("type", None)
+
+    if potential_type not in POTENTIALS:
+        raise ValueError(
+            f"Unknown external potential {potential_type}, expected one of {tuple(POTENTIALS)}."
+        )
+
+    return POTENTIALS[potential_type](**args)
+
+
+def gravity(
+    potentials: list[ExternalPotential], position: np.ndarray, time: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns total accelerations and potentials of the particles from all of the `potentials`.
+    """
+    acc = np.zeros_like(position, dtype=np.float64)
+    pot = np.zeros(len(position))
+
+    for potential in potentials:
+        potential_acc, potential_pot = potential.gravity(position, time)
+        acc += potential_acc
+        pot += potential_pot
+
+    return acc, pot
@@ -0,0 +1,66 @@
+"""
+Schedule of the iterations of the integration that are analysed, saved or checkpointed.
+"""
+import sys
+
+
+class OutputSchedule:
+    """
+    Iteration is an output one if any of the tasks runs on it, snapshot is written or pictures
+    are taken. Task with interval `None` runs every `analysis_interval` iterations, as do the
+    pictures if `pictures` is True. Snapshot and checkpoint intervals are `None` if there is no
+    writer or checkpointing.
+    """
+
+    def __init__(
+        self,
+        task_intervals: dict[str, int | None],
+        analysis_interval: int,
+        snapshot_interval: int | None = None,
+        checkpoint_interval: int | None = None,
+        pictures: bool = False,
+    ):
+        self.task_intervals = {
+            id: interval if interval is not None else analysis_interval
+            for id, interval in task_intervals.items()
+        }
+        self.analysis_interval = analysis_interval
+        self.snapshot_interval = snapshot_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.pictures = pictures
+
+        self.intervals = list(self.task_intervals.values())
+
+        if snapshot_interval is not None:
+            self.intervals.append(snapshot_interval)
+
+        if pictures:
+            self.intervals.append(analysis_interval)
+
+        if checkpoint_interval is not None:
+            self.intervals.append(checkpoint_interval)
+
+    def tasks(self, iteration: int) -> list[str]:
+        """
+        Ids of the tasks that run on the iteration.
+        """
+        return [id for id, interval in self.task_intervals.items() if iteration % interval == 0]
+
+    def is_snapshot_iteration(self, iteration: int) -> bool:
+        return self.snapshot_interval is not None and iteration % self.snapshot_interval == 0
+
+    def is_pictures_iteration(self, iteration: int) -> bool:
+        return self.pictures and iteration % self.analysis_interval == 0
+
+    def is_checkpoint_iteration(self, iteration: int) -> bool:
+        return self.checkpoint_interval is not None and iteration % self.checkpoint_interval == 0
+
+    def is_output_iteration(self, iteration: int) -> bool:
+        return any(iteration % interval == 0 for interval in self.intervals)
+
+    def steps_to_output(self, iteration: int) -> int:
+        """
+        Number of steps to make from the snapshot of the previous iteration to get snapshot of
+        the first output iteration that is not less than `iteration`.
+        """
+        return min((-iteration % interval + 1 for interval in self.intervals), default=sys.maxsize)
@@ -1,7 +1,7 @@
 import numpy as np
 from amuse.lab import Particles, ScalarQuantity, VectorQuantity, units
 
-from omtool.core.utils import pyfalcon_analizer
+from omtool.core.utils import potential_solvers
 
 
 def center_of_mass(particles: Particles) -> VectorQuantity:
@@ -21,9 +21,17 @@ def at_origin_velocity(particles: Particles) -> VectorQuantity:
 
 
 def potential_center(
-    particles: Particles, eps: ScalarQuantity = 0.2 | units.kpc, top_fraction: float = 0.01
+    particles: Particles,
+    eps: ScalarQuantity = 0.2 | units.kpc,
+    top_fraction: float = 0.01,
+    solver: str = "pyfalcon",
+    **solver_kwargs,
 ) -> VectorQuantity:
-    potentials = pyfalcon_analizer.get_potentials(particles, eps)
+    """
+    Center of mass of the `top_fraction` of the particles with the lowest potential computed
+    by the `solver` (see `potential_solvers.get_potentials`).
+    """
+    potentials = potential_solvers.get_potentials(particles, eps, solver, **solver_kwargs)
     perm = potentials.argsort()
     positions = particles.position[perm]
     positions = positions[: int(len(positions) * top_fraction)]
@@ -34,9 +42,16 @@ def potential_center(
 
 
 def potential_center_velocity(
-    particles: Particles, eps: ScalarQuantity = 0.2 | units.kpc, top_fraction: float = 0.01
+    particles: Particles,
+    eps: ScalarQuantity = 0.2 | units.kpc,
+    top_fraction: float = 0.01,
+    solver: str = "pyfalcon",
+    **solver_kwargs,
 ) -> VectorQuantity:
-    potentials = pyfalcon_analizer.get_potentials(particles, eps)
+    """
+    Same as `potential_center` for the velocity.
+    """
+    potentials = potential_solvers.get_potentials(particles, eps, solver, **solver_kwargs)
     perm = potentials.argsort()
     velocities = particles.velocity[perm]
     velocities = velocities[: int(len(velocities) * top_fraction)]
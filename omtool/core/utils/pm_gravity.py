@@ -0,0 +1,170 @@
+"""
+Particle-mesh solver of the gravitational forces in the internal unit system (G = 1).
+
+Mass is assigned to the cubic grid with cloud-in-cell (`cic`) or triangular-shaped-cloud
+(`tsc`) scheme, potential is obtained by the FFT convolution with the softened Green's
+function on the grid of twice the size (so the boundary conditions are isolated, not
+periodic), accelerations are the finite differences of the potential. Both are interpolated
+back to the particles with the same scheme that was used for the assignment.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from amuse.lab import Particles, ScalarQuantity, VectorQuantity, units
+
+length_unit = units.kpc
+mass_unit = 232500 * units.MSun
+time_unit = units.Gyr
+
+SCHEMES = ("cic", "tsc")
+# number of cells between the particles and the edge of the box.
+_MARGIN = 2
+
+
+class Box(NamedTuple):
+    origin: np.ndarray
+    size: float
+
+
+def bounding_box(position: np.ndarray, grid_size: int) -> Box:
+    """
+    Returns cubic box that contains all of the particles and leaves a margin of a few cells
+    near its edges.
+    """
+    low, high = position.min(axis=0), position.max(axis=0)
+    extent = float((high - low).max()) or 1.0
+    size = extent * grid_size / (grid_size - 2 * _MARGIN)
+
+    return Box((low + high) / 2 - size / 2, size)
+
+
+def contains(box: Box, position: np.ndarray, grid_size: int) -> bool:
+    """
+    Returns whether all of the particles are inside of the box and far enough from its edges.
+    """
+    margin = box.size * _MARGIN / grid_size / 2
+    coords = position - box.origin
+
+    return bool((coords.min() >= margin) and (coords.max() <= box.size - margin))
+
+
+def _weights(coords: np.ndarray, grid_size: int, scheme: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns indices of the cells and weights of the particles along one axis, both (N, k)
+    arrays where k is the number of cells covered by one particle. `coords` are in the units
+    of the cell size.
+    """
+    coords = coords - 0.5
+    indices: np.ndarray
+
+    if scheme == "cic":
+        left = np.floor(coords)
+        d = (coords - left)[:, np.newaxis]
+        indices = left[:, np.newaxis] + np.arange(2)
+        weights = np.hstack([1 - d, d])
+    elif scheme == "tsc":
+        center = np.round(coords)
+        d = (coords - center)[:, np.newaxis]
+        indices = center[:, np.newaxis] + np.arange(-1, 2)
+        weights = np.hstack([0.5 * (0.5 - d) ** 2, 0.75 - d**2, 0.5 * (0.5 + d) ** 2])
+    else:
+        raise ValueError(f"Unknown mass assignment scheme {scheme}, expected one of {SCHEMES}.")
+
+    return np.clip(indices, 0, grid_size - 1).astype(np.int64), weights
+
+
+def _stencil(position: np.ndarray, box: Box, grid_size: int, scheme: str):
+    """
+    Yields flat indices of the cells and weights of the particles in them, one cell of
+    the assignment stencil at a time.
+    """
+    cell = box.size / grid_size
+    axes = [
+        _weights((position[:, axis] - box.origin[axis]) / cell, grid_size, scheme)
+        for axis in range(3)
+    ]
+    (ix, wx), (iy, wy), (iz, wz) = axes
+    k = ix.shape[1]
+
+    for a in range(k):
+        for b in range(k):
+            for c in range(k):
+                index = (ix[:, a] * grid_size + iy[:, b]) * grid_size + iz[:, c]
+
+                yield index, wx[:, a] * wy[:, b] * wz[:, c]
+
+
+# spectrum on the doubled grid takes several GB for the large grids, so only one is kept.
+@lru_cache(maxsize=1)
+def _green_spectrum(grid_size: int, cell: float, eps: float) -> np.ndarray:
+    """
+    Returns Fourier transform of the softened Green's function on the doubled grid.
+    """
+    n = 2 * grid_size
+    distance = np.minimum(np.arange(n), n - np.arange(n)) * cell
+    r2 = (
+        distance[:, np.newaxis, np.newaxis] ** 2
+        + distance[np.newaxis, :, np.newaxis] ** 2
+        + distance[np.newaxis, np.newaxis, :] ** 2
+    )
+
+    return np.fft.rfftn(-1 / np.sqrt(r2 + eps**2))
+
+
+def gravity(
+    position: np.ndarray,
+    mass: np.ndarray,
+    eps: float = 0,
+    grid_size: int = 64,
+    scheme: str = "cic",
+    box: Box | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns accelerations and potentials of the particles. Softening is not less than half
+    of the cell size. If the `box` is not given, bounding box of the particles is used;
+    particles outside of the box are treated as if they were in its boundary cells.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    mass = np.asarray(mass, dtype=np.float64)
+    box = box or bounding_box(position, grid_size)
+    cell = box.size / grid_size
+
+    # stencil is generated once for the assignment and once for the interpolation so only one
+    # of its cells is kept in memory at a time.
+    density = np.zeros(grid_size**3)
+    for index, weight in _stencil(position, box, grid_size, scheme):
+        density += np.bincount(index, weight * mass, minlength=grid_size**3)
+
+    padded = np.zeros((2 * grid_size,) * 3)
+    padded[:grid_size, :grid_size, :grid_size] = density.reshape((grid_size,) * 3)
+    spectrum = np.fft.rfftn(padded) * _green_spectrum(grid_size, cell, max(eps, cell / 2))
+    potential = np.fft.irfftn(spectrum, padded.shape, axes=(0, 1, 2))
+    potential = potential[:grid_size, :grid_size, :grid_size]
+
+    fields = [potential.ravel()]
+    fields.extend(-gradient.ravel() for gradient in np.gradient(potential, cell))
+
+    result = np.zeros((len(position), 4))
+    for index, weight in _stencil(position, box, grid_size, scheme):
+        for i, field in enumerate(fields):
+            result[:, i] += weight * field[index]
+
+    return result[:, 1:], result[:, 0]
+
+
+def get_potentials(
+    particles: Particles, eps: ScalarQuantity, grid_size: int = 64, scheme: str = "cic"
+) -> VectorQuantity:
+    """
+    Same as `pyfalcon_analizer.get_potentials`, computed with the particle-mesh solver.
+    """
+    _, pot = gravity(
+        particles.position.value_in(length_unit),
+        particles.mass.value_in(mass_unit),
+        eps.value_in(length_unit),
+        grid_size,
+        scheme,
+    )
+
+    return pot | length_unit**2 / time_unit**2
@@ -0,0 +1,31 @@
+"""
+Potentials of the particles computed by one of the gravity solvers.
+"""
+from amuse.lab import Particles, ScalarQuantity, VectorQuantity
+
+from omtool.core.utils import direct_gravity, pm_gravity
+
+SOLVERS = ("pyfalcon", "direct", "pm")
+
+
+def get_potentials(
+    particles: Particles, eps: ScalarQuantity, solver: str = "pyfalcon", **kwargs
+) -> VectorQuantity:
+    """
+    Returns potentials of the particles with softening `eps` computed by the `solver`:
+    `pyfalcon` tree code, `direct` summation or `pm` particle-mesh solver. Other keyword
+    arguments are passed to the solver, e.g. `grid_size` and `scheme` of `pm`.
+    """
+    if solver == "pyfalcon":
+        # optional dependency, needed only by this solver.
+        from omtool.core.utils import pyfalcon_analizer
+
+        return pyfalcon_analizer.get_potentials(particles, eps, **kwargs)
+
+    if solver == "direct":
+        return direct_gravity.get_potentials(particles, eps, **kwargs)
+
+    if solver == "pm":
+        return pm_gravity.get_potentials(particles, eps, **kwargs)
+
+    raise ValueError(f"Unknown solver {solver}, expected one of {SOLVERS}.")
@@ -0,0 +1,283 @@
+"""
+Self-consistent field solver (Hernquist & Ostriker 1992) of the gravitational forces in the
+internal unit system (G = 1).
+
+Potential of the particles is expanded over the biorthogonal basis whose lowest term is the
+Hernquist sphere with scale radius `radius`: `nmax + 1` radial functions (Gegenbauer
+polynomials of `(r - a) / (r + a)`) times real spherical harmonics up to the degree `lmax`.
+Both expansion and evaluation cost O(N * n_terms); particles are processed in chunks by a pool
+of threads. Expansion is smooth, so forces are not softened.
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+
+import numpy as np
+from amuse.lab import Particles, ScalarQuantity, VectorQuantity, units
+
+length_unit = units.kpc
+mass_unit = 232500 * units.MSun
+time_unit = units.Gyr
+
+# sin(theta) of the particles on the axis is clamped to this value; terms that are divided by
+# it vanish there anyway.
+_MIN_SIN = 1e-12
+
+
+class Expansion(NamedTuple):
+    """
+    Coefficients of the expansion: `cos[n, l, m]` and `sin[n, l, m]` are the amplitudes of
+    `cos(m * phi)` and `sin(m * phi)` terms, zero for `m > l`.
+    """
+
+    cos: np.ndarray
+    sin: np.ndarray
+    center: np.ndarray
+    radius: float
+
+
+def _gegenbauer(x: np.ndarray, nmax: int, alpha: np.ndarray) -> np.ndarray:
+    """
+    Returns (nmax + 1, len(alpha), N) array of Gegenbauer polynomials `C_n^alpha(x)`.
+    """
+    result = np.empty((nmax + 1, len(alpha), len(x)))
+    result[0] = 1
+
+    if nmax > 0:
+        result[1] = 2 * alpha[:, np.newaxis] * x
+
+    for n in range(2, nmax + 1):
+        result[n] = (
+            2 * (n + alpha - 1)[:, np.newaxis] * x * result[n - 1]
+            - (n + 2 * alpha - 2)[:, np.newaxis] * result[n - 2]
+        ) / n
+
+    return result
+
+
+def _radial(s: np.ndarray, nmax: int, lmax: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (nmax + 1, lmax + 1, N) arrays of the radial basis functions at the radii `s` (in
+    units of the scale radius) and of their derivatives.
+    """
+    l = np.arange(lmax + 1)[:, np.newaxis]
+    alpha = 2 * np.arange(lmax + 1) + 1.5
+    xi = (s - 1) / (s + 1)
+
+    poly = _gegenbauer(xi, nmax, alpha)
+    poly_derivative = np.zeros_like(poly)
+
+    if nmax > 0:
+        poly_derivative[1:] = 2 * alpha[:, np.newaxis] * _gegenbauer(xi, nmax - 1, alpha + 1)
+
+    scale = s**l / (1 + s) ** (2 * l + 1)
+    scale_derivative = l * s ** np.maximum(l - 1, 0) / (1 + s) ** (2 * l + 1) - (
+        2 * l + 1
+    ) * scale / (1 + s)
+
+    phi = -scale * poly
+    phi_derivative = -(scale_derivative * poly + scale * poly_derivative * 2 / (1 + s) ** 2)
+
+    return phi, phi_derivative
+
+
+def _legendre(x: np.ndarray, lmax: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (lmax + 1, lmax + 1, N) arrays of associated Legendre functions `P_l^m(cos theta)`
+    (without Condon-Shortley phase) and of their derivatives by theta.
+    """
+    sin = np.maximum(np.sqrt(1 - x**2), _MIN_SIN)
+    p = np.zeros((lmax + 1, lmax + 1, len(x)))
+    p[0, 0] = 1
+
+    for m in range(lmax + 1):
+        if m > 0:
+            p[m, m] = (2 * m - 1) * sin * p[m - 1, m - 1]
+
+        if m < lmax:
+            p[m + 1, m] = (2 * m + 1) * x * p[m, m]
+
+        for l in range(m + 2, lmax + 1):
+            p[l, m] = ((2 * l - 1) * x * p[l - 1, m] - (l + m - 1) * p[l - 2, m]) / (l - m)
+
+    degree = np.arange(lmax + 1)[:, np.newaxis, np.newaxis]
+    order = np.arange(lmax + 1)[np.newaxis, :, np.newaxis]
+    p_previous = np.zeros_like(p)
+    p_previous[1:] = p[:-1]
+
+    return p, (degree * x * p - (degree + order) * p_previous) / sin
+
+
+def _normalization(nmax: int, lmax: int) -> np.ndarray:
+    """
+    Returns (nmax + 1, lmax + 1, lmax + 1) array of factors of the sums over particles in the
+    coefficients: addition theorem factors of the harmonics divided by the normalization
+    integrals of the basis.
+    """
+    result = np.zeros((nmax + 1, lmax + 1, lmax + 1))
+
+    for n in range(nmax + 1):
+        for l in range(lmax + 1):
+            k = n * (n + 4 * l + 3) / 2 + (l + 1) * (2 * l + 1)
+            integral = (
+                -k
+                / 2 ** (8 * l + 6)
+                * math.exp(
+                    math.lgamma(n + 4 * l + 3) - math.lgamma(n + 1) - 2 * math.lgamma(2 * l + 1.5)
+                )
+                / (n + 2 * l + 1.5)
+            )
+
+            for m in range(l + 1):
+                harmonics = (
+                    (2 * l + 1)
+                    / (4 * np.pi)
+                    * (2 - (m == 0))
+                    * math.factorial(l - m)
+                    / math.factorial(l + m)
+                )
+                result[n, l, m] = harmonics / integral
+
+    return result
+
+
+def _spherical(position: np.ndarray, center: np.ndarray, radius: float):
+    """
+    Returns radii (in units of `radius`), cosines of the polar angles and azimuths of the
+    particles relative to the `center`.
+    """
+    relative = position - center
+    r = np.linalg.norm(relative, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_theta = np.where(r > 0, relative[:, 2] / r, 1)
+
+    return r / radius, np.clip(cos_theta, -1, 1), np.arctan2(relative[:, 1], relative[:, 0])
+
+
+def _run_chunks(n_particles: int, chunk_size: int, threads: int | None, func: Callable):
+    chunks = [slice(start, start + chunk_size) for start in range(0, n_particles, chunk_size)]
+    threads = threads or os.cpu_count() or 1
+
+    if threads == 1 or len(chunks) <= 1:
+        return [func(chunk) for chunk in chunks]
+
+    with ThreadPoolExecutor(min(threads, len(chunks))) as executor:
+        return list(executor.map(func, chunks))
+
+
+def expand(
+    position: np.ndarray,
+    mass: np.ndarray,
+    radius: float,
+    nmax: int = 10,
+    lmax: int = 4,
+    center: np.ndarray | None = None,
+    chunk_size: int = 4096,
+    threads: int | None = None,
+) -> Expansion:
+    """
+    Returns expansion of the potential of the particles. By default it is centered at their
+    center of mass.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    mass = np.asarray(mass, dtype=np.float64)
+
+    if center is None:
+        center = (position * mass[:, np.newaxis]).sum(axis=0) / max(
+            mass.sum(), np.finfo(float).tiny
+        )
+
+    m = np.arange(lmax + 1)[:, np.newaxis]
+
+    def run(chunk: slice) -> tuple[np.ndarray, np.ndarray]:
+        s, cos_theta, phi = _spherical(position[chunk], center, radius)
+        radial, _ = _radial(s, nmax, lmax)
+        angular, _ = _legendre(cos_theta, lmax)
+        weighted = angular * mass[chunk]
+
+        return (
+            np.einsum("nlk,lmk,mk->nlm", radial, weighted, np.cos(m * phi)),
+            np.einsum("nlk,lmk,mk->nlm", radial, weighted, np.sin(m * phi)),
+        )
+
+    norm = _normalization(nmax, lmax)
+    cos = np.zeros_like(norm)
+    sin = np.zeros_like(norm)
+
+    for chunk_cos, chunk_sin in _run_chunks(len(position), chunk_size, threads, run):
+        cos += chunk_cos
+        sin += chunk_sin
+
+    return Expansion(cos * norm, sin * norm, np.asarray(center, dtype=np.float64), radius)
+
+
+def gravity(
+    position: np.ndarray,
+    expansion: Expansion,
+    chunk_size: int = 4096,
+    threads: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns accelerations and potentials of the expansion at `position`.
+    """
+    position = np.asarray(position, dtype=np.float64)
+    nmax, lmax = expansion.cos.shape[0] - 1, expansion.cos.shape[1] - 1
+    radius = expansion.radius
+    m = np.arange(lmax + 1)[:, np.newaxis]
+    acc = np.zeros_like(position)
+    pot = np.zeros(len(position))
+
+    def run(chunk: slice):
+        s, cos_theta, phi = _spherical(position[chunk], expansion.center, radius)
+        radial, radial_derivative = _radial(s, nmax, lmax)
+        angular, angular_derivative = _legendre(cos_theta, lmax)
+        cos_m, sin_m = np.cos(m * phi), np.sin(m * phi)
+
+        # sums over n: (l, m, N) amplitudes of the cos and sin terms and their derivatives.
+        cos_amp = np.einsum("nlk,nlm->lmk", radial, expansion.cos)
+        sin_amp = np.einsum("nlk,nlm->lmk", radial, expansion.sin)
+        azimuthal = cos_amp * cos_m + sin_amp * sin_m
+
+        pot[chunk] = (angular * azimuthal).sum(axis=(0, 1)) / radius
+
+        d_s = (
+            angular
+            * (
+                np.einsum("nlk,nlm->lmk", radial_derivative, expansion.cos) * cos_m
+                + np.einsum("nlk,nlm->lmk", radial_derivative, expansion.sin) * sin_m
+            )
+        ).sum(axis=(0, 1))
+        d_theta = (angular_derivative * azimuthal).sum(axis=(0, 1))
+        d_phi = (angular * m * (sin_amp * cos_m - cos_amp * sin_m)).sum(axis=(0, 1))
+
+        r = np.maximum(s * radius, np.finfo(float).tiny)
+        sin_theta = np.maximum(np.sqrt(1 - cos_theta**2), _MIN_SIN)
+        acc_r = -d_s / radius**2
+        acc_theta = -d_theta / (radius * r)
+        acc_phi = -d_phi / (radius * r * sin_theta)
+
+        cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+        acc[chunk, 0] = (acc_r * sin_theta + acc_theta * cos_theta) * cos_phi - acc_phi * sin_phi
+        acc[chunk, 1] = (acc_r * sin_theta + acc_theta * cos_theta) * sin_phi + acc_phi * cos_phi
+        acc[chunk, 2] = acc_r * cos_theta - acc_theta * sin_theta
+
+    _run_chunks(len(position), chunk_size, threads, run)
+
+    return acc, pot
+
+
+def get_potentials(
+    particles: Particles, radius: ScalarQuantity, nmax: int = 10, lmax: int = 4
+) -> VectorQuantity:
+    """
+    Same as `pyfalcon_analizer.get_potentials`, computed with the expansion of the particles.
+    """
+    position = particles.position.value_in(length_unit)
+    expansion = expand(
+        position, particles.mass.value_in(mass_unit), radius.value_in(length_unit), nmax, lmax
+    )
+    _, pot = gravity(position, expansion)
+
+    return pot | length_unit**2 / time_unit**2
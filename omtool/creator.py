@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 
 from omtool.core.configs import CreationConfig
+from omtool.core.datamodel import open_writer
 from omtool.core.models import SnapshotBuilder, initialize_models
 from omtool.core.utils import initialize_logger
 
@@ -25,4 +26,7 @@ def create(config: CreationConfig):
     for snapshot in models:
         builder.add_snapshot(snapshot)
 
-    builder.to_fits(config.output_file)
+    with open_writer(
+        config.output_file, config.output_format, compression=config.compression
+    ) as writer:
+        writer.write(builder.get_result())
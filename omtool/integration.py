@@ -1,25 +1,35 @@
-import os
-from pathlib import Path
 from typing import Callable
 
-from amuse.lab import units
+from amuse.lab import ScalarQuantity, units
 from zlog import logger
 
 from omtool import visualizer
 from omtool.actions_after import initialize_actions_after
 from omtool.actions_before import initialize_actions_before
 from omtool.core.configs import IntegrationConfig
-from omtool.core.datamodel import Snapshot, profiler
+from omtool.core.datamodel import (
+    Checkpoint,
+    Snapshot,
+    load_checkpoint,
+    open_writer,
+    profiler,
+    save_checkpoint,
+)
 from omtool.core.integrators import initialize_integrator
 from omtool.core.tasks import DataType, initialize_tasks
-from omtool.core.utils import initialize_logger
+from omtool.core.utils import BackgroundWorker, OutputSchedule, initialize_logger
 from omtool.misc import initialize_input_snapshot
 
 
-def integrate(config: IntegrationConfig, close_funcs: list[Callable[[], None]]):
+def integrate(
+    config: IntegrationConfig, close_funcs: list[Callable[[], None]], resume: bool = False
+):
     """
     Integration mode for the OMTool. Used to integrate existing model
     from the file and write it to another file.
+
+    If `resume` is True, integration is continued from the checkpoint and the output file is
+    appended to.
     """
     initialize_logger(**config.logging)
     visualizer_service = (
@@ -33,46 +43,164 @@ def integrate(config: IntegrationConfig, close_funcs: list[Callable[[], None]]):
     actions_before = initialize_actions_before()
     tasks = initialize_tasks(config.imports.tasks, config.tasks, actions_before, actions_after)
     integrator = initialize_integrator(config.imports.integrators, config.integrator)
+    close_funcs.append(integrator.close)
+
+    checkpointing = config.checkpoint_file != "" and config.checkpoint_interval > 0
+    checkpoint = None
+
+    if resume:
+        if config.checkpoint_file == "":
+            raise ValueError("Unable to resume integration: checkpoint file is not specified.")
+
+        checkpoint = load_checkpoint(config.checkpoint_file)
+
+    writer = (
+        open_writer(
+            config.output_file,
+            config.output_format,
+            append=checkpoint is not None,
+            flush_interval=config.flush_interval,
+            compression=config.compression,
+            keep=checkpoint.output_length if checkpoint is not None else None,
+        )
+        if config.output_file != ""
+        else None
+    )
+
+    if writer is not None:
+        close_funcs.append(writer.close)
 
-    if config.output_file != "" and Path(config.output_file).is_file():
-        os.remove(config.output_file)
+    # saving is done in the background while the next step is integrated; worker should be
+    # closed before the writer and the visualizer.
+    worker = BackgroundWorker(config.output_queue_size, name="saving_stage")
+    close_funcs.insert(0, worker.close)
+
+    schedule = OutputSchedule(
+        {id: task.interval for id, task in tasks.items()},
+        config.analysis_interval,
+        snapshot_interval=config.snapshot_interval if writer is not None else None,
+        checkpoint_interval=config.checkpoint_interval if checkpointing else None,
+        pictures=visualizer_service is not None,
+    )
 
     @profiler("Integration stage")
-    def loop_integration_stage(snapshot: Snapshot) -> Snapshot:
-        return integrator.leapfrog(snapshot)
+    def loop_integration_stage(snapshot: Snapshot, n_steps: int) -> tuple[Snapshot, int]:
+        return integrator.advance(snapshot, n_steps, config.model_time)
 
-    @profiler("Analysis stage")
-    def loop_analysis_stage(snapshot: Snapshot):
-        outputs: dict[str, DataType] = {}
+    # outputs are kept between the iterations so the task might use the latest output of the
+    # task that runs less frequently than itself.
+    outputs: dict[str, DataType] = {}
 
-        for id, task in tasks.items():
-            outputs[id] = task.run(snapshot, outputs)
+    @profiler("Analysis stage")
+    def loop_analysis_stage(iteration: int, snapshot: Snapshot):
+        for id in schedule.tasks(iteration):
+            outputs[id] = tasks[id].run(snapshot, outputs)
+
+    @profiler("Background saving")
+    def save_output(
+        iteration: int, timestamp: ScalarQuantity, snapshot: Snapshot | None, pictures: list | None
+    ):
+        if writer is not None and snapshot is not None:
+            writer.write(snapshot)
+
+        if visualizer_service is not None and pictures is not None:
+            visualizer_service.save(
+                {"i": iteration, "time": timestamp.value_in(units.Myr)}, pictures
+            )
 
     @profiler("Saving to file stage")
     def loop_saving_stage(iteration: int, snapshot: Snapshot):
-        if config.output_file != "" and iteration % config.snapshot_interval == 0:
-            snapshot.to_fits(config.output_file, append=True)
+        output = None
+        snapshot.timestep = integrator.current_timestep
+
+        if writer is not None and schedule.is_snapshot_iteration(iteration):
+            # integrator might change the arrays in place so the worker gets its own copy.
+            output = (
+                Snapshot(
+                    timestamp=snapshot.timestamp,
+                    store=snapshot.store.copy(),
+                    timestep=snapshot.timestep,
+                )
+                if config.output_queue_size > 0
+                else snapshot
+            )
 
-        (
+        pictures = (
+            visualizer_service.take_pictures()
+            if visualizer_service is not None and schedule.is_pictures_iteration(iteration)
+            else None
+        )
+        worker.submit(save_output, iteration, snapshot.timestamp, output, pictures)
+
+        message = (
             logger.info()
             .string("id", "integration_timing")
             .measured_float("timestamp", snapshot.timestamp.value_in(units.Myr), "Myr", decimals=3)
-            .send()
         )
 
-        if visualizer_service is not None:
-            visualizer_service.save(
-                {"i": iteration, "time": snapshot.timestamp.value_in(units.Myr)}
+        if snapshot.timestep is not None:
+            message = message.measured_float(
+                "timestep", snapshot.timestep.value_in(units.Myr), "Myr", decimals=6
             )
 
-    generator = initialize_input_snapshot(config.input_file)
-    snapshot = next(generator)
-    logger.info().msg("Integration started")
-    i = 0
+        message.send()
+
+    @profiler("Checkpoint stage")
+    def loop_checkpoint_stage(iteration: int, snapshot: Snapshot):
+        # output file should contain everything that was saved before the checkpoint.
+        worker.join()
+
+        if writer is not None:
+            writer.flush()
+
+        save_checkpoint(
+            config.checkpoint_file,
+            Checkpoint(
+                iteration=iteration + 1,
+                snapshot=snapshot,
+                output_length=len(writer) if writer is not None else 0,
+                integrator_state=integrator.get_state(),
+                tasks_state={id: task.task.get_state() for id, task in tasks.items()},
+                outputs=dict(outputs),
+            ),
+        )
+        logger.debug().int("iteration", iteration).msg("checkpoint saved")
+
+    if checkpoint is not None:
+        snapshot = integrator.restore(checkpoint.snapshot, checkpoint.integrator_state)
+        i = checkpoint.iteration
+        outputs.update(checkpoint.outputs)
+        checkpoint.restore_random_state()
+
+        for id, state in checkpoint.tasks_state.items():
+            if id in tasks:
+                tasks[id].task.set_state(state)
 
+        (
+            logger.info()
+            .int("iteration", i)
+            .measured_float("timestamp", snapshot.timestamp.value_in(units.Myr), "Myr", decimals=3)
+            .msg("Integration resumed from the checkpoint")
+        )
+    else:
+        generator = initialize_input_snapshot(config.input_file)
+        snapshot = next(generator)
+        logger.info().msg("Integration started")
+        i = 0
+
+    # steps between the iterations that are analysed or saved are made in one block so the
+    # integrator does not have to materialise intermediate snapshots.
     while snapshot.timestamp < config.model_time:
-        snapshot = loop_integration_stage(snapshot)
-        loop_analysis_stage(snapshot)
-        loop_saving_stage(i, snapshot)
+        snapshot, n_steps = loop_integration_stage(snapshot, schedule.steps_to_output(i))
+        i += n_steps - 1
+
+        if schedule.is_output_iteration(i):
+            loop_analysis_stage(i, snapshot)
+            loop_saving_stage(i, snapshot)
+
+        if schedule.is_checkpoint_iteration(i):
+            loop_checkpoint_stage(i, snapshot)
 
         i += 1
+
+    worker.close()
@@ -1,3 +1,4 @@
+import glob
 from typing import Iterator
 
 from omtool.core import datamodel
@@ -5,18 +6,50 @@ from omtool.core.configs import InputConfig
 from omtool.core.datamodel import Snapshot
 
 
-def initialize_input_snapshot(config: InputConfig) -> Iterator[Snapshot]:
+def _expand_globs(filenames: list[str]) -> list[str]:
+    result = []
+
+    for filename in filenames:
+        result.extend(sorted(glob.glob(filename)) or [filename])
+
+    return result
+
+
+def initialize_input_snapshot(
+    config: InputConfig, columns: set[str] | None = None
+) -> Iterator[Snapshot]:
     """
     Loads the snapshot from the file and adds an ability to read next snapshot.
-    Implementation is lazy.
+    Implementation is lazy. If `columns` is specified, FITS and HDF5 readers load only these
+    columns. Several FITS files (filenames might be globs) are read as one series ordered
+    by time.
     """
     if config.format == "fits":
+        filenames = _expand_globs(config.filenames)
+
+        if len(filenames) > 1:
+            return datamodel.from_fits_series(
+                filenames,
+                memmap=config.memmap,
+                start_time=config.start_time,
+                columns=columns,
+            )
+
+        return datamodel.from_fits(
+            filenames[0],
+            memmap=config.memmap,
+            start_time=config.start_time,
+            columns=columns,
+        )
+    elif config.format == "hdf5":
         if len(config.filenames) > 1:
             raise NotImplementedError(
-                "Reading of multiple FITS files at once is not implemented yet."
+                "Reading of multiple HDF5 files at once is not implemented yet."
             )
 
-        return datamodel.from_fits(config.filenames[0])
+        return datamodel.from_hdf5(
+            config.filenames[0], start_time=config.start_time, columns=columns
+        )
     elif config.format == "csv":
         return datamodel.from_logged_csvs(config.filenames)
     else:
@@ -53,9 +53,19 @@ class VisualizerService:
         draw_parameters = DrawParameters(**parameters)
         self.visualizer.plot(data, draw_parameters)
 
-    def save(self, iteration_dict: dict):
+    def take_pictures(self) -> list:
         """
-        Save current plot to file from config.
+        Returns data plotted since the last save and starts the new picture. Result can be passed
+        to `save` later, e.g. from another thread.
+        """
+        pictures, self.visualizer.pictures = self.visualizer.pictures, []
+
+        return pictures
+
+    def save(self, iteration_dict: dict, pictures: Optional[list] = None):
+        """
+        Save current plot to file from config. If `pictures` are given, they are drawn
+        instead of the data plotted since the last save.
         """
         self.visualizer.set_title(self.title_template.format(**iteration_dict))
 
@@ -71,7 +81,7 @@ class VisualizerService:
             save_args["pdf_object"] = self.pdf_object
             save_args["pdf_tmp_path"] = self.pdf_tmp_path.format(int(time.time()))
 
-        self.visualizer.save(**save_args)
+        self.visualizer.save(**save_args, pictures=pictures)
 
     def close(self):
         if hasattr(self, "pdf_object"):
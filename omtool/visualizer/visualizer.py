@@ -165,12 +165,20 @@ class Visualizer:
         dpi: int = 120,
         pdf_object: Optional[PdfMerger] = None,
         pdf_tmp_path: Optional[str] = None,
+        pictures: Optional[List[tuple[dict[str, np.ndarray], DrawParameters]]] = None,
     ):
+        """
+        Draws the pictures (ones that were plotted since the last save by default) and saves the
+        figure.
+        """
+        if pictures is None:
+            pictures, self.pictures = self.pictures, []
+
         images: Dict[str, Dict[str, np.ndarray]] = {}
         imparams = {}
         patches_map: dict[str, list[mpatches.Patch]] = {}
 
-        for (data, params) in self.pictures:
+        for (data, params) in pictures:
             if not params.is_density_plot:
                 self._scatter_points(data, params)
             else:
@@ -225,5 +233,4 @@ class Visualizer:
             while len(axes.images) != 0:
                 axes.images[0].remove()
 
-        self.pictures.clear()
         self._do_for_all_axes(clear)
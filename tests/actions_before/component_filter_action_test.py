@@ -0,0 +1,33 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.actions_before import component_filter_action
+from omtool.core.datamodel import Snapshot
+from omtool.core.utils import BaseTestCase
+
+
+class TestComponentFilterAction(BaseTestCase):
+    def _generate_components(self) -> Snapshot:
+        particles = Particles(5)
+        particles.x = np.arange(5) | units.kpc
+        particles.component = np.array(["host", "host", "satellite", "host", "stream"])
+
+        return Snapshot(particles)
+
+    def test_single_component(self):
+        actual = component_filter_action(self._generate_components(), "host")
+
+        self.assertNdarraysEqual(actual.store["x"], np.array([0, 1, 3]))
+
+    def test_several_components(self):
+        actual = component_filter_action(self._generate_components(), ["satellite", "stream"])
+
+        self.assertNdarraysEqual(actual.store["x"], np.array([2, 4]))
+
+    def test_input_is_unchanged(self):
+        snapshot = self._generate_components()
+
+        component_filter_action(snapshot, "host")
+
+        self.assertEqual(len(snapshot), 5)
+        self.assertNdarraysEqual(snapshot.store["x"], np.arange(5))
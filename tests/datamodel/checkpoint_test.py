@@ -0,0 +1,53 @@
+import os
+import random
+import tempfile
+
+import numpy as np
+from amuse.lab import units
+
+from omtool.core.datamodel import (
+    Checkpoint,
+    ParticleStore,
+    Snapshot,
+    load_checkpoint,
+    save_checkpoint,
+)
+from omtool.core.utils import BaseTestCase
+
+
+class TestCheckpoint(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "checkpoint.pkl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        position = np.random.normal(size=(10, 3))
+        store = ParticleStore(length=10)
+        store.set("x", position[:, 0], units.kpc)
+        store.set_lazy("mass", lambda: np.ones(10), units.MSun)
+        checkpoint = Checkpoint(
+            iteration=5,
+            snapshot=Snapshot(timestamp=3 | units.Myr, store=store),
+            output_length=2,
+            integrator_state={"acc": position},
+            tasks_state={"task": {"times": [1, 2]}},
+        )
+        save_checkpoint(self.filename, checkpoint)
+        expected = (random.random(), np.random.random())
+
+        actual = load_checkpoint(self.filename)
+        actual.restore_random_state()
+
+        self.assertEqual(actual.iteration, 5)
+        self.assertEqual(actual.output_length, 2)
+        self.assertEqual(actual.snapshot.timestamp, 3 | units.Myr)
+        self.assertNdarraysEqual(actual.snapshot.store["x"], position[:, 0])
+        self.assertNdarraysEqual(actual.snapshot.store["mass"], np.ones(10))
+        self.assertNdarraysEqual(actual.integrator_state["acc"], position)
+        self.assertEqual(actual.tasks_state, {"task": {"times": [1, 2]}})
+        self.assertEqual((random.random(), np.random.random()), expected)
+        self.assertFalse(os.path.exists(f"{self.filename}.tmp"))
@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+import numpy as np
+from amuse.lab import Particles, units
+from astropy.io import fits
+
+from omtool.core.datamodel import Snapshot, from_fits, from_fits_series
+from omtool.core.datamodel.fits_index import FITSIndex, index_filename
+from omtool.core.utils import BaseTestCase
+
+
+class TestFITSIndex(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "test.fits")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write_snapshots(self, times: list[float], n: int = 5) -> list[Snapshot]:
+        snapshots = []
+
+        for t in times:
+            particles = Particles(n)
+            particles.position = np.random.normal(size=(n, 3)).astype(np.float32) | units.kpc
+            particles.velocity = np.random.normal(size=(n, 3)).astype(np.float32) | units.kms
+            particles.mass = np.ones(n) | units.MSun
+            particles.is_barion = [True] * n
+            snapshot = Snapshot(particles, t | units.Myr)
+            snapshot.to_fits(self.filename, append=True)
+            snapshots.append(snapshot)
+
+        return snapshots
+
+    def test_offsets_match_astropy(self):
+        self._write_snapshots([0, 1, 2])
+        index = FITSIndex.load(self.filename)
+
+        with fits.open(self.filename) as hdul:
+            expected = [hdu.fileinfo()["hdrLoc"] for hdu in hdul[1:]]
+
+        self.assertEqual([entry.header_offset for entry in index.entries], expected)
+        self.assertTrue(os.path.isfile(index_filename(self.filename)))
+
+    def test_incremental_update(self):
+        self._write_snapshots([0, 1])
+        self.assertEqual(len(FITSIndex.load(self.filename)), 2)
+
+        self._write_snapshots([2, 3])
+        index = FITSIndex.load(self.filename)
+
+        self.assertEqual([entry.timestamp for entry in index.entries], [0, 1, 2, 3])
+
+    def test_rebuild_after_rewrite(self):
+        self._write_snapshots([0, 1, 2])
+        FITSIndex.load(self.filename)
+
+        os.remove(self.filename)
+        self._write_snapshots([5, 6, 7, 8], n=7)
+        index = FITSIndex.load(self.filename)
+
+        self.assertEqual([entry.timestamp for entry in index.entries], [5, 6, 7, 8])
+        self.assertEqual(index[0].number_of_particles, 7)
+
+    def test_read_by_index(self):
+        snapshots = self._write_snapshots([0, 1, 2])
+
+        for memmap in (False, True):
+            actual = next(from_fits(self.filename, snapshot_index=3, memmap=memmap))
+            self.assertSnapshotsEqual(actual, snapshots[2])
+            self.assertNdarraysEqual(actual.particles.is_barion, np.ones(5))
+
+    def test_start_time(self):
+        snapshots = self._write_snapshots([0, 10, 20, 30])
+
+        actual = list(from_fits(self.filename, start_time=15 | units.Myr, limit=1))
+
+        self.assertEqual(len(actual), 1)
+        self.assertSnapshotsEqual(actual[0], snapshots[2])
+
+
+class TestFITSSeries(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filenames = [os.path.join(self.dir.name, f"test_{i}.fits") for i in range(2)]
+        self.snapshots = {}
+
+        for filename, times in zip(self.filenames, ([0, 2, 4], [1, 3, 4, 5])):
+            for t in times:
+                particles = Particles(3)
+                particles.position = np.random.normal(size=(3, 3)).astype(np.float32) | units.kpc
+                particles.velocity = np.random.normal(size=(3, 3)).astype(np.float32) | units.kms
+                particles.mass = np.ones(3) | units.MSun
+                particles.is_barion = [True] * 3
+                snapshot = Snapshot(particles, t | units.Myr)
+                snapshot.to_fits(filename, append=True)
+                self.snapshots.setdefault(t, snapshot)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_merged_by_time(self):
+        for memmap in (False, True):
+            actual = list(from_fits_series(self.filenames, memmap=memmap))
+
+            self.assertEqual([s.timestamp.value_in(units.Myr) for s in actual], [0, 1, 2, 3, 4, 5])
+            for snapshot in actual:
+                expected = self.snapshots[snapshot.timestamp.value_in(units.Myr)]
+                self.assertSnapshotsEqual(snapshot, expected)
+
+    def test_start_time_and_limit(self):
+        actual = list(from_fits_series(self.filenames, start_time=2 | units.Myr, limit=3))
+
+        self.assertEqual([s.timestamp.value_in(units.Myr) for s in actual], [2, 3, 4])
@@ -0,0 +1,128 @@
+import os
+import tempfile
+
+import h5py
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import (
+    HDF5Writer,
+    Snapshot,
+    from_file,
+    from_hdf5,
+    open_writer,
+)
+from omtool.core.utils import BaseTestCase
+
+
+class TestHDF5(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "test.h5")
+
+        self.snapshots = []
+        for i in range(4):
+            particles = Particles(5)
+            particles.position = np.random.normal(size=(5, 3)).astype(np.float32) | units.kpc
+            particles.velocity = np.random.normal(size=(5, 3)).astype(np.float32) | units.kms
+            particles.mass = [1, 2, 3, 4, 5] | units.MSun
+            particles.is_barion = [True, False, True, False, True]
+            self.snapshots.append(Snapshot(particles, i | units.Myr))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, **kwargs):
+        with HDF5Writer(self.filename, **kwargs) as writer:
+            for snapshot in self.snapshots:
+                writer.write(snapshot)
+
+    def test_round_trip(self):
+        self._write()
+
+        actual = list(from_hdf5(self.filename))
+
+        self.assertEqual(len(actual), len(self.snapshots))
+        for actual_snapshot, expected_snapshot in zip(actual, self.snapshots):
+            self.assertEqual(actual_snapshot.timestamp, expected_snapshot.timestamp)
+            self.assertSnapshotsEqual(actual_snapshot, expected_snapshot)
+
+    def test_compression(self):
+        self._write(compression="gzip", chunk_size=2)
+
+        with h5py.File(self.filename, "r") as file:
+            dataset = file["snapshots/00000000/x"]
+            self.assertEqual(dataset.compression, "gzip")
+            self.assertEqual(dataset.chunks, (2,))
+            self.assertEqual(dataset.attrs["unit"], "kpc")
+
+        self.assertSnapshotsEqual(next(from_hdf5(self.filename)), self.snapshots[0])
+
+    def test_partial_reads(self):
+        self._write()
+
+        actual = next(from_hdf5(self.filename, snapshot_index=3))
+        self.assertSnapshotsEqual(actual, self.snapshots[2])
+
+        actual_list = list(from_hdf5(self.filename, start_time=1 | units.Myr, limit=2))
+        self.assertEqual([s.timestamp.value_in(units.Myr) for s in actual_list], [1, 2])
+
+        actual = next(from_hdf5(self.filename, columns={"x", "mass"}))
+        self.assertEqual(set(actual.store.keys()), {"x", "mass"})
+
+    def test_snapshot_index_below_one(self):
+        self._write()
+
+        for snapshot_index in (0, -1):
+            with self.assertRaises(ValueError):
+                next(from_hdf5(self.filename, snapshot_index=snapshot_index))
+
+    def test_append(self):
+        with HDF5Writer(self.filename) as writer:
+            writer.write(self.snapshots[0])
+
+        with HDF5Writer(self.filename, append=True) as writer:
+            writer.write(self.snapshots[1])
+
+        self.assertEqual(len(list(from_hdf5(self.filename))), 2)
+
+    def test_format_is_guessed_from_extension(self):
+        with open_writer(self.filename) as writer:
+            writer.write(self.snapshots[0])
+
+        self.assertIsInstance(writer, HDF5Writer)
+        self.assertSnapshotsEqual(next(from_file(self.filename)), self.snapshots[0])
+
+    def test_ids_and_components(self):
+        self.snapshots[0].store.set("id", np.arange(5))
+        self.snapshots[0].store.set("component", np.array(["a", "a", "bb", "bb", "c"]))
+
+        with HDF5Writer(self.filename) as writer:
+            writer.write(self.snapshots[0])
+
+        actual = next(from_hdf5(self.filename))
+
+        self.assertNdarraysEqual(actual.store["id"], np.arange(5))
+        self.assertNdarraysEqual(actual.store["component"], np.array(["a", "a", "bb", "bb", "c"]))
+
+    def test_append_keep(self):
+        self._write()
+
+        with HDF5Writer(self.filename, append=True, keep=2) as writer:
+            self.assertEqual(len(writer), 2)
+            writer.write(self.snapshots[3])
+
+        actual = list(from_hdf5(self.filename))
+
+        self.assertEqual(len(actual), 3)
+        self.assertSnapshotsEqual(actual[1], self.snapshots[1])
+        self.assertSnapshotsEqual(actual[2], self.snapshots[3])
+
+    def test_timestep(self):
+        self.snapshots[1].timestep = 0.25 | units.Myr
+        self._write()
+
+        actual = list(from_hdf5(self.filename))
+
+        self.assertEqual([s.timestep for s in actual], [None, 0.25 | units.Myr, None, None])
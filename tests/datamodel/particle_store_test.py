@@ -0,0 +1,116 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import ParticleStore, Snapshot
+from omtool.core.utils import BaseTestCase
+
+
+class TestParticleStore(BaseTestCase):
+    def _generate_store(self, N: int = 10) -> ParticleStore:
+        return ParticleStore(
+            {
+                "x": np.arange(N, dtype=np.float64),
+                "y": np.zeros(N),
+                "z": np.zeros(N),
+                "mass": np.ones(N),
+            }
+        )
+
+    def test_canonical_units(self):
+        store = self._generate_store()
+
+        self.assertEqual(store.unit("x"), units.kpc)
+        self.assertTrue(np.allclose(store.get("mass", units.MSun), 232500))
+
+    def test_wrong_column_length(self):
+        store = self._generate_store()
+
+        self.assertRaises(ValueError, store.set, "vx", np.zeros(5))
+
+    def test_select(self):
+        store = self._generate_store()
+        actual = store.select(slice(2, 5))
+
+        self.assertEqual(len(actual), 3)
+        self.assertNdarraysEqual(actual["x"], np.array([2, 3, 4]))
+
+    def test_concatenate_converts_units(self):
+        first = self._generate_store(2)
+        second = ParticleStore(
+            {"x": np.zeros(3), "y": np.zeros(3), "z": np.zeros(3), "mass": np.full(3, 465000.0)},
+            {"mass": units.MSun},
+        )
+        actual = ParticleStore.concatenate([first, second])
+
+        self.assertEqual(len(actual), 5)
+        self.assertNdarraysEqual(actual["mass"], np.array([1, 1, 2, 2, 2]))
+
+    def test_concatenate_fills_missing_columns(self):
+        first = ParticleStore({"mass": np.ones(2), "component": np.array(["host", "host"])})
+        second = ParticleStore({"mass": np.ones(3), "is_barion": np.ones(3, dtype=bool)})
+
+        actual = ParticleStore.concatenate([first, second])
+
+        self.assertEqual(actual.keys(), ["mass", "component", "is_barion"])
+        self.assertNdarraysEqual(actual["component"], np.array(["host", "host", "", "", ""]))
+        self.assertNdarraysEqual(actual["is_barion"], np.array([False, False, True, True, True]))
+
+    def test_particles_round_trip(self):
+        particles = Particles(3)
+        particles.position = [[1, 2, 3], [4, 5, 6], [7, 8, 9]] | units.kpc
+        particles.velocity = [[1, 2, 3], [4, 5, 6], [7, 8, 9]] | units.kms
+        particles.mass = [1, 2, 3] | units.MSun
+
+        expected = Snapshot(particles.copy())
+        actual = Snapshot(store=ParticleStore.from_particles(particles))
+
+        self.assertSnapshotsEqual(actual, expected)
+
+
+class TestSnapshotRepresentation(BaseTestCase):
+    def test_empty_snapshot(self):
+        self.assertEqual(len(Snapshot()), 0)
+        self.assertEqual(len(Snapshot().particles), 0)
+
+    def test_store_to_particles(self):
+        snapshot = Snapshot(store=ParticleStore({"x": np.array([1.0, 2.0])}))
+
+        self.assertNdarraysEqual(snapshot.particles.x.value_in(units.kpc), np.array([1, 2]))
+        self.assertNdarraysEqual(snapshot.store["x"], np.array([1, 2]))
+
+    def test_sum(self):
+        snapshot = Snapshot(store=ParticleStore({"x": np.array([1.0, 2.0])}))
+        actual = snapshot + snapshot[1]
+
+        self.assertNdarraysEqual(actual.store["x"], np.array([1, 2, 2]))
+
+    def test_particles_are_cached(self):
+        snapshot = Snapshot(store=ParticleStore({"x": np.array([1.0, 2.0])}))
+        particles = snapshot.particles
+
+        # store of the snapshot is a view of the particles, so reading it does not copy them.
+        self.assertTrue(np.shares_memory(snapshot.store["x"], particles.x.number))
+        self.assertIs(snapshot.particles, particles)
+
+        particles.x += 1 | units.kpc
+        snapshot.store["x"][0] = 5
+
+        self.assertNdarraysEqual(snapshot.store["x"], np.array([5, 3]))
+        self.assertNdarraysEqual(particles.x.value_in(units.kpc), np.array([5, 3]))
+
+    def test_particles_are_invalidated_by_store_writes(self):
+        snapshot = Snapshot(store=ParticleStore({"x": np.array([1.0, 2.0])}))
+        particles = snapshot.particles
+
+        snapshot.store.set("x", np.array([3.0, 4.0]), units.kpc)
+
+        self.assertIsNot(snapshot.particles, particles)
+        self.assertNdarraysEqual(snapshot.particles.x.value_in(units.kpc), np.array([3, 4]))
+
+    def test_new_particle_attributes_are_in_store(self):
+        snapshot = Snapshot(store=ParticleStore({"x": np.array([1.0, 2.0])}))
+        snapshot.particles.mass = [1, 2] | units.MSun
+        snapshot.particles.add_particles(snapshot.particles[:1].copy())
+
+        self.assertEqual(len(snapshot), 3)
+        self.assertNdarraysEqual(snapshot.store.get("mass", units.MSun), np.array([1, 2, 1]))
@@ -0,0 +1,34 @@
+from omtool.core.datamodel import prefetched
+from omtool.core.utils import BaseTestCase
+
+
+class TestPrefetched(BaseTestCase):
+    def test_order(self):
+        for depth in (0, 1, 3):
+            self.assertEqual(list(prefetched(range(10), depth)), list(range(10)))
+
+    def test_error_is_reraised(self):
+        def generate():
+            yield 1
+            raise ValueError("failed")
+
+        iterator = prefetched(generate(), 2)
+
+        self.assertEqual(next(iterator), 1)
+        with self.assertRaises(ValueError):
+            next(iterator)
+
+    def test_early_stop_closes_source(self):
+        closed = []
+
+        def generate():
+            try:
+                yield from range(100)
+            finally:
+                closed.append(True)
+
+        iterator = prefetched(generate(), 2)
+        next(iterator)
+        iterator.close()
+
+        self.assertEqual(closed, [True])
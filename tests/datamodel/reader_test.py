@@ -0,0 +1,139 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from amuse.lab import Particles, units
+from astropy.io import fits
+
+from omtool.core.datamodel import Snapshot, from_fits, from_logged_csvs
+from omtool.core.utils import BaseTestCase
+
+
+class TestFITSReader(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "test.fits")
+
+        self.snapshots = []
+        for i in range(3):
+            particles = Particles(4)
+            particles.position = np.arange(12).reshape((4, 3)) * (i + 1) | units.kpc
+            particles.velocity = np.arange(12).reshape((4, 3)) | units.kms
+            particles.mass = [1, 2, 3, 4] | units.MSun
+            particles.is_barion = [True, False, True, False]
+            snapshot = Snapshot(particles, i | units.Myr)
+            snapshot.to_fits(self.filename, append=True)
+            self.snapshots.append(snapshot)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_read_all(self):
+        actual = list(from_fits(self.filename))
+
+        self.assertEqual(len(actual), len(self.snapshots))
+        for actual_snapshot, expected_snapshot in zip(actual, self.snapshots):
+            self.assertSnapshotsEqual(actual_snapshot, expected_snapshot)
+
+    def test_memmap_equals_eager(self):
+        for eager, mapped in zip(from_fits(self.filename), from_fits(self.filename, memmap=True)):
+            self.assertSnapshotsEqual(mapped, eager)
+            self.assertEqual(mapped.store.keys(), eager.store.keys())
+
+            for key in eager.store.keys():
+                self.assertEqual(mapped.store[key].dtype, eager.store[key].dtype)
+
+            self.assertNdarraysEqual(mapped.store["is_barion"], eager.store["is_barion"])
+
+    def test_memmap_columns_are_read_only(self):
+        snapshot = next(from_fits(self.filename, memmap=True))
+
+        self.assertTrue(snapshot.store["x"].dtype.isnative)
+        self.assertFalse(snapshot.store["x"].flags.writeable)
+
+    def test_hdus_are_read_lazily(self):
+        opened = []
+        fits_open = fits.open
+
+        def open_file(*args, **kwargs):
+            opened.append(fits_open(*args, **kwargs))
+            return opened[-1]
+
+        with patch.object(fits, "open", open_file):
+            actual = next(from_fits(self.filename))
+
+        self.assertSnapshotsEqual(actual, self.snapshots[0])
+        # primary HDU and the first table; list length does not make HDUList read the rest.
+        self.assertEqual(list.__len__(opened[0]), 2)
+
+    def test_snapshot_index(self):
+        actual = next(from_fits(self.filename, snapshot_index=2, limit=1))
+
+        self.assertSnapshotsEqual(actual, self.snapshots[1])
+
+    def test_snapshot_index_below_one(self):
+        for snapshot_index in (0, -1):
+            with self.assertRaises(ValueError):
+                next(from_fits(self.filename, snapshot_index=snapshot_index))
+
+    def test_columns_projection(self):
+        for memmap in (False, True):
+            for start_time in (None, 1 | units.Myr):
+                snapshot = next(
+                    from_fits(
+                        self.filename,
+                        memmap=memmap,
+                        start_time=start_time,
+                        columns={"x", "mass"},
+                    )
+                )
+
+                self.assertEqual(set(snapshot.store.keys()), {"x", "mass"})
+
+
+class TestLoggedCSVReader(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filenames = []
+
+        for body in range(3):
+            filename = os.path.join(self.dir.name, f"body_{body}.csv")
+            times = np.arange(5)
+            table = pd.DataFrame(
+                {
+                    "T": times,
+                    "x": times + body * 10,
+                    "y": times * 2,
+                    "z": times * 3,
+                    "vx": times,
+                    "vy": times,
+                    "vz": times,
+                    "m": np.full(len(times), body + 1),
+                }
+            )
+            table.to_csv(filename, index=False)
+            self.filenames.append(filename)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_read(self):
+        actual = list(from_logged_csvs(self.filenames))
+
+        self.assertEqual(len(actual), 5)
+        self.assertEqual(actual[2].timestamp, 2 | units.Myr)
+        self.assertNdarraysEqual(actual[2].store["x"], np.array([2, 12, 22]))
+        self.assertNdarraysEqual(actual[2].particles.mass.value_in(units.MSun), [1, 2, 3])
+
+    def test_chunks_equal_bulk(self):
+        for chunksize in (1, 2, 3, 10):
+            actual = list(from_logged_csvs(self.filenames, chunksize=chunksize))
+
+            self.assertEqual(len(actual), 5)
+            for chunked, bulk in zip(actual, from_logged_csvs(self.filenames)):
+                self.assertEqual(chunked.timestamp, bulk.timestamp)
+                self.assertSnapshotsEqual(chunked, bulk)
@@ -0,0 +1,127 @@
+import os
+import tempfile
+
+import numpy as np
+from amuse.lab import Particles, units
+from astropy.io import fits
+
+from omtool.core.datamodel import FITSWriter, Snapshot, from_fits
+from omtool.core.datamodel.fits_index import FITSIndex
+from omtool.core.utils import BaseTestCase
+
+
+class TestFITSWriter(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "test.fits")
+
+        self.snapshots = []
+        for i in range(4):
+            particles = Particles(3)
+            particles.position = np.random.normal(size=(3, 3)).astype(np.float32) | units.kpc
+            particles.velocity = np.random.normal(size=(3, 3)).astype(np.float32) | units.kms
+            particles.mass = [1, 2, 3] | units.MSun
+            particles.is_barion = [True, False, True]
+            self.snapshots.append(Snapshot(particles, i | units.Myr))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_readable_by_astropy(self):
+        with FITSWriter(self.filename) as writer:
+            for snapshot in self.snapshots:
+                writer.write(snapshot)
+
+        with fits.open(self.filename) as hdul:
+            hdul.verify("exception")
+            self.assertEqual(len(hdul), len(self.snapshots) + 1)
+            self.assertNdarraysEqual(hdul[2].data["is_barion"], np.array([True, False, True]))
+            self.assertEqual(hdul[3].header["TIME"], 2)
+
+        for actual, expected in zip(from_fits(self.filename), self.snapshots):
+            self.assertSnapshotsEqual(actual, expected)
+
+    def test_flush_interval(self):
+        writer = FITSWriter(self.filename, flush_interval=3)
+
+        for snapshot in self.snapshots[:2]:
+            writer.write(snapshot)
+
+        self.assertEqual(len(FITSIndex.load(self.filename)), 0)
+
+        writer.write(self.snapshots[2])
+        self.assertEqual(len(FITSIndex.load(self.filename)), 3)
+
+        writer.write(self.snapshots[3])
+        writer.close()
+        self.assertEqual(len(FITSIndex.load(self.filename)), 4)
+
+    def test_append(self):
+        with FITSWriter(self.filename) as writer:
+            writer.write(self.snapshots[0])
+
+        with FITSWriter(self.filename, append=True) as writer:
+            for snapshot in self.snapshots[1:]:
+                writer.write(snapshot)
+
+        actual = list(from_fits(self.filename, start_time=2 | units.Myr))
+
+        self.assertEqual(len(actual), 2)
+        self.assertSnapshotsEqual(actual[0], self.snapshots[2])
+
+    def test_ids_and_components(self):
+        for snapshot in self.snapshots:
+            snapshot.store.set("id", np.array([5, 6, 7]))
+            snapshot.store.set("component", np.array(["host", "satellite", ""]))
+
+        with FITSWriter(self.filename) as writer:
+            for snapshot in self.snapshots:
+                writer.write(snapshot)
+
+        for memmap in (False, True):
+            for start_time in (None, 0 | units.Myr):
+                actual = next(from_fits(self.filename, memmap=memmap, start_time=start_time))
+
+                self.assertNdarraysEqual(actual.store["id"], np.array([5, 6, 7]))
+                self.assertNdarraysEqual(
+                    actual.store["component"], np.array(["host", "satellite", ""])
+                )
+
+    def test_append_keep(self):
+        with FITSWriter(self.filename) as writer:
+            for snapshot in self.snapshots[:3]:
+                writer.write(snapshot)
+
+        for keep in (1, 0):
+            with FITSWriter(self.filename, append=True, keep=keep) as writer:
+                self.assertEqual(len(writer), keep)
+                writer.write(self.snapshots[3])
+
+            actual = list(from_fits(self.filename))
+
+            self.assertEqual(len(actual), keep + 1)
+            self.assertSnapshotsEqual(actual[-1], self.snapshots[3])
+
+            with fits.open(self.filename) as hdul:
+                hdul.verify("exception")
+
+    def test_timestep(self):
+        self.snapshots[1].timestep = 0.25 | units.Myr
+        self.snapshots[2].timestep = 2 | units.kyr
+
+        with FITSWriter(self.filename) as writer:
+            for snapshot in self.snapshots:
+                writer.write(snapshot)
+
+        with fits.open(self.filename) as hdul:
+            hdul.verify("exception")
+
+        for actual in (
+            list(from_fits(self.filename)),
+            list(from_fits(self.filename, memmap=True)),
+            [next(from_fits(self.filename, snapshot_index=i)) for i in range(1, 5)],
+        ):
+            self.assertEqual(
+                [s.timestep for s in actual], [None, 0.25 | units.Myr, 0.002 | units.Myr, None]
+            )
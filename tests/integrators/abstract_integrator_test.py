@@ -0,0 +1,38 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.utils import BaseTestCase
+from tools.integrators.dummy_integrator import DummyIntegrator
+
+
+class TestAbstractIntegrator(BaseTestCase):
+    def _generate_moving_pair(self) -> Snapshot:
+        particles = Particles(2)
+        particles.position = np.zeros((2, 3)) | units.kpc
+        particles.velocity = [[1, 0, 0], [0, 1, 0]] | units.kms
+
+        return Snapshot(particles, 0 | units.Myr)
+
+    def test_advance(self):
+        integrator = DummyIntegrator(1 | units.Myr)
+
+        actual, steps = integrator.advance(self._generate_moving_pair(), 5)
+
+        self.assertEqual(steps, 5)
+        self.assertEqual(actual.timestamp, 5 | units.Myr)
+
+    def test_advance_stop_time(self):
+        integrator = DummyIntegrator(1 | units.Myr)
+
+        actual, steps = integrator.advance(self._generate_moving_pair(), 5, 2.5 | units.Myr)
+
+        self.assertEqual(steps, 3)
+        self.assertEqual(actual.timestamp, 3 | units.Myr)
+
+    def test_advance_to(self):
+        integrator = DummyIntegrator(1 | units.Myr)
+
+        actual = integrator.advance_to(self._generate_moving_pair(), 4 | units.Myr)
+
+        self.assertEqual(actual.timestamp, 4 | units.Myr)
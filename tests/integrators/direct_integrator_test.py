@@ -0,0 +1,211 @@
+from unittest.mock import patch
+
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.integrators import ArrayIntegrator
+from omtool.core.integrators.array_integrator import attr_unit_dict
+from omtool.core.utils import BaseTestCase, direct_gravity
+from tools.integrators.direct_integrator import DirectIntegrator
+
+
+class TestDirectIntegrator(BaseTestCase):
+    def _generate_binary(self) -> Snapshot:
+        # circular orbit of two equal masses with G = M = 1 and separation 2.
+        particles = Particles(2)
+        particles.position = np.array([[-1, 0, 0], [1, 0, 0]]) | units.kpc
+        particles.velocity = np.array([[0, -0.5, 0], [0, 0.5, 0]]) | units.kms
+        particles.mass = np.array([1, 1]) | attr_unit_dict["mass"]
+        particles.component = np.array(["a", "b"])
+
+        return Snapshot(particles, 0 | units.Gyr)
+
+    def test_circular_orbit(self):
+        for levels in (0, 2):
+            integrator = DirectIntegrator(0 | units.kpc, 6, levels=levels)
+
+            actual, steps = integrator.advance(self._generate_binary(), 64)
+
+            self.assertEqual(steps, 64)
+            self.assertEqual(actual.timestamp, 1 | units.Gyr)
+            self.assertNdarraysAlmostEqual(
+                np.hypot(actual.store["x"], actual.store["y"]), np.array([1, 1]), rtol=1e-3
+            )
+            self.assertNdarraysEqual(actual.store["component"], np.array(["a", "b"]))
+
+    def test_state_is_reused(self):
+        integrator = DirectIntegrator(0 | units.kpc, 6)
+
+        snapshot = integrator.leapfrog(self._generate_binary())
+        position = integrator.position
+        snapshot.particles
+        actual = integrator.leapfrog(snapshot)
+
+        self.assertIs(integrator.position, position)
+        self.assertEqual(actual.timestamp, 2 * 0.5**6 | units.Gyr)
+
+    def test_restore(self):
+        expected_integrator = DirectIntegrator(0 | units.kpc, 6, levels=2)
+        expected, _ = expected_integrator.advance(self._generate_binary(), 10)
+
+        integrator = DirectIntegrator(0 | units.kpc, 6, levels=2)
+        snapshot, _ = integrator.advance(self._generate_binary(), 4)
+        state = integrator.get_state()
+        snapshot = Snapshot(timestamp=snapshot.timestamp, store=snapshot.store.copy())
+
+        restored = DirectIntegrator(0 | units.kpc, 6, levels=2)
+        actual, _ = restored.advance(restored.restore(snapshot, state), 6)
+
+        self.assertNdarraysEqual(actual.store.vector("position"), expected.store.vector("position"))
+        self.assertNdarraysEqual(actual.store.vector("velocity"), expected.store.vector("velocity"))
+        self.assertEqual(actual.timestamp, expected.timestamp)
+
+    def test_methods(self):
+        def radius_error(method: str) -> float:
+            integrator = DirectIntegrator(0 | units.kpc, 4, method=method)
+            actual, _ = integrator.advance(self._generate_binary(), 64)
+
+            return np.abs(np.hypot(actual.store["x"], actual.store["y"]) - 1).max()
+
+        errors = [radius_error(method) for method in ("leapfrog", "yoshida4", "yoshida6")]
+
+        self.assertLess(errors[1], errors[0] / 100)
+        self.assertLess(errors[2], errors[1])
+        self.assertLess(radius_error("hermite"), errors[0] / 100)
+
+    def test_invalid_methods(self):
+        with self.assertRaises(ValueError):
+            DirectIntegrator(0 | units.kpc, 4, method="euler")
+
+        with self.assertRaises(ValueError):
+            DirectIntegrator(0 | units.kpc, 4, levels=2, method="yoshida4")
+
+        with self.assertRaises(ValueError):
+            DirectIntegrator(0 | units.kpc, 4, levels=2, min_level=-1, max_level=1)
+
+    def test_adaptive_timestep(self):
+        def energy(integrator: DirectIntegrator) -> float:
+            distance = np.linalg.norm(integrator.position[0] - integrator.position[1])
+
+            return 0.5 * (integrator.velocity**2).sum() - 1 / distance
+
+        integrator = DirectIntegrator(0.01 | units.kpc, 6, min_level=-3, max_level=4)
+        snapshot = self._generate_binary()
+        snapshot.particles.velocity *= 0.4
+        integrator.load(snapshot)
+        expected_energy = energy(integrator)
+        timesteps = []
+
+        while snapshot.timestamp < 8 | units.Gyr:
+            start = snapshot.timestamp.value_in(units.Gyr)
+            snapshot = integrator.leapfrog(snapshot)
+            timesteps.append(integrator.current_timestep.value_in(units.Gyr))
+
+            self.assertEqual(start % timesteps[-1], 0)
+
+        self.assertGreater(max(timesteps), 0.5**6)
+        self.assertLess(min(timesteps), 0.5**6)
+        self.assertLess(len(timesteps), 8 / min(timesteps) / 2)
+        self.assertLess(abs(energy(integrator) / expected_energy - 1), 1e-3)
+
+    def test_external_potential(self):
+        # circular orbit of the test particle around the moving Hernquist sphere with M = 10,
+        # a = 1 at the radius 2.
+        config = {
+            "type": "hernquist",
+            "mass": 10 | attr_unit_dict["mass"],
+            "radius": 1 | units.kpc,
+            "position": np.array([1, 0, 0]) | units.kpc,
+            "velocity": np.array([1, 0, 0]) | units.kms,
+        }
+        particles = Particles(1)
+        particles.position = np.array([[3, 0, 0]]) | units.kpc
+        particles.velocity = np.array([[1, np.sqrt(20) / 3, 0]]) | units.kms
+        particles.mass = np.array([1e-10]) | attr_unit_dict["mass"]
+
+        for method in ("leapfrog", "yoshida4"):
+            integrator = DirectIntegrator(
+                0 | units.kpc, 6, method=method, external_potentials=[config]
+            )
+            actual, _ = integrator.advance(Snapshot(particles.copy(), 0 | units.Gyr), 256)
+            position = actual.store.vector("position", units.kpc)[0] - [5, 0, 0]
+
+            self.assertAlmostEqual(np.linalg.norm(position), 2, delta=1e-3)
+
+        with self.assertRaises(ValueError):
+            DirectIntegrator(0 | units.kpc, 6, method="hermite", external_potentials=[config])
+
+    def test_passive_particles(self):
+        binary = self._generate_binary()
+        expected, _ = DirectIntegrator(0.1 | units.kpc, 6).advance(binary, 32)
+
+        particles = Particles(4)
+        particles.position = (
+            np.array([[-1, 0, 0], [1, 0, 0], [0, 0.1, 0], [0, -0.1, 0]]) | units.kpc
+        )
+        particles.velocity = np.array([[0, -0.5, 0], [0, 0.5, 0], [0, 0, 0], [0, 0, 0]]) | units.kms
+        particles.mass = np.array([1, 1, 1, 1e-3]) | attr_unit_dict["mass"]
+        particles.component = np.array(["a", "b", "tracer", "tracer"])
+
+        for kwargs in (
+            {"passive_components": ["tracer"]},
+            {"passive_mass": 1e-2 | attr_unit_dict["mass"], "passive_components": ["tracer"]},
+        ):
+            integrator = DirectIntegrator(0.1 | units.kpc, 6, **kwargs)
+            actual, _ = integrator.advance(Snapshot(particles.copy(), 0 | units.Gyr), 32)
+
+            self.assertNdarraysEqual(integrator.active, np.array([True, True, False, False]))
+            self.assertNdarraysAlmostEqual(
+                actual.store.vector("position")[:2], expected.store.vector("position")
+            )
+            # tracers feel the binary, the binary does not feel the tracers.
+            self.assertGreater(np.abs(actual.store.vector("position")[2:] - [0, 0.1, 0]).max(), 0)
+
+        integrator = DirectIntegrator(
+            0.1 | units.kpc, 6, passive_mass=1e-2 | attr_unit_dict["mass"]
+        )
+        integrator.load(Snapshot(particles.copy(), 0 | units.Gyr))
+        self.assertNdarraysEqual(integrator.active, np.array([True, True, True, False]))
+
+        snapshot = self._generate_binary()
+        snapshot.store = snapshot.store.project(["x", "y", "z", "vx", "vy", "vz", "mass"])
+        with self.assertRaises(ValueError):
+            DirectIntegrator(0.1 | units.kpc, 6, passive_components=["tracer"]).load(snapshot)
+
+    def test_block_step_forces(self):
+        particles = Particles(4)
+        particles.position = np.array([[-1, 0, 0], [1, 0, 0], [0, 2, 0], [0, -3, 0]]) | units.kpc
+        particles.velocity = np.zeros((4, 3)) | units.kms
+        particles.mass = np.array([1, 1, 0.5, 0.5]) | attr_unit_dict["mass"]
+        snapshot = Snapshot(particles, 0 | units.Gyr)
+
+        class FullDirectIntegrator(DirectIntegrator):
+            targeted_gravity = ArrayIntegrator.targeted_gravity
+
+        expected_integrator = FullDirectIntegrator(0.1 | units.kpc, 4, levels=2)
+        integrator = DirectIntegrator(0.1 | units.kpc, 4, levels=2)
+
+        for each in (expected_integrator, integrator):
+            each.load(snapshot)
+            each.acc = each.accelerations()
+            each.step_levels = np.array([0, 0, 1, 2])
+
+        expected_integrator.step()
+
+        with (
+            patch.object(direct_gravity, "field", wraps=direct_gravity.field) as field,
+            patch.object(direct_gravity, "gravity", wraps=direct_gravity.gravity) as gravity,
+        ):
+            integrator.step()
+
+        # four substeps: only the particles whose step ends are the sinks, forces on all of
+        # them are computed once at the end of the largest step.
+        self.assertEqual([len(call.args[0]) for call in field.call_args_list], [1, 2, 1])
+        self.assertEqual(gravity.call_count, 1)
+        self.assertNdarraysAlmostEqual(
+            integrator.position, expected_integrator.position, atol=1e-12
+        )
+        self.assertNdarraysAlmostEqual(
+            integrator.velocity, expected_integrator.velocity, atol=1e-12
+        )
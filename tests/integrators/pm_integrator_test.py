@@ -0,0 +1,32 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.integrators.array_integrator import attr_unit_dict
+from omtool.core.utils import BaseTestCase
+from tools.integrators.pm_integrator import PMIntegrator
+
+
+class TestPMIntegrator(BaseTestCase):
+    def test_free_fall(self):
+        particles = Particles(2)
+        particles.position = [[-5, 0, 0], [5, 0, 0]] | units.kpc
+        particles.velocity = np.zeros((2, 3)) | units.kms
+        particles.mass = [1, 1] | attr_unit_dict["mass"]
+        integrator = PMIntegrator(0.1 | units.kpc, 3, grid_size=32)
+
+        actual, _ = integrator.advance(Snapshot(particles), 8)
+        velocity = actual.store.vector("velocity")
+
+        # particles fall on each other and the momentum is conserved.
+        self.assertLess(actual.store["x"][1], 5)
+        self.assertNdarraysAlmostEqual(actual.store["x"], -actual.store["x"][::-1])
+        self.assertNdarraysAlmostEqual(velocity.sum(axis=0), np.zeros(3), atol=1e-12)
+
+    def test_unknown_scheme(self):
+        with self.assertRaises(ValueError):
+            PMIntegrator(0.1 | units.kpc, 3, scheme="ngp")
+
+    def test_hermite_is_not_supported(self):
+        with self.assertRaises(ValueError):
+            PMIntegrator(0.1 | units.kpc, 3, method="hermite")
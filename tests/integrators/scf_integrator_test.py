@@ -0,0 +1,87 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.integrators.array_integrator import attr_unit_dict
+from omtool.core.utils import BaseTestCase
+from tools.integrators.scf_integrator import SCFIntegrator
+
+
+class TestSCFIntegrator(BaseTestCase):
+    def _generate_host_and_satellite(self) -> Snapshot:
+        # Hernquist sphere with M = 10, a = 1 and the satellite with its own tracer.
+        rng = np.random.default_rng(0)
+        n_particles = 20000
+        # truncated at r = 20 so the center of mass is close to the center of the sphere.
+        u = np.sqrt(rng.uniform(high=(20 / 21) ** 2, size=n_particles))
+        direction = rng.normal(size=(n_particles, 3))
+        direction /= np.linalg.norm(direction, axis=1)[:, np.newaxis]
+
+        particles = Particles(n_particles + 2)
+        particles.position = (
+            np.vstack([(u / (1 - u))[:, np.newaxis] * direction, [[3, 0, 0], [3, 0.5, 0]]])
+            | units.kpc
+        )
+        particles.velocity = np.zeros((n_particles + 2, 3)) | units.kms
+        particles.mass = (
+            np.concatenate([np.full(n_particles, 10 / n_particles), [0.1, 0]])
+            | attr_unit_dict["mass"]
+        )
+        particles.component = np.array(["host"] * n_particles + ["satellite"] * 2)
+
+        return Snapshot(particles, 0 | units.Gyr)
+
+    def test_components(self):
+        integrator = SCFIntegrator(
+            0.1 | units.kpc, 6, 1 | units.kpc, nmax=4, lmax=2, components=["host"]
+        )
+        integrator.load(self._generate_host_and_satellite())
+
+        acc = integrator.gravity()
+
+        def host_acc(r: float) -> float:
+            return 10 * (r / (r + 1)) ** 2 / (20 / 21) ** 2 / r**2
+
+        # satellite feels the host; its tracer feels both the host and the satellite.
+        self.assertAlmostEqual(acc[-2, 0], -host_acc(3), delta=0.02)
+        self.assertAlmostEqual(
+            acc[-1, 1],
+            -0.1 * 0.5 / 0.26**1.5 - host_acc(np.sqrt(9.25)) * 0.5 / np.sqrt(9.25),
+            delta=0.02,
+        )
+        self.assertNdarraysEqual(integrator.expanded[-3:], np.array([True, False, False]))
+
+    def test_recompute_interval(self):
+        integrator = SCFIntegrator(0.1 | units.kpc, 6, 1 | units.kpc, 2, 2, recompute_interval=2)
+        integrator.load(self._generate_host_and_satellite())
+
+        integrator.gravity()
+        expansion = integrator.expansion
+        integrator.gravity()
+        self.assertIs(integrator.expansion, expansion)
+
+        integrator.gravity()
+        self.assertIsNot(integrator.expansion, expansion)
+
+    def test_restore(self):
+        expected_integrator = SCFIntegrator(
+            0.1 | units.kpc, 6, 1 | units.kpc, 2, 2, recompute_interval=3
+        )
+        expected, _ = expected_integrator.advance(self._generate_host_and_satellite(), 5)
+
+        integrator = SCFIntegrator(0.1 | units.kpc, 6, 1 | units.kpc, 2, 2, recompute_interval=3)
+        snapshot, _ = integrator.advance(self._generate_host_and_satellite(), 2)
+        state = integrator.get_state()
+        snapshot = Snapshot(timestamp=snapshot.timestamp, store=snapshot.store.copy())
+
+        restored = SCFIntegrator(0.1 | units.kpc, 6, 1 | units.kpc, 2, 2, recompute_interval=3)
+        actual, _ = restored.advance(restored.restore(snapshot, state), 3)
+
+        self.assertNdarraysEqual(actual.store.vector("position"), expected.store.vector("position"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SCFIntegrator(0.1 | units.kpc, 6, 1 | units.kpc, solver="fmm")
+
+        with self.assertRaises(ValueError):
+            SCFIntegrator(0.1 | units.kpc, 6, 1 | units.kpc, recompute_interval=0)
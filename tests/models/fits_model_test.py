@@ -31,15 +31,16 @@ class TestFITSModel(BaseTestCase):
 
     @patch("omtool.core.datamodel.from_fits")
     def test_run(self, from_fits_mock):
-        from_fits_mock.return_value = iter(self._generate_snapshots())
+        from_fits_mock.return_value = iter(self._generate_snapshots()[1:])
         model = FITSModel("test", 1)
         actual = model.run()
         expected = self._generate_snapshots()[1]
 
         self.assertSnapshotsEqual(expected, actual)
+        from_fits_mock.assert_called_once_with("test", snapshot_index=2, limit=1)
 
     @patch("omtool.core.datamodel.from_fits")
     def test_snapshot_index_out_of_range(self, from_fits_mock):
-        from_fits_mock.return_value = self._generate_snapshots()
+        from_fits_mock.return_value = iter([])
         model = FITSModel("test", 5)
         self.assertRaises(ValueError, model.run)
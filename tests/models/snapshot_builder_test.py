@@ -0,0 +1,67 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.actions_before import barion_filter_action
+from omtool.core.datamodel import Snapshot
+from omtool.core.models import SnapshotBuilder
+from omtool.core.utils import BaseTestCase
+
+
+class TestSnapshotBuilder(BaseTestCase):
+    def _generate_component(self, n: int, mass: float) -> Snapshot:
+        particles = Particles(n)
+        particles.position = np.zeros((n, 3)) | units.kpc
+        particles.velocity = np.zeros((n, 3)) | units.kms
+        particles.mass = np.full(n, mass) | units.MSun
+        particles.is_barion = [True] * n
+
+        return Snapshot(particles, 0 | units.Myr)
+
+    def test_components(self):
+        builder = SnapshotBuilder()
+        builder.add_snapshot(self._generate_component(2, 1), offset=[3, 0, 0] | units.kpc)
+        builder.add_snapshot(self._generate_component(3, 2), velocity=[0, 4, 0] | units.kms)
+
+        result = builder.get_result()
+
+        self.assertEqual(len(result), 5)
+        self.assertEqual(builder.component_offsets, [0, 2])
+        self.assertNdarraysEqual(
+            result.particles.x.value_in(units.kpc), np.array([2.25, 2.25, -0.75, -0.75, -0.75])
+        )
+        self.assertNdarraysEqual(
+            result.particles.vy.value_in(units.kms), np.array([-3, -3, 1, 1, 1])
+        )
+
+    def test_ids_and_components(self):
+        builder = SnapshotBuilder()
+        host = self._generate_component(2, 1)
+        host.store.set("component", np.array(["host", "host"]))
+        builder.add_snapshot(host)
+        builder.add_snapshot(self._generate_component(1, 1))
+
+        result = builder.get_result()
+
+        self.assertNdarraysEqual(result.store["id"], np.array([0, 1, 2]))
+        self.assertNdarraysEqual(result.store["component"], np.array(["host", "host", ""]))
+
+    def test_empty(self):
+        builder = SnapshotBuilder()
+
+        self.assertEqual(len(builder.get_result()), 0)
+        self.assertEqual(builder.component_offsets, [])
+
+    def test_missing_columns(self):
+        builder = SnapshotBuilder()
+        builder.add_snapshot(self._generate_component(2, 1))
+        other = self._generate_component(3, 1)
+        other.store = other.store.project(["x", "y", "z", "vx", "vy", "vz", "mass"])
+        builder.add_snapshot(other)
+
+        result = builder.get_result()
+
+        self.assertIn("is_barion", result.store)
+        self.assertNdarraysEqual(
+            result.store["is_barion"], np.array([True, True, False, False, False])
+        )
+        self.assertEqual(len(barion_filter_action(result)), 2)
@@ -0,0 +1,25 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.utils import BaseTestCase
+from tools.tasks.potential_task import PotentialTask
+
+
+class TestPotentialTask(BaseTestCase):
+    def test_pm_solver(self):
+        rng = np.random.default_rng(0)
+        particles = Particles(200)
+        particles.position = rng.normal(size=(200, 3)) | units.kpc
+        particles.mass = np.full(200, 1e6) | units.MSun
+
+        task = PotentialTask(resolution=50, pot_unit=1 | units.kms**2, solver="pm", grid_size=32)
+        actual = task.run(Snapshot(particles))
+
+        self.assertEqual(len(actual["radii"]), 4)
+        # potential grows outwards from the center.
+        self.assertTrue(np.all(np.diff(actual["potential"]) > 0))
+
+    def test_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            PotentialTask(solver="tree")
@@ -61,3 +61,10 @@ class TestScatterTask(BaseTestCase):
         task = ScatterTask(exprs, u)
 
         self.assertRaises(IncompatibleUnitsException, task.run, self._generate_snapshot())
+
+    def test_columns(self):
+        task = ScatterTask(
+            {"r": "x^2 + y^2", "v": "vz * m"}, {"r": 1 | units.kpc**2, "v": 1 | units.kms}
+        )
+
+        self.assertEqual(task.columns, {"x", "y", "vz", "mass"})
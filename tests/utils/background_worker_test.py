@@ -0,0 +1,83 @@
+import threading
+
+from omtool.core.utils import BackgroundWorker, BaseTestCase
+
+
+class TestBackgroundWorker(BaseTestCase):
+    def test_jobs_are_done_in_order(self):
+        worker = BackgroundWorker(2)
+        result = []
+
+        for i in range(10):
+            worker.submit(result.append, i)
+
+        worker.close()
+
+        self.assertEqual(result, list(range(10)))
+
+    def test_synchronous(self):
+        worker = BackgroundWorker(0)
+        result = []
+
+        worker.submit(result.append, 1)
+
+        self.assertEqual(result, [1])
+
+    def test_back_pressure(self):
+        worker = BackgroundWorker(1)
+        event = threading.Event()
+        worker.submit(event.wait)
+        worker.submit(lambda: None)
+
+        submitted = threading.Event()
+
+        def submit():
+            worker.submit(lambda: None)
+            submitted.set()
+
+        thread = threading.Thread(target=submit)
+        thread.start()
+
+        self.assertFalse(submitted.wait(0.1))
+
+        event.set()
+        thread.join()
+        worker.close()
+
+        self.assertTrue(submitted.is_set())
+
+    def test_error_is_reraised(self):
+        worker = BackgroundWorker(1)
+
+        def fail():
+            raise ValueError("failed")
+
+        worker.submit(fail)
+
+        with self.assertRaises(ValueError):
+            worker.join()
+
+        worker.close()
+
+    def test_failure_is_sticky(self):
+        worker = BackgroundWorker(2)
+        event = threading.Event()
+        result = []
+
+        def fail():
+            event.wait()
+            raise ValueError("failed")
+
+        worker.submit(fail)
+        worker.submit(result.append, 1)
+        event.set()
+
+        with self.assertRaises(ValueError):
+            worker.join()
+
+        with self.assertRaises(RuntimeError):
+            worker.submit(result.append, 2)
+
+        worker.close()
+
+        self.assertEqual(result, [])
@@ -0,0 +1,87 @@
+import numpy as np
+
+from omtool.core.utils import BaseTestCase, direct_gravity
+
+
+def _naive_gravity(position: np.ndarray, mass: np.ndarray, eps: float):
+    dx = position[np.newaxis, :] - position[:, np.newaxis]
+    r2 = (dx**2).sum(axis=2) + eps**2
+    inv_r = 1 / np.sqrt(r2)
+    np.fill_diagonal(inv_r, 0)
+
+    acc = (mass * inv_r**3)[:, :, np.newaxis] * dx
+
+    return acc.sum(axis=1), -(mass * inv_r).sum(axis=1)
+
+
+class TestDirectGravity(BaseTestCase):
+    def test_two_particles(self):
+        acc, pot = direct_gravity.gravity(np.array([[0, 0, 0], [2, 0, 0]]), np.array([1, 3]), 0)
+
+        self.assertNdarraysAlmostEqual(acc, np.array([[0.75, 0, 0], [-0.25, 0, 0]]))
+        self.assertNdarraysAlmostEqual(pot, np.array([-1.5, -0.5]))
+
+    def test_tiles(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(100, 3))
+        mass = rng.uniform(size=100)
+        expected_acc, expected_pot = _naive_gravity(position, mass, 0.1)
+
+        for tile_size, threads in [(7, 1), (16, 4), (1000, None)]:
+            acc, pot = direct_gravity.gravity(position, mass, 0.1, tile_size, threads)
+
+            self.assertNdarraysAlmostEqual(acc, expected_acc)
+            self.assertNdarraysAlmostEqual(pot, expected_pot)
+
+    def test_shared_memory(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(100, 3))
+        mass = rng.uniform(size=100)
+        expected_acc, expected_pot = direct_gravity.gravity(position, mass, 0.1)
+        pool = direct_gravity.SharedMemoryGravity(100, processes=2, tile_size=16)
+
+        try:
+            for _ in range(2):
+                acc, pot = pool.gravity(position, mass, 0.1)
+
+                self.assertNdarraysAlmostEqual(acc, expected_acc)
+                self.assertNdarraysAlmostEqual(pot, expected_pot)
+        finally:
+            pool.close()
+
+    def test_jerk(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(50, 3))
+        velocity = rng.normal(size=(50, 3))
+        mass = rng.uniform(size=50)
+        dt = 1e-7
+
+        acc, jerk = direct_gravity.gravity_and_jerk(position, velocity, mass, 0.1, 16, 2)
+        expected_acc, _ = direct_gravity.gravity(position, mass, 0.1)
+        next_acc, _ = direct_gravity.gravity(position + velocity * dt, mass, 0.1)
+
+        self.assertNdarraysAlmostEqual(acc, expected_acc)
+        self.assertNdarraysAlmostEqual(jerk, (next_acc - acc) / dt, rtol=1e-3, atol=1e-3)
+
+    def test_field(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(100, 3))
+        mass = rng.uniform(size=100)
+        expected_acc, expected_pot = _naive_gravity(position, np.where(mass > 0.5, mass, 0), 0.1)
+
+        acc, pot = direct_gravity.field(
+            position[mass <= 0.5], position[mass > 0.5], mass[mass > 0.5], 0.1, 16, 4
+        )
+
+        self.assertNdarraysAlmostEqual(acc, expected_acc[mass <= 0.5])
+        self.assertNdarraysAlmostEqual(pot, expected_pot[mass <= 0.5])
+
+    def test_field_of_sources(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(100, 3))
+        mass = rng.uniform(size=100)
+        expected_acc, _ = direct_gravity.gravity(position, mass, 0)
+
+        acc, _ = direct_gravity.field(position[::3], position, mass, 0, 16, 4)
+
+        self.assertNdarraysAlmostEqual(acc, expected_acc[::3])
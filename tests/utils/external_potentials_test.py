@@ -0,0 +1,69 @@
+import numpy as np
+from amuse.lab import units
+
+from omtool.core.utils import BaseTestCase, external_potentials
+from omtool.core.utils.external_potentials import mass_unit
+
+_configs = [
+    {"type": "plummer", "mass": 10 | mass_unit, "radius": 1 | units.kpc},
+    {"type": "hernquist", "mass": 10 | mass_unit, "radius": 1 | units.kpc},
+    {"type": "nfw", "mass": 10 | mass_unit, "radius": 2 | units.kpc},
+    {
+        "type": "miyamoto_nagai",
+        "mass": 10 | mass_unit,
+        "radius": 3 | units.kpc,
+        "height": 0.3 | units.kpc,
+    },
+    {
+        "type": "logarithmic",
+        "velocity_scale": 2 | units.kms,
+        "radius": 1 | units.kpc,
+        "flattening": 0.8,
+    },
+]
+
+
+class TestExternalPotentials(BaseTestCase):
+    def test_acceleration_is_gradient(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(scale=3, size=(50, 3))
+        h = 1e-5
+
+        for config in _configs:
+            potential = external_potentials.create_potential(config)
+            acc, _ = potential.field(position)
+
+            expected_acc = np.empty_like(position)
+            for axis in range(3):
+                shift = np.zeros(3)
+                shift[axis] = h
+                _, forward = potential.field(position + shift)
+                _, backward = potential.field(position - shift)
+                expected_acc[:, axis] = -(forward - backward) / (2 * h)
+
+            self.assertNdarraysAlmostEqual(acc, expected_acc, rtol=1e-5, atol=1e-9)
+
+    def test_center(self):
+        for config in _configs:
+            potential = external_potentials.create_potential(config)
+            acc, pot = potential.field(np.zeros((1, 3)))
+
+            self.assertNdarraysEqual(acc, np.zeros((1, 3)))
+            self.assertTrue(np.isfinite(pot).all())
+
+    def test_moving_potential(self):
+        potential = external_potentials.PlummerPotential(
+            1 | mass_unit,
+            1 | units.kpc,
+            position=[1, 0, 0] | units.kpc,
+            velocity=[0, 2, 0] | units.kms,
+        )
+
+        acc, pot = external_potentials.gravity([potential, potential], np.array([[1, 4, 0]]), 2)
+
+        self.assertNdarraysAlmostEqual(acc, np.zeros((1, 3)))
+        self.assertNdarraysAlmostEqual(pot, np.array([-2.0]))
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            external_potentials.create_potential({"type": "isothermal"})
@@ -0,0 +1,64 @@
+from omtool.core.utils import BaseTestCase, OutputSchedule
+
+
+def _output_iterations(schedule: OutputSchedule, start: int, stop: int) -> list[int]:
+    # same loop as in the integration mode with the integrator that makes all of the steps.
+    result: list[int] = []
+    i = start
+
+    while True:
+        i += schedule.steps_to_output(i) - 1
+
+        if i >= stop:
+            return result
+
+        if schedule.is_output_iteration(i):
+            result.append(i)
+
+        i += 1
+
+
+class TestOutputSchedule(BaseTestCase):
+    def test_tasks(self):
+        schedule = OutputSchedule({"fast": 2, "slow": 6, "default": None}, 3)
+
+        self.assertEqual(schedule.tasks(0), ["fast", "slow", "default"])
+        self.assertEqual(schedule.tasks(2), ["fast"])
+        self.assertEqual(schedule.tasks(3), ["default"])
+        self.assertEqual(schedule.tasks(5), [])
+
+    def test_mixed_intervals(self):
+        schedule = OutputSchedule({"task": 4}, 10, snapshot_interval=6, checkpoint_interval=9)
+
+        self.assertEqual(_output_iterations(schedule, 0, 20), [0, 4, 6, 8, 9, 12, 16, 18])
+        self.assertEqual(schedule.steps_to_output(1), 4)
+        self.assertEqual(schedule.steps_to_output(13), 4)
+        self.assertTrue(schedule.is_snapshot_iteration(12))
+        self.assertFalse(schedule.is_snapshot_iteration(8))
+        self.assertTrue(schedule.is_checkpoint_iteration(9))
+        self.assertFalse(schedule.is_checkpoint_iteration(12))
+
+    def test_disabled_outputs(self):
+        schedule = OutputSchedule({}, 5, pictures=False)
+
+        self.assertFalse(schedule.is_snapshot_iteration(0))
+        self.assertFalse(schedule.is_pictures_iteration(0))
+        self.assertFalse(schedule.is_checkpoint_iteration(0))
+        self.assertFalse(schedule.is_output_iteration(0))
+
+    def test_pictures(self):
+        schedule = OutputSchedule({"task": 7}, 5, pictures=True)
+
+        self.assertEqual(_output_iterations(schedule, 0, 15), [0, 5, 7, 10, 14])
+        self.assertTrue(schedule.is_pictures_iteration(10))
+        self.assertFalse(schedule.is_pictures_iteration(7))
+
+    def test_resume_from_checkpoint(self):
+        schedule = OutputSchedule({"task": 4}, 10, snapshot_interval=6, checkpoint_interval=9)
+
+        # checkpoint of the iteration 9 stores the next iteration to integrate.
+        self.assertEqual(
+            _output_iterations(schedule, 10, 30),
+            [i for i in _output_iterations(schedule, 0, 30) if i >= 10],
+        )
+        self.assertEqual(schedule.steps_to_output(10), 3)
@@ -0,0 +1,43 @@
+import numpy as np
+
+from omtool.core.utils import BaseTestCase, direct_gravity, pm_gravity
+
+
+class TestPMGravity(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        rng = np.random.default_rng(0)
+        # two compact clumps far from each other compared to the cell size and massless probe.
+        self.position = np.vstack(
+            [
+                rng.normal(size=(200, 3)) * 0.1,
+                rng.normal(size=(100, 3)) * 0.1 + [10, 0, 0],
+                [[-5, 4, 0]],
+            ]
+        )
+        self.mass = np.concatenate([np.full(300, 0.01), [0]])
+
+    def test_isolated_forces(self):
+        expected_acc, expected_pot = direct_gravity.gravity(self.position, self.mass, 0.1)
+
+        for scheme in pm_gravity.SCHEMES:
+            acc, pot = pm_gravity.gravity(self.position, self.mass, 0.1, 64, scheme)
+
+            # forces between the clumps are resolved by the grid, inner ones are not.
+            for clump in (slice(0, 200), slice(200, 300)):
+                self.assertNdarraysAlmostEqual(
+                    acc[clump].mean(axis=0), expected_acc[clump].mean(axis=0), rtol=0.01
+                )
+
+            self.assertNdarraysAlmostEqual(acc[-1], expected_acc[-1], rtol=0.02)
+            self.assertNdarraysAlmostEqual(pot[-1], expected_pot[-1], rtol=0.02)
+
+    def test_box(self):
+        box = pm_gravity.bounding_box(self.position, 32)
+
+        self.assertTrue(pm_gravity.contains(box, self.position, 32))
+        self.assertFalse(pm_gravity.contains(box, self.position * 2, 32))
+
+    def test_unknown_scheme(self):
+        with self.assertRaises(ValueError):
+            pm_gravity.gravity(self.position, self.mass, scheme="ngp")
@@ -0,0 +1,39 @@
+import numpy as np
+from amuse.lab import Particles, units
+
+from omtool.core.utils import BaseTestCase, particle_centers, potential_solvers
+
+
+def _generate_clump(N: int = 300) -> Particles:
+    rng = np.random.default_rng(0)
+    particles = Particles(N)
+    particles.position = (rng.normal(size=(N, 3)) * 0.1 + [3, -2, 1]) | units.kpc
+    particles.velocity = rng.normal(size=(N, 3)) | units.kms
+    particles.mass = np.full(N, 1e6) | units.MSun
+
+    return particles
+
+
+class TestPotentialSolvers(BaseTestCase):
+    def test_solvers_agree(self):
+        particles = _generate_clump()
+        expected = potential_solvers.get_potentials(particles, 0.2 | units.kpc, "direct")
+        actual = potential_solvers.get_potentials(particles, 0.2 | units.kpc, "pm", grid_size=32)
+
+        self.assertNdarraysAlmostEqual(
+            actual.value_in(units.kms**2), expected.value_in(units.kms**2), rtol=0.05
+        )
+
+    def test_unknown_solver(self):
+        with self.assertRaises(ValueError):
+            potential_solvers.get_potentials(_generate_clump(), 0.2 | units.kpc, "tree")
+
+    def test_potential_center(self):
+        particles = _generate_clump()
+
+        for solver in ("direct", "pm"):
+            center = particle_centers.potential_center(particles, solver=solver, top_fraction=0.1)
+
+            self.assertNdarraysAlmostEqual(
+                center.value_in(units.kpc), np.array([3, -2, 1]), atol=0.05
+            )
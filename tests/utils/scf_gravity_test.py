@@ -0,0 +1,74 @@
+import numpy as np
+
+from omtool.core.utils import BaseTestCase, direct_gravity, scf_gravity
+
+
+def _hernquist_sphere(
+    n_particles: int, mass: float, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    u = np.sqrt(rng.uniform(size=n_particles))
+    direction = rng.normal(size=(n_particles, 3))
+    direction /= np.linalg.norm(direction, axis=1)[:, np.newaxis]
+
+    return (u / (1 - u))[:, np.newaxis] * direction, np.full(n_particles, mass / n_particles)
+
+
+class TestSCFGravity(BaseTestCase):
+    def test_acceleration_is_gradient(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(300, 3)) * [1, 2, 0.5] + [0.3, 0, 0]
+        expansion = scf_gravity.expand(position, rng.uniform(size=300), 1, 6, 4)
+        probes = rng.normal(scale=2, size=(20, 3))
+        h = 1e-6
+
+        acc, _ = scf_gravity.gravity(probes, expansion)
+
+        expected_acc = np.empty_like(probes)
+        for axis in range(3):
+            shift = np.zeros(3)
+            shift[axis] = h
+            _, forward = scf_gravity.gravity(probes + shift, expansion)
+            _, backward = scf_gravity.gravity(probes - shift, expansion)
+            expected_acc[:, axis] = -(forward - backward) / (2 * h)
+
+        self.assertNdarraysAlmostEqual(acc, expected_acc, rtol=1e-6, atol=1e-7)
+
+    def test_hernquist_sphere(self):
+        position, mass = _hernquist_sphere(100000, 10)
+        expansion = scf_gravity.expand(position, mass, 1, 4, 2, center=np.zeros(3))
+        probes = np.array([[0.5, 0, 0], [0, 2, 0], [0, 0, -5]])
+        radii = np.linalg.norm(probes, axis=1)
+
+        acc, pot = scf_gravity.gravity(probes, expansion)
+
+        self.assertNdarraysAlmostEqual(pot, -10 / (radii + 1), rtol=0.02)
+        self.assertNdarraysAlmostEqual(
+            (acc * probes).sum(axis=1) / radii, -10 / (radii + 1) ** 2, rtol=0.05
+        )
+
+    def test_far_field(self):
+        rng = np.random.default_rng(0)
+        position = rng.normal(size=(2000, 3))
+        mass = np.full(2000, 1 / 2000)
+        probes = rng.normal(size=(10, 3))
+        probes *= 4 / np.linalg.norm(probes, axis=1)[:, np.newaxis]
+
+        expected_acc, _ = direct_gravity.field(probes, position, mass, 0)
+        expansion = scf_gravity.expand(position, mass, 1, 12, 8)
+        acc, _ = scf_gravity.gravity(probes, expansion)
+
+        self.assertNdarraysAlmostEqual(acc, expected_acc, rtol=0.05, atol=3e-3)
+
+    def test_chunks(self):
+        position, mass = _hernquist_sphere(1000, 1)
+        expected_expansion = scf_gravity.expand(position, mass, 1, 6, 4, chunk_size=4096)
+        expected_acc, expected_pot = scf_gravity.gravity(position, expected_expansion, 4096)
+
+        expansion = scf_gravity.expand(position, mass, 1, 6, 4, None, 100, 4)
+        acc, pot = scf_gravity.gravity(position, expansion, 100, 4)
+
+        self.assertNdarraysAlmostEqual(expansion.cos, expected_expansion.cos, atol=1e-12)
+        self.assertNdarraysAlmostEqual(expansion.sin, expected_expansion.sin, atol=1e-12)
+        self.assertNdarraysAlmostEqual(acc, expected_acc)
+        self.assertNdarraysAlmostEqual(pot, expected_pot)
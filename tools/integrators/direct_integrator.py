@@ -0,0 +1,132 @@
+from typing import Any
+
+import numpy as np
+from amuse.lab import ScalarQuantity
+
+from omtool.core.integrators import ArrayIntegrator, register_integrator
+from omtool.core.utils import direct_gravity
+
+
+@register_integrator(name="direct")
+class DirectIntegrator(ArrayIntegrator):
+    """
+    Integrator with exact (direct summation) softened forces. Its cost grows as N^2 so it is
+    meant for small models and as the reference for the tree code. See `ArrayIntegrator` for
+    the description of the state, of the block timesteps and of the adaptive global timestep.
+    Passive particles are not used as the sources, so the cost is proportional to N times the
+    number of the active particles. With block timesteps, forces after each substep are summed
+    only for the particles whose step ends.
+
+    Args:
+    * `eps` (`ScalarQuantity`): Plummer softening length.
+    * `kmax` (`float`): exponent of the (largest) timestep.
+    * `levels` (`int`): number of the finer timestep levels; 0 means single global timestep.
+    * `eta` (`float`): accuracy parameter of the timestep criterion.
+    * `method` (`str`): integration method, see `ArrayIntegrator`. `hermite` uses jerks
+    computed with threads even if `processes` is specified.
+    * `tile_size` (`int`): number of particles in one side of the tile of pairwise interactions.
+    * `threads` (`int`): number of threads; number of CPUs by default.
+    * `processes` (`int`): if greater than 1, forces are evaluated by this number of processes
+    that share particle arrays (see `direct_gravity.SharedMemoryGravity`) instead of threads.
+    * `min_level` (`int`): level of the largest adaptive global timestep.
+    * `max_level` (`int`): level of the smallest adaptive global timestep.
+    * `external_potentials` (`list[dict]`): analytic potentials, see `ArrayIntegrator`.
+    * `passive_components` (`list[str]`): components of the passive particles.
+    * `passive_mass` (`ScalarQuantity`): particles lighter than this are passive.
+    """
+
+    def __init__(
+        self,
+        eps: ScalarQuantity,
+        kmax: float,
+        levels: int = 0,
+        eta: float = 0.025,
+        method: str = "leapfrog",
+        tile_size: int = 512,
+        threads: int | None = None,
+        processes: int = 1,
+        min_level: int = 0,
+        max_level: int = 0,
+        external_potentials: list[dict[str, Any]] | None = None,
+        passive_components: list[str] | None = None,
+        passive_mass: ScalarQuantity | None = None,
+    ):
+        super().__init__(
+            eps,
+            kmax,
+            levels,
+            eta,
+            method,
+            min_level,
+            max_level,
+            external_potentials,
+            passive_components,
+            passive_mass,
+        )
+        self.tile_size = tile_size
+        self.threads = threads
+        self.processes = processes
+        self.pool: direct_gravity.SharedMemoryGravity | None = None
+
+    def gravity(self) -> np.ndarray:
+        if self.active.all():
+            return self._mutual_gravity(self.position, self.mass)
+
+        # active particles interact with each other, passive ones only feel them.
+        active_position, active_mass = self.position[self.active], self.mass[self.active]
+        acc = np.empty_like(self.position)
+        acc[self.active] = self._mutual_gravity(active_position, active_mass)
+        acc[~self.active], _ = direct_gravity.field(
+            self.position[~self.active],
+            active_position,
+            active_mass,
+            self.eps,
+            self.tile_size,
+            self.threads,
+        )
+
+        return acc
+
+    def targeted_gravity(self, targets: np.ndarray) -> np.ndarray:
+        # passive particles are not the sources; the sinks might be among the sources.
+        if self.active.all():
+            source_position, source_mass = self.position, self.mass
+        else:
+            source_position, source_mass = self.position[self.active], self.mass[self.active]
+
+        acc, _ = direct_gravity.field(
+            self.position[targets],
+            source_position,
+            source_mass,
+            self.eps,
+            self.tile_size,
+            self.threads,
+        )
+
+        return acc
+
+    def _mutual_gravity(self, position: np.ndarray, mass: np.ndarray) -> np.ndarray:
+        if self.processes <= 1:
+            acc, _ = direct_gravity.gravity(position, mass, self.eps, self.tile_size, self.threads)
+
+            return acc
+
+        if self.pool is None or self.pool.n_particles != len(mass):
+            self.close()
+            self.pool = direct_gravity.SharedMemoryGravity(
+                len(mass), self.processes, self.tile_size
+            )
+
+        acc, _ = self.pool.gravity(position, mass, self.eps)
+
+        return acc
+
+    def gravity_and_jerk(self) -> tuple[np.ndarray, np.ndarray]:
+        return direct_gravity.gravity_and_jerk(
+            self.position, self.velocity, self.source_mass, self.eps, self.tile_size, self.threads
+        )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
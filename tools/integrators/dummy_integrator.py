@@ -19,6 +19,10 @@ class DummyIntegrator(AbstractIntegrator):
     def __init__(self, timestep: ScalarQuantity) -> None:
         self.timestep = timestep
 
+    @property
+    def current_timestep(self) -> ScalarQuantity:
+        return self.timestep
+
     def leapfrog(self, snapshot: Snapshot) -> Snapshot:
         snapshot.particles.position += snapshot.particles.velocity * self.timestep
         snapshot.timestamp += self.timestep
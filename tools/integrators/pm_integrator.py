@@ -0,0 +1,79 @@
+from typing import Any
+
+import numpy as np
+from amuse.lab import ScalarQuantity
+
+from omtool.core.integrators import ArrayIntegrator, register_integrator
+from omtool.core.utils import pm_gravity
+
+
+@register_integrator(name="pm")
+class PMIntegrator(ArrayIntegrator):
+    """
+    Integrator with particle-mesh forces. Resolution of the forces is limited by the cell
+    size, so it is meant for quick-look integrations of large and roughly smooth systems.
+    Grid is fixed between the steps and is rebuilt around the particles only when some of them
+    come close to its edge. See `ArrayIntegrator` for the description of the state and of the
+    block timesteps.
+
+    Args:
+    * `eps` (`ScalarQuantity`): softening length; forces are softened at least by half of the
+    cell size anyway.
+    * `kmax` (`float`): exponent of the (largest) timestep.
+    * `grid_size` (`int`): number of cells along each side of the grid.
+    * `scheme` (`str`): mass assignment scheme: `cic` or `tsc`.
+    * `levels` (`int`): number of the finer timestep levels; 0 means single global timestep.
+    * `eta` (`float`): accuracy parameter of the timestep criterion.
+    * `method` (`str`): integration method, see `ArrayIntegrator`.
+    * `min_level` (`int`): level of the largest adaptive global timestep.
+    * `max_level` (`int`): level of the smallest adaptive global timestep.
+    * `external_potentials` (`list[dict]`): analytic potentials, see `ArrayIntegrator`.
+    * `passive_components` (`list[str]`): components of the passive particles.
+    * `passive_mass` (`ScalarQuantity`): particles lighter than this are passive.
+    """
+
+    def __init__(
+        self,
+        eps: ScalarQuantity,
+        kmax: float,
+        grid_size: int = 64,
+        scheme: str = "cic",
+        levels: int = 0,
+        eta: float = 0.025,
+        method: str = "leapfrog",
+        min_level: int = 0,
+        max_level: int = 0,
+        external_potentials: list[dict[str, Any]] | None = None,
+        passive_components: list[str] | None = None,
+        passive_mass: ScalarQuantity | None = None,
+    ):
+        if scheme not in pm_gravity.SCHEMES:
+            raise ValueError(
+                f"Unknown mass assignment scheme {scheme}, expected one of {pm_gravity.SCHEMES}."
+            )
+
+        super().__init__(
+            eps,
+            kmax,
+            levels,
+            eta,
+            method,
+            min_level,
+            max_level,
+            external_potentials,
+            passive_components,
+            passive_mass,
+        )
+        self.grid_size = grid_size
+        self.scheme = scheme
+        self.box: pm_gravity.Box | None = None
+
+    def gravity(self) -> np.ndarray:
+        if self.box is None or not pm_gravity.contains(self.box, self.position, self.grid_size):
+            self.box = pm_gravity.bounding_box(self.position, self.grid_size)
+
+        acc, _ = pm_gravity.gravity(
+            self.position, self.source_mass, self.eps, self.grid_size, self.scheme, self.box
+        )
+
+        return acc
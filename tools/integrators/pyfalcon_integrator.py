@@ -1,71 +1,62 @@
+from typing import Any
+
 import numpy as np
 import pyfalcon
-from amuse.datamodel.particles import Particles
-from amuse.lab import ScalarQuantity, units
-
-from omtool.core.datamodel import Snapshot
-from omtool.core.integrators import AbstractIntegrator, register_integrator
-
-attr_unit_dict: dict[str, ScalarQuantity | None] = {
-    "position": units.kpc,
-    "velocity": units.kms,
-    "mass": 232500 * units.MSun,
-    "is_barion": None,
-}
-
-time_unit = units.Gyr
+from amuse.lab import ScalarQuantity
 
-
-def _to_vector3(array: np.ndarray):
-    return array.reshape(len(array), -1, order="F")
+from omtool.core.integrators import ArrayIntegrator, register_integrator
 
 
 @register_integrator(name="pyfalcon")
-class PyfalconIntegrator(AbstractIntegrator):
+class PyfalconIntegrator(ArrayIntegrator):
     """
-    Wrapper for pyfalcon module that connects it with OMTool snapshots.
+    Wrapper for pyfalcon module that connects it with OMTool snapshots. See `ArrayIntegrator`
+    for the description of the state, of the block timesteps and of the adaptive global
+    timestep. pyfalcon computes forces on all of the particles it is given, so passive particles
+    are kept in the tree with zero masses. Forces are computed by a single process: pyfalcon builds
+    one tree of all of the particles and cannot compute forces on a part of them, so the tree
+    code is not split between processes (see `processes` of the `direct` integrator instead).
+
+    Args:
+    * `eps` (`ScalarQuantity`): softening length.
+    * `kmax` (`float`): exponent of the (largest) timestep.
+    * `levels` (`int`): number of the finer timestep levels; 0 means single global timestep.
+    * `eta` (`float`): accuracy parameter of the timestep criterion.
+    * `method` (`str`): integration method, see `ArrayIntegrator`.
+    * `min_level` (`int`): level of the largest adaptive global timestep.
+    * `max_level` (`int`): level of the smallest adaptive global timestep.
+    * `external_potentials` (`list[dict]`): analytic potentials, see `ArrayIntegrator`.
+    * `passive_components` (`list[str]`): components of the passive particles.
+    * `passive_mass` (`ScalarQuantity`): particles lighter than this are passive.
     """
 
-    def __init__(self, eps: ScalarQuantity, kmax: float):
-        self.eps = eps.value_in(attr_unit_dict["position"])
-        self.delta_time = 0.5**kmax
-
-    def _get_params(self, snapshot: Snapshot) -> tuple[dict[str, np.ndarray], float]:
-        params = {}
-
-        for attr, unit in attr_unit_dict.items():
-            if hasattr(snapshot.particles, attr):
-                if unit is not None:
-                    value = getattr(snapshot.particles, attr).value_in(unit)
-                else:
-                    value = getattr(snapshot.particles, attr)
-
-                params[attr] = value
-
-        time = snapshot.timestamp.value_in(time_unit)
-
-        return params, time
-
-    def leapfrog(self, snapshot: Snapshot) -> Snapshot:
-        params, time = self._get_params(snapshot)
-        if not hasattr(self, "acc"):
-            self.acc, _ = pyfalcon.gravity(params["position"], params["mass"], self.eps)
-
-        params["velocity"] += self.acc * (self.delta_time / 2)
-        params["position"] += params["velocity"] * self.delta_time
-        self.acc, _ = pyfalcon.gravity(params["position"], params["mass"], self.eps)
-        params["velocity"] += self.acc * (self.delta_time / 2)
-        time += self.delta_time
-        params["position"] = _to_vector3(params["position"])
-        params["velocity"] = _to_vector3(params["velocity"])
-
-        new_snapshot = Snapshot(Particles(len(params["mass"])))
-        for attr, value in params.items():
-            if (u := attr_unit_dict.get(attr, None)) is not None:
-                setattr(new_snapshot.particles, attr, value | u)
-            else:
-                setattr(new_snapshot.particles, attr, value)
-
-        new_snapshot.timestamp = time | time_unit
-
-        return new_snapshot
+    def __init__(
+        self,
+        eps: ScalarQuantity,
+        kmax: float,
+        levels: int = 0,
+        eta: float = 0.025,
+        method: str = "leapfrog",
+        min_level: int = 0,
+        max_level: int = 0,
+        external_potentials: list[dict[str, Any]] | None = None,
+        passive_components: list[str] | None = None,
+        passive_mass: ScalarQuantity | None = None,
+    ):
+        super().__init__(
+            eps,
+            kmax,
+            levels,
+            eta,
+            method,
+            min_level,
+            max_level,
+            external_potentials,
+            passive_components,
+            passive_mass,
+        )
+
+    def gravity(self) -> np.ndarray:
+        acc, _ = pyfalcon.gravity(self.position, self.source_mass, self.eps)
+
+        return acc
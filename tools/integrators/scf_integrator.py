@@ -0,0 +1,171 @@
+from typing import Any
+
+import numpy as np
+from amuse.lab import ScalarQuantity
+
+from omtool.core.datamodel import Snapshot
+from omtool.core.integrators import ArrayIntegrator, register_integrator
+from omtool.core.utils import direct_gravity, scf_gravity
+
+SOLVERS = ("direct", "pyfalcon")
+
+
+@register_integrator(name="scf")
+class SCFIntegrator(ArrayIntegrator):
+    """
+    Integrator with self-consistent field forces (see `scf_gravity`): potential of the particles
+    is expanded over the basis of the Hernquist sphere, so the cost is O(N * n_terms). It is meant
+    for long evolution of the near-equilibrium spheroids. See `ArrayIntegrator` for the
+    description of the state and of the timesteps.
+
+    Coefficients of the expansion are cached and recomputed every `recompute_interval` force
+    evaluations (once per step for `leapfrog`); expansion is centered at the center of mass of
+    the expanded particles at that moment.
+
+    If `components` are given, only particles of these components are expanded. Forces from the
+    rest of the particles (e.g. satellites) on all of the particles are computed by the `solver`:
+    `direct` summation or `pyfalcon` tree code with Plummer softening `eps`.
+
+    Args:
+    * `eps` (`ScalarQuantity`): softening length of the forces of the not expanded particles.
+    * `kmax` (`float`): exponent of the (largest) timestep.
+    * `radius` (`ScalarQuantity`): scale radius of the basis.
+    * `nmax` (`int`): number of the radial basis functions minus one.
+    * `lmax` (`int`): maximal degree of the spherical harmonics.
+    * `recompute_interval` (`int`): number of force evaluations between updates of coefficients.
+    * `components` (`list[str]`): components of the expanded particles; all particles by default.
+    * `solver` (`str`): solver for the rest of the particles: `direct` or `pyfalcon`.
+    * `threads` (`int`): number of threads; number of CPUs by default.
+    * `levels` (`int`): number of the finer timestep levels; 0 means single global timestep.
+    * `eta` (`float`): accuracy parameter of the timestep criterion.
+    * `method` (`str`): integration method, see `ArrayIntegrator`.
+    * `min_level` (`int`): level of the largest adaptive global timestep.
+    * `max_level` (`int`): level of the smallest adaptive global timestep.
+    * `external_potentials` (`list[dict]`): analytic potentials, see `ArrayIntegrator`.
+    * `passive_components` (`list[str]`): components of the passive particles.
+    * `passive_mass` (`ScalarQuantity`): particles lighter than this are passive.
+    """
+
+    def __init__(
+        self,
+        eps: ScalarQuantity,
+        kmax: float,
+        radius: ScalarQuantity,
+        nmax: int = 10,
+        lmax: int = 4,
+        recompute_interval: int = 1,
+        components: list[str] | None = None,
+        solver: str = "direct",
+        threads: int | None = None,
+        levels: int = 0,
+        eta: float = 0.025,
+        method: str = "leapfrog",
+        min_level: int = 0,
+        max_level: int = 0,
+        external_potentials: list[dict[str, Any]] | None = None,
+        passive_components: list[str] | None = None,
+        passive_mass: ScalarQuantity | None = None,
+    ):
+        if recompute_interval < 1:
+            raise ValueError(f"Recompute interval should be positive, got {recompute_interval}.")
+
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver}, expected one of {SOLVERS}.")
+
+        super().__init__(
+            eps,
+            kmax,
+            levels,
+            eta,
+            method,
+            min_level,
+            max_level,
+            external_potentials,
+            passive_components,
+            passive_mass,
+        )
+        self.radius = radius.value_in(scf_gravity.length_unit)
+        self.nmax = nmax
+        self.lmax = lmax
+        self.recompute_interval = recompute_interval
+        self.components = components
+        self.solver = solver
+        self.threads = threads
+        self.expanded = np.empty(0, dtype=bool)
+        self.expansion: scf_gravity.Expansion | None = None
+        self.evaluations = 0
+
+    def load(self, snapshot: Snapshot):
+        super().load(snapshot)
+        self.expanded = np.ones(len(self.mass), dtype=bool)
+        self.expansion = None
+        self.evaluations = 0
+
+        if self.components is not None:
+            if "component" not in self.extra_columns:
+                raise ValueError("Snapshot has no component column to select expanded particles.")
+
+            self.expanded = np.isin(self.extra_columns["component"], self.components)
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            **super().get_state(),
+            "expansion": self.expansion,
+            "evaluations": self.evaluations,
+        }
+
+    def restore(self, snapshot: Snapshot, state: dict[str, Any]) -> Snapshot:
+        snapshot = super().restore(snapshot, state)
+        self.expansion = state.get("expansion")
+        self.evaluations = state.get("evaluations", 0)
+
+        return snapshot
+
+    def gravity(self) -> np.ndarray:
+        if self.expansion is None or self.evaluations % self.recompute_interval == 0:
+            self.expansion = scf_gravity.expand(
+                self.position[self.expanded],
+                self.source_mass[self.expanded],
+                self.radius,
+                self.nmax,
+                self.lmax,
+                threads=self.threads,
+            )
+
+        self.evaluations += 1
+        acc, _ = scf_gravity.gravity(self.position, self.expansion, threads=self.threads)
+
+        if not self.expanded.all():
+            acc += self._other_gravity()
+
+        return acc
+
+    def _other_gravity(self) -> np.ndarray:
+        """
+        Returns accelerations of all of the particles from the particles that are not expanded.
+        """
+        other = ~self.expanded
+
+        if self.solver == "pyfalcon":
+            # optional dependency, needed only by this solver.
+            import pyfalcon
+
+            acc, _ = pyfalcon.gravity(
+                self.position, np.where(other, self.source_mass, np.float32(0)), self.eps
+            )
+
+            return acc
+
+        acc = np.empty_like(self.position)
+        acc[other], _ = direct_gravity.gravity(
+            self.position[other], self.source_mass[other], self.eps, threads=self.threads
+        )
+        acc[self.expanded], _ = direct_gravity.field(
+            self.position[self.expanded],
+            self.position[other],
+            self.source_mass[other],
+            self.eps,
+            threads=self.threads,
+        )
+
+        return acc
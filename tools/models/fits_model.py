@@ -10,11 +10,10 @@ class FITSModel(AbstractModel):
         self.snapshot_number = snapshot_number
 
     def run(self) -> Snapshot:
-        it = datamodel.from_fits(self.filename)
+        # first HDU of the file is the primary one, so snapshots are counted from 1.
+        it = datamodel.from_fits(self.filename, snapshot_index=self.snapshot_number + 1, limit=1)
 
-        i = 0
-        for (i, snapshot) in enumerate(it):
-            if i == self.snapshot_number:
-                return snapshot
+        for snapshot in it:
+            return snapshot
 
         raise ValueError("Model not found")
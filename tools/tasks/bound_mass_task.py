@@ -1,7 +1,12 @@
 from amuse.lab import ScalarQuantity, units
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTimeTask, DataType, register_task
+from omtool.core.tasks import (
+    KINEMATIC_COLUMNS,
+    AbstractTimeTask,
+    DataType,
+    register_task,
+)
 from omtool.core.utils import math, pyfalcon_analizer
 
 
@@ -36,6 +41,8 @@ class BoundMassTask(AbstractTimeTask):
     certain fraction).
     """
 
+    columns = KINEMATIC_COLUMNS
+
     def __init__(
         self,
         time_unit: ScalarQuantity = 1 | units.Myr,
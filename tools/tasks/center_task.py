@@ -1,7 +1,12 @@
 from zlog import logger
 
 from omtool.core.datamodel import Snapshot
-from omtool.core.tasks import AbstractTask, DataType, register_task
+from omtool.core.tasks import (
+    KINEMATIC_COLUMNS,
+    AbstractTask,
+    DataType,
+    register_task,
+)
 from omtool.core.utils import particle_centers
 
 
@@ -12,13 +17,16 @@ class CenterTask(AbstractTask):
 
     Args:
     * `center_type` (`str`): type of the center (`mass`, `potential`).
-    * `**kwargs`: keywoard arguments for the center from the `center_type` constructor.
+    * `**kwargs`: keywoard arguments for the center from the `center_type` constructor, e.g.
+    `solver` of the potentials (`pyfalcon`, `direct` or `pm`) for the `potential` center.
 
     Returns:
     * `position` (`VectorQuantity`): position of the particle center.
     * `velocity` (`VectorQuantity`): velocity of the particle center.
     """
 
+    columns = KINEMATIC_COLUMNS
+
     def __init__(self, center_type: str = "mass", **kwargs):
         self.kwargs = kwargs
 
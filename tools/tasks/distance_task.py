@@ -25,6 +25,8 @@ class DistanceTask(AbstractTimeTask):
     * `dist`: list of distances over time.
     """
 
+    columns: set[str] = set()
+
     def __init__(
         self,
         time_unit: ScalarQuantity = 1 | units.Myr,
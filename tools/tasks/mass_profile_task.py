@@ -5,7 +5,12 @@ import numpy as np
 from amuse.lab import ScalarQuantity, VectorQuantity, units
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTask, DataType, register_task
+from omtool.core.tasks import (
+    POSITION_COLUMNS,
+    AbstractTask,
+    DataType,
+    register_task,
+)
 from omtool.core.utils import math, particle_centers
 
 
@@ -29,6 +34,8 @@ class MassProfileTask(AbstractTask):
     * `masses`: list of masses for each sphere.
     """
 
+    columns = POSITION_COLUMNS | {"mass"}
+
     def __init__(
         self,
         resolution: int = 1000,
@@ -4,8 +4,13 @@ Task that computes radial distribution of the potential.
 from amuse.lab import ScalarQuantity, VectorQuantity, units
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTask, DataType, register_task
-from omtool.core.utils import math, particle_centers, pyfalcon_analizer
+from omtool.core.tasks import (
+    POSITION_COLUMNS,
+    AbstractTask,
+    DataType,
+    register_task,
+)
+from omtool.core.utils import math, particle_centers, potential_solvers
 
 
 @register_task(name="PotentialTask")
@@ -20,6 +25,8 @@ class PotentialTask(AbstractTask):
     * `r_unit` (`ScalarQuantity`): unit of the radius for the output.
     * `pot_unit` (`ScalarQuantity`): unit of the potential for the output.
     * `resolution` (`int`): number of slices between nearest and farthest particle to the center.
+    * `solver` (`str`): solver of the potentials: `pyfalcon`, `direct` or `pm`.
+    * `**solver_kwargs`: arguments of the solver, e.g. `grid_size` of `pm`.
 
     Dynamic args:
     * `center` (`VectorQuantity`): position of the center of profile. Center of mass by default.
@@ -29,16 +36,29 @@ class PotentialTask(AbstractTask):
     * `potential`: list of potentials for each slice.
     """
 
+    columns = POSITION_COLUMNS | {"mass"}
+
+    state_attributes = ("pot_unit",)
+
     def __init__(
         self,
         resolution: int = 1000,
         r_unit: ScalarQuantity = 1 | units.kpc,
         pot_unit: ScalarQuantity = None,
+        solver: str = "pyfalcon",
+        **solver_kwargs,
     ) -> None:
+        if solver not in potential_solvers.SOLVERS:
+            raise ValueError(
+                f"Unknown solver {solver}, expected one of {potential_solvers.SOLVERS}."
+            )
+
         super().__init__()
         self.resolution = resolution
         self.r_unit = r_unit
         self.pot_unit = pot_unit
+        self.solver = solver
+        self.solver_kwargs = solver_kwargs
 
     @profiler("Potential profile task")
     def run(
@@ -52,7 +72,9 @@ class PotentialTask(AbstractTask):
             center = particle_centers.center_of_mass(particles)
 
         radii = math.get_lengths(particles.position - center)
-        potentials = pyfalcon_analizer.get_potentials(snapshot.particles, 0.2 | units.kpc)
+        potentials = potential_solvers.get_potentials(
+            particles, 0.2 | units.kpc, self.solver, **self.solver_kwargs
+        )
         radii, potentials = math.sort_with(radii, potentials)
 
         number_of_chunks = (len(radii) // self.resolution) * self.resolution
@@ -2,7 +2,13 @@ from amuse.lab import ScalarQuantity
 from py_expression_eval import Parser
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTask, DataType, get_parameters, register_task
+from omtool.core.tasks import (
+    AbstractTask,
+    DataType,
+    get_columns,
+    get_parameters,
+    register_task,
+)
 
 
 @register_task(name="ScatterTask")
@@ -38,6 +44,9 @@ class ScatterTask(AbstractTask):
 
         self.expressions = {id: parser.parse(expr) for id, expr in expressions.items()}
         self.units = units
+        self.columns = get_columns(
+            var for expr in self.expressions.values() for var in expr.variables()
+        )
 
     @profiler("Scatter task")
     def run(self, snapshot: Snapshot) -> DataType:
@@ -8,7 +8,13 @@ from amuse.lab import ScalarQuantity, VectorQuantity
 from py_expression_eval import Parser
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTask, DataType, get_parameters, register_task
+from omtool.core.tasks import (
+    AbstractTask,
+    DataType,
+    get_columns,
+    get_parameters,
+    register_task,
+)
 
 
 @register_task(name="TimeEvolutionTask")
@@ -39,6 +45,8 @@ class TimeEvolutionTask(AbstractTask):
         "none": lambda x: x,
     }
 
+    state_attributes = ("times", "values")
+
     def __init__(
         self,
         expr: str,
@@ -52,6 +60,7 @@ class TimeEvolutionTask(AbstractTask):
             raise RuntimeError("Expression was empty.")
 
         self.expr = parser.parse(expr)
+        self.columns = get_columns(self.expr.variables())
         self.function = self.functions[function]
         self.time_unit = time_unit
         self.value_unit = value_unit
@@ -1,7 +1,12 @@
 from amuse.lab import ScalarQuantity, VectorQuantity, units
 
 from omtool.core.datamodel import Snapshot, profiler
-from omtool.core.tasks import AbstractTask, DataType, register_task
+from omtool.core.tasks import (
+    KINEMATIC_COLUMNS,
+    AbstractTask,
+    DataType,
+    register_task,
+)
 from omtool.core.utils import math, particle_centers
 
 
@@ -27,6 +32,8 @@ class VelocityProfileTask(AbstractTask):
     * `velocity`: list of velocity modules for each slice.
     """
 
+    columns = KINEMATIC_COLUMNS
+
     def __init__(
         self,
         resolution: int = 1000,